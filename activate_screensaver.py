@@ -1,21 +1,30 @@
 import os
-import json
+import sys
 import time
 import threading
-import subprocess
 import ctypes
-from pynput import mouse, keyboard
+import logging
+
+from activity import ActivityAggregator
+from saver_launcher import PopenLauncher
+from daemon_config import CONFIG_FILE, ConfigWatcher, load_config
+from daemon_control import single_instance
+
+log = logging.getLogger("screensaver")
 
 class Screensaver:
-    def __init__(self, config):
-        self.timeout = config.get("timeout", 60000)  # Timeout in milliseconds
-        self.lock_on_activate = config.get("lock_on_activate", False)
-        self.screensaver_file = config.get("screensaver_path", "C:\\Windows\\System32\\VideoScreenSaver.scr")
+    def __init__(self, config, clock=time.monotonic, launcher=None, start=True):
+        self.apply_config(config)
 
-        self.last_activity_time = time.time()
+        self.activity = ActivityAggregator(on_activity=self.reset_timer, clock=clock)
+        self.launcher = launcher or PopenLauncher()
         self.screensaver_active = False
         self.screensaver_process = None
 
+        # start=False leaves hooks and loop to the caller (see simulator)
+        if not start:
+            return
+
         # Start activity tracking threads
         threading.Thread(target=self.track_mouse_movement, daemon=True).start()
         threading.Thread(target=self.track_keyboard_input, daemon=True).start()
@@ -23,98 +32,110 @@ class Screensaver:
         # Start activity monitoring in a separate thread
         threading.Thread(target=self.check_activity, daemon=True).start()
 
+        # Pick up config.json edits without a restart
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, self.apply_config).start()
+
+    def apply_config(self, config):
+        """Take over a (re)loaded config; the idle clock keeps running."""
+        self.timeout = config.timeout_ms  # Timeout in milliseconds
+        self.lock_on_activate = config.lock_on_activate
+        self.screensaver_file = config.scr_path
+
     def check_activity(self):
         """Continuously checks for activity and triggers the screensaver when idle."""
         while True:
-            current_time = time.time()
-            idle_time = (current_time - self.last_activity_time) * 1000  # Convert to milliseconds
+            self.check_once()
+            time.sleep(1)
 
-            if idle_time >= self.timeout and not self.screensaver_active:
-                self.activate_screensaver()
+    def check_once(self):
+        idle_time = self.activity.idle_s() * 1000  # Convert to milliseconds
 
-            time.sleep(1)
+        if idle_time >= self.timeout and not self.screensaver_active:
+            self.activate_screensaver()
 
     def activate_screensaver(self):
         """Runs the Windows screensaver properly in full screen."""
         if not self.screensaver_active:
-            print("⏳ Timer expired! Restoring Python window and activating screensaver...")
+            log.info("⏳ Timer expired! Restoring Python window and activating screensaver...")
             self.restore_python_window()
 
+            self.release_process()
             try:
-                # Launch screensaver non-blocking
-                self.screensaver_process = subprocess.Popen([self.screensaver_file, "/s"], shell=True)
+                # Launch screensaver non-blocking, as its own process tree
+                self.screensaver_process = self.launcher.launch(self.screensaver_file)
                 self.screensaver_active = True
             except Exception as e:
-                print(f"⚠️ Failed to start screensaver: {e}")
+                log.warning("⚠️ Failed to start screensaver: %s", e)
 
             if self.lock_on_activate:
                 os.system("rundll32.exe user32.dll, LockWorkStation")
 
+    def release_process(self):
+        """Drop the last saver's tree, closing its job handle on Windows."""
+        if self.screensaver_process is not None:
+            self.screensaver_process.close()
+            self.screensaver_process = None
+
     def restore_python_window(self):
         """Restores the minimized Python script window."""
+        if sys.platform != "win32":
+            return
         hwnd = ctypes.windll.kernel32.GetConsoleWindow()
         if hwnd:
             ctypes.windll.user32.ShowWindow(hwnd, 9)  # SW_RESTORE
             ctypes.windll.user32.SetForegroundWindow(hwnd)
 
     def reset_timer(self, event_type):
-        """Resets the countdown when mouse or keyboard activity is detected."""
-        print(f"🔄 {event_type} detected! Resetting timer...")
-        self.last_activity_time = time.time()
+        """Called once per idle -> active edge; the aggregator already reset the countdown."""
+        log.info("🔄 %s detected! Resetting timer...", event_type)
 
         if self.screensaver_active:
-            print("❌ Hiding screensaver due to activity...")
+            log.info("❌ Hiding screensaver due to activity...")
             self.screensaver_active = False
 
             # Kill screensaver process if running
-            if self.screensaver_process and self.screensaver_process.poll() is None:
+            if self.screensaver_process:
                 try:
-                    self.screensaver_process.terminate()
+                    self.screensaver_process.terminate()  # the whole tree
                 except Exception as e:
-                    print(f"⚠️ Failed to terminate screensaver: {e}")
+                    log.warning("⚠️ Failed to terminate screensaver: %s", e)
+                self.release_process()
 
             if self.lock_on_activate:
                 self.lock_screen()
 
     def lock_screen(self):
         """Locks the screen after mouse or keyboard activity."""
-        print("🔒 Locking screen due to activity...")
+        log.info("🔒 Locking screen due to activity...")
         os.system("rundll32.exe user32.dll, LockWorkStation")
 
     def track_mouse_movement(self):
         """Listens for system-wide mouse movement."""
+        from pynput import mouse
+
+        touch = self.activity.touch
+
         def on_move(x, y):
-            self.reset_timer("Mouse movement")
+            touch("Mouse movement")
 
         with mouse.Listener(on_move=on_move) as listener:
             listener.join()
 
     def track_keyboard_input(self):
         """Listens for system-wide keyboard input."""
+        from pynput import keyboard
+
+        touch = self.activity.touch
+
         def on_press(key):
-            self.reset_timer(f"Key '{key}' pressed")
+            touch("Key press")
 
         with keyboard.Listener(on_press=on_press) as listener:
             listener.join()
 
-def load_config(config_file='config.json'):
-    try:
-        with open(config_file, 'r') as f:
-            config = json.load(f)
-
-        if config["timeout"] < 1000:
-            config["timeout"] *= 60000  # Convert minutes to milliseconds
-
-    except Exception:
-        config = {
-            "timeout": 1,
-            "lock_on_activate": False,
-            "screensaver_path": "C:\\Windows\\System32\\VideoScreenSaver.scr"
-        }
-
-    return config
-
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    instance = single_instance()
     config = load_config()
     screensaver = Screensaver(config)
     # Keep the main thread alive
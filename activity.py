@@ -0,0 +1,130 @@
+import time
+import queue
+import logging
+import threading
+
+
+log = logging.getLogger("screensaver.activity")
+
+
+# ------------------------------------------------------------
+# ACTIVITY AGGREGATOR
+# ------------------------------------------------------------
+
+class ActivityAggregator:
+    """Absorb raw input events and report only idle -> active edges.
+
+    ``touch()`` is the per-event hot path: it stores one timestamp and bumps
+    a counter, with no locking and no I/O.  When the previous event is more
+    than ``edge_gap_s`` old, the event starts a new burst and
+    ``on_activity(source)`` is called once for it.
+    """
+
+    def __init__(self, on_activity=None, edge_gap_s=1.0, clock=time.monotonic):
+        self.on_activity = on_activity
+        self.edge_gap_s = edge_gap_s
+        self.clock = clock
+
+        self.last = clock()
+        self.counts = {}
+        self.edges = 0
+
+        self._edge_lock = threading.Lock()
+        self._rate_mark = (self.last, 0)
+
+    def touch(self, source):
+        now = self.clock()
+        gap = now - self.last
+        self.last = now
+        counts = self.counts
+        counts[source] = counts.get(source, 0) + 1
+        if gap > self.edge_gap_s:
+            self._edge(source, gap)
+
+    def _edge(self, source, gap):
+        # Two listener threads can race into the same burst; report it once.
+        if not self._edge_lock.acquire(blocking=False):
+            return
+        try:
+            self.edges += 1
+            log.debug("%s after %.1fs idle", source, gap)
+            if self.on_activity is not None:
+                self.on_activity(source)
+        finally:
+            self._edge_lock.release()
+
+    def idle_s(self):
+        return self.clock() - self.last
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def rate(self):
+        """Events per second since the previous call."""
+        now, total = self.clock(), self.total()
+        then, before = self._rate_mark
+        self._rate_mark = (now, total)
+        return (total - before) / (now - then) if now > then else 0.0
+
+
+# ------------------------------------------------------------
+# UNIFIED INPUT EVENT SOURCE
+# ------------------------------------------------------------
+
+class InputEventSource:
+    """Global mouse/keyboard hooks coalesced into one queue of activity edges.
+
+    The hook threads only ``touch()`` the aggregator; each idle -> active
+    edge is put on ``events`` (a thread-safe queue) for the consumer to
+    ``drain()`` on its own thread.  ``on_edge(source)``, if set, is then
+    called on the hook thread so a consumer can wake up instead of polling.
+    """
+
+    def __init__(self, edge_gap_s=1.0, clock=time.monotonic):
+        self.events = queue.SimpleQueue()
+        self.on_edge = None
+        self.activity = ActivityAggregator(
+            on_activity=self._edge, edge_gap_s=edge_gap_s, clock=clock
+        )
+        self.touch = self.activity.touch
+        self._listeners = []
+
+    def start(self):
+        from pynput import mouse, keyboard
+
+        touch = self.touch
+        self._listeners = [
+            mouse.Listener(on_move=lambda x, y: touch("Mouse"),
+                           on_click=lambda *a: touch("Mouse")),
+            keyboard.Listener(on_press=lambda key: touch("Keyboard")),
+        ]
+        for listener in self._listeners:
+            listener.daemon = True
+            listener.start()
+        return self
+
+    def _edge(self, source):
+        self.events.put(source)
+        if self.on_edge is not None:
+            self.on_edge(source)
+
+    def stop(self):
+        for listener in self._listeners:
+            listener.stop()
+
+    def drain(self):
+        """Return the activity edges queued since the last call."""
+        sources = []
+        try:
+            while True:
+                sources.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        return sources
+
+    @property
+    def last(self):
+        return self.activity.last
+
+    def idle_s(self):
+        return self.activity.idle_s()
@@ -0,0 +1,190 @@
+import os
+import re
+import mmap
+import time
+import struct
+import threading
+
+
+# ------------------------------------------------------------
+# RECORD FORMAT
+# ------------------------------------------------------------
+
+# Segment header: magic, version, record size, capacity, records written,
+# creation time.  The count is updated after each record, so a reader
+# never sees a half-written one.
+HEADER = struct.Struct("<4sHHIId8x")
+MAGIC = b"SSJ1"
+VERSION = 1
+COUNT_OFFSET = 12
+
+# Record: wall time (s), engine idle ms at the transition, event, reason.
+RECORD = struct.Struct("<dIBB2x")
+
+# Event codes are the engine states entered (see idle_engine).
+EVENTS = ("ACTIVE", "IDLE_PENDING", "SAVER_RUNNING", "DISMISSED", "LOCKED")
+# Code 0 is anything not listed (e.g. a custom activate_now reason).
+REASONS = ("other", "input", "idle", "timeout", "audio", "fullscreen", "media",
+           "dismissed", "saver exit", "session locked", "session unlocked",
+           "paused", "inhibited", "activation failed", "requested", "preview")
+
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+REASON_CODES = {name: code for code, name in enumerate(REASONS)}
+
+SEGMENT_RE = re.compile(r"^activity-(\d{8})\.ssj$")
+
+
+def segment_name(seq):
+    return f"activity-{seq:08d}.ssj"
+
+
+def segments(directory):
+    """Segment paths in ``directory``, oldest first."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    numbered = sorted((int(m.group(1)), name) for name in names
+                      for m in [SEGMENT_RE.match(name)] if m)
+    return [os.path.join(directory, name) for _, name in numbered]
+
+
+def read_header(buf):
+    magic, version, record_size, capacity, count, created = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError("not an activity journal segment")
+    return capacity, min(count, capacity), created
+
+
+# ------------------------------------------------------------
+# WRITER
+# ------------------------------------------------------------
+
+class ActivityJournal:
+    """Append-only journal of engine transitions in fixed-size binary records.
+
+    Records go into memory-mapped segment files of ``segment_records``
+    records each (16 bytes a record, so 1 MiB for the default 65536).  A
+    full segment is closed and a new one started; beyond ``max_segments``
+    the oldest is deleted, so disk use never exceeds
+    ``segment_records * 16 * max_segments`` bytes plus headers.  Appending
+    is two ``pack_into`` calls on the mapping, no system call.
+    """
+
+    def __init__(self, directory, segment_records=65536, max_segments=16, clock=time.time):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.clock = clock
+        self.appended = 0
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        os.makedirs(directory, exist_ok=True)
+        self._open_latest()
+
+    # --------------------------------------------------------
+
+    def append(self, event, reason, idle_ms=0):
+        """Record entering state ``event`` for ``reason`` (names as in EVENTS / REASONS)."""
+        fields = (self.clock(), max(0, min(int(idle_ms), 0xFFFFFFFF)),
+                  EVENT_CODES[event], REASON_CODES.get(reason, 0))
+        with self._lock:
+            if self._map is None:
+                return
+            if self._count >= self._capacity:
+                self._rotate()
+            RECORD.pack_into(self._map, HEADER.size + self._count * RECORD.size, *fields)
+            self._count += 1
+            struct.pack_into("<I", self._map, COUNT_OFFSET, self._count)
+            self.appended += 1
+
+    def flush(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    def disk_bytes(self):
+        return sum(os.path.getsize(path) for path in segments(self.directory))
+
+    # --------------------------------------------------------
+
+    def _open_latest(self):
+        existing = segments(self.directory)
+        if existing:
+            path = existing[-1]
+            self._seq = int(SEGMENT_RE.match(os.path.basename(path)).group(1))
+            try:
+                self._map_segment(path)
+                return
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Starting a new journal segment: {path} unusable ({e})")
+        else:
+            self._seq = 0
+        self._new_segment()
+
+    def _map_segment(self, path):
+        f = open(path, "r+b")
+        try:
+            buf = mmap.mmap(f.fileno(), 0)
+        except (OSError, ValueError):
+            f.close()
+            raise
+        try:
+            self._capacity, self._count, _ = read_header(buf)
+            if len(buf) < HEADER.size + self._capacity * RECORD.size:
+                raise ValueError("truncated")
+        except (ValueError, struct.error):
+            buf.close()
+            f.close()
+            raise ValueError("bad header")
+        self._file, self._map = f, buf
+
+    def _new_segment(self):
+        self._seq += 1
+        path = os.path.join(self.directory, segment_name(self._seq))
+        size = HEADER.size + self.segment_records * RECORD.size
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.segment_records, 0, self.clock()))
+            f.truncate(size)
+        self._map_segment(path)
+        for old in segments(self.directory)[:-self.max_segments]:
+            try:
+                os.remove(old)
+            except OSError as e:
+                print(f"⚠️ Could not remove old journal segment {old}: {e}")
+
+    def _rotate(self):
+        self._close_segment()
+        self._new_segment()
+
+    def _close_segment(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+
+# ------------------------------------------------------------
+# READER
+# ------------------------------------------------------------
+
+def read_segment(path):
+    """The written records of one segment as bytes (header stripped)."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        _, count, _ = read_header(header)
+        return f.read(count * RECORD.size)
+
+
+def iter_records(paths):
+    """Yield ``(time, idle_ms, event, reason)`` names from segments, streaming."""
+    for path in paths:
+        for t, idle_ms, event, reason in RECORD.iter_unpack(read_segment(path)):
+            yield t, idle_ms, EVENTS[event], REASONS[reason]
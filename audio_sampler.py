@@ -0,0 +1,321 @@
+import json
+import time
+import threading
+from collections import deque
+
+
+# ------------------------------------------------------------
+# BACKENDS
+#
+# A backend provides:
+#   open()              - per-thread setup, called from the sampler thread
+#   sessions()          - current session handles (meters cached inside)
+#   is_active(handle)   - session is streaming and not muted
+#   peak(handle)        - current peak value 0.0 .. 1.0
+#   watch(callback)     - call callback() when sessions are added, removed or
+#                         change state; return False if unsupported
+# ------------------------------------------------------------
+
+class PycawAudioBackend:
+    """Core Audio sessions through pycaw, with meter interfaces cached per session."""
+
+    ACTIVE = 1  # AudioSessionStateActive
+
+    def __init__(self):
+        from pycaw.pycaw import AudioUtilities, IAudioMeterInformation
+        self._utils = AudioUtilities
+        self._meter_iid = IAudioMeterInformation
+        self._cache = {}        # instance id -> (session, meter)
+        self._callback = None
+        self._keepalive = []    # COM callback objects must outlive registration
+
+    def open(self):
+        import comtypes
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+
+    def sessions(self):
+        cache = {}
+        for session in self._utils.GetAllSessions():
+            try:
+                key = session._ctl.GetSessionInstanceIdentifier()
+                entry = self._cache.get(key)
+                if entry is None:
+                    meter = session._ctl.QueryInterface(self._meter_iid)
+                    entry = (session, meter)
+                    self._register_events(session)
+                cache[key] = entry
+            except:
+                continue
+        self._cache = cache
+        return list(cache.values())
+
+    def is_active(self, handle):
+        session, _ = handle
+        try:
+            return (session._ctl.GetState() == self.ACTIVE and
+                    not session.SimpleAudioVolume.GetMute())
+        except:
+            return False
+
+    def peak(self, handle):
+        try:
+            return handle[1].GetPeakValue()
+        except:
+            return 0.0
+
+    def watch(self, callback):
+        try:
+            from pycaw.callbacks import AudioSessionNotification
+        except ImportError:
+            return False
+
+        class SessionCreated(AudioSessionNotification):
+            def on_session_created(self, new_session):
+                callback()
+
+        self._callback = callback
+        notification = SessionCreated()
+        manager = self._utils.GetAudioSessionManager()
+        manager.RegisterSessionNotification(notification)
+        # Notifications only start flowing once the enumerator was requested.
+        manager.GetSessionEnumerator()
+        self._keepalive.append((manager, notification))
+        return True
+
+    def _register_events(self, session):
+        if self._callback is None:
+            return
+        try:
+            from pycaw.callbacks import AudioSessionEvents
+        except ImportError:
+            return
+        callback = self._callback
+
+        class StateChanged(AudioSessionEvents):
+            def on_state_changed(self, new_state, new_state_id):
+                callback()
+
+            def on_simple_volume_changed(self, new_volume, new_mute, event_context):
+                # Unmuting makes a session live without a state change.
+                callback()
+
+            def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+                callback()
+
+        events = StateChanged()
+        session._ctl.RegisterAudioSessionNotification(events)
+        self._keepalive.append((session, events))
+
+
+class NullAudioBackend:
+    """No audio sessions, for platforms without Core Audio (or without pycaw).
+
+    ``watch`` succeeds and never fires, so a sampler on it takes one
+    sample and then blocks for good: audio never holds the saver back.
+    """
+
+    def open(self):
+        pass
+
+    def sessions(self):
+        return []
+
+    def is_active(self, handle):
+        return False
+
+    def peak(self, handle):
+        return 0.0
+
+    def watch(self, callback):
+        return True
+
+
+class RecordedAudioBackend:
+    """Replay recorded peak traces: ``{"session name": [peak, peak, ...]}``.
+
+    Every call to ``advance()`` moves all traces one sample forward; a
+    session is active while its trace has samples left.
+    """
+
+    def __init__(self, traces):
+        self.traces = {name: list(peaks) for name, peaks in traces.items()}
+        self.position = 0
+        self.session_calls = 0
+        self.peak_calls = 0
+        self._callback = None
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def open(self):
+        pass
+
+    def sessions(self):
+        self.session_calls += 1
+        return list(self.traces)
+
+    def is_active(self, handle):
+        return self.position < len(self.traces[handle])
+
+    def peak(self, handle):
+        self.peak_calls += 1
+        trace = self.traces[handle]
+        return trace[self.position] if self.position < len(trace) else 0.0
+
+    def watch(self, callback):
+        self._callback = callback
+        return True
+
+    def advance(self):
+        self.position += 1
+
+    def add_session(self, name, peaks):
+        self.traces[name] = list(peaks)
+        if self._callback:
+            self._callback()
+
+
+# ------------------------------------------------------------
+# SAMPLER
+# ------------------------------------------------------------
+
+class AudioSampler:
+    """Sample session peaks in the background and keep a debounced verdict.
+
+    Peaks go into a time-stamped ring buffer covering ``window_s``.  Audio
+    turns *on* once ``on_samples`` samples in the window exceed ``threshold``
+    and only turns *off* when no sample in the window exceeds the lower
+    ``off_threshold``, so short quiet gaps do not flip the verdict.
+    ``active`` is a plain attribute that can be read at any time.
+
+    A backend error is logged, counted in ``errors`` and turns the verdict
+    off, so a broken audio stack can never hold the saver back; sampling
+    carries on at ``idle_interval_s`` until the backend recovers.
+    """
+
+    def __init__(self, backend, threshold=0.01, off_threshold=None,
+                 window_s=5.0, interval_s=0.25, idle_interval_s=2.0,
+                 on_samples=2, refresh_s=30.0, clock=time.monotonic):
+        self.backend = backend
+        self.threshold = threshold
+        self.off_threshold = threshold / 2 if off_threshold is None else off_threshold
+        self.window_s = window_s
+        self.interval_s = interval_s
+        self.idle_interval_s = idle_interval_s
+        self.on_samples = on_samples
+        self.refresh_s = refresh_s
+        self.clock = clock
+
+        self.active = False
+        self.samples = 0
+        self.refreshes = 0
+        self.errors = 0
+
+        self._window = deque()   # (timestamp, peak)
+        self._loud = 0
+        self._audible = 0
+        self._sessions = []
+        self._dirty = True
+        self._watching = False
+        self._last_refresh = None
+        self._failing = False
+        self._wake = threading.Event()
+        self._running = False
+
+    # --------------------------------------------------------
+
+    def invalidate(self):
+        """Session list changed; refresh it before the next sample."""
+        self._dirty = True
+        self._wake.set()
+
+    def _refresh_sessions(self, now):
+        self._sessions = self.backend.sessions()
+        self._dirty = False
+        self._last_refresh = now
+        self.refreshes += 1
+
+    def _push(self, now, peak):
+        window = self._window
+        window.append((now, peak))
+        self._loud += peak > self.threshold
+        self._audible += peak > self.off_threshold
+
+        horizon = now - self.window_s
+        while window and window[0][0] <= horizon:
+            _, old = window.popleft()
+            self._loud -= old > self.threshold
+            self._audible -= old > self.off_threshold
+
+        if self._loud >= self.on_samples:
+            self.active = True
+        elif self._audible == 0:
+            self.active = False
+
+    def _fail(self, error):
+        self.errors += 1
+        if not self._failing:
+            print(f"⚠️ Audio sampling failed, treating audio as silent: {error}")
+        self._failing = True
+        self._sessions = []
+        self._dirty = True
+        self._window.clear()
+        self._loud = self._audible = 0
+        self.active = False
+
+    def sample_once(self):
+        """Take one sample and update the verdict; return True if any session is live."""
+        now = self.clock()
+        peak = 0.0
+        live = False
+        try:
+            if self._dirty or (not self._watching and
+                               now - self._last_refresh >= self.refresh_s):
+                self._refresh_sessions(now)
+
+            for handle in self._sessions:
+                if self.backend.is_active(handle):
+                    live = True
+                    peak = max(peak, self.backend.peak(handle))
+        except Exception as e:
+            self._fail(e)
+            return False
+
+        if self._failing:
+            print("Audio sampling recovered")
+            self._failing = False
+        self.samples += 1
+        self._push(now, peak)
+        return live
+
+    # --------------------------------------------------------
+
+    def run(self):
+        try:
+            self.backend.open()
+            self._watching = bool(self.backend.watch(self.invalidate))
+        except Exception as e:
+            print(f"⚠️ Audio session notifications unavailable: {e}")
+            self._watching = False
+        self._running = True
+        while self._running:
+            live = self.sample_once()
+            if live or self.active:
+                delay = self.interval_s
+            elif self._watching and not self._failing:
+                # Nothing to meter: sleep until a session/state notification.
+                delay = None
+            else:
+                delay = self.idle_interval_s
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
@@ -0,0 +1,63 @@
+"""Replay a synthetic 1 kHz mouse stream through the old and new activity paths.
+
+    python bench_activity.py [seconds] [--console]
+
+Reports CPU time per event for the legacy per-event ``reset_timer`` (print
+plus timestamp write) and for ``ActivityAggregator.touch``.  The legacy
+prints go to os.devnull, which is a lower bound; ``--console`` sends them to
+stderr to include real terminal cost.
+"""
+import os
+import sys
+import time
+
+from activity import ActivityAggregator
+
+
+RATE_HZ = 1000
+
+
+def legacy_reset_timer(state, out):
+    """The pre-aggregator hot path: one formatted print and a timestamp per event."""
+    print("🔄 Mouse movement detected! Resetting timer...", file=out)
+    state["last_activity_time"] = time.time()
+
+
+def replay(handler, events):
+    start = time.process_time()
+    for i in range(events):
+        handler(i)
+    return time.process_time() - start
+
+
+def main(seconds=10, console=False):
+    events = seconds * RATE_HZ
+
+    state = {}
+    if console:
+        before = replay(lambda i: legacy_reset_timer(state, sys.stderr), events)
+    else:
+        with open(os.devnull, "w", encoding="utf-8") as out:
+            before = replay(lambda i: legacy_reset_timer(state, out), events)
+
+    # Virtual 1 kHz timestamps with a 2 s pause every second of movement, so
+    # edges are exercised as well as the steady stream.
+    tick = [0.0]
+    aggregator = ActivityAggregator(clock=lambda: tick[0])
+    touch = aggregator.touch
+
+    def feed(i):
+        tick[0] = i / RATE_HZ + (i // RATE_HZ) * 2.0
+        touch("Mouse movement")
+
+    after = replay(feed, events)
+
+    print(f"events:            {events} ({RATE_HZ} Hz for {seconds}s)")
+    print(f"before (print):    {before / events * 1e6:8.2f} µs CPU/event")
+    print(f"after (aggregate): {after / events * 1e6:8.2f} µs CPU/event")
+    print(f"edges reported:    {aggregator.edges}")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    main(int(args[0]) if args else 10, console="--console" in sys.argv)
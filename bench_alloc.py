@@ -0,0 +1,179 @@
+"""Steady-state memory growth and cost per probe tick, measured with tracemalloc.
+
+    python bench_alloc.py [--iterations N] [--max-growth BYTES]
+
+Each case is run ``--iterations`` times to warm up and then as many
+again under tracemalloc.  Traced memory must not grow by more than
+``--max-growth`` bytes per iteration over the second run (default 0.05:
+a few incidental bytes over the whole run, nothing per tick).  Exits 1
+otherwise; the test suite runs the same check.
+
+* ``daemon tick``  screen_saver_scr's probe path on the simulator's fake
+                   backends with audio and a fullscreen window playing,
+                   so the engine re-probes on every step
+* ``win32 ...``    (Windows only) the real idle, window, window map and
+                   monitor probes through win32_api, next to ``legacy``
+                   versions that build their structures and callback
+                   types on every call, as the probes used to
+"""
+import os
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+
+
+# Defaults of the CLI gate, also enforced by tests/test_alloc.py.
+ITERATIONS = 20000
+MAX_GROWTH = 0.05
+
+
+def measure(fn, iterations):
+    """(bytes grown per iteration, transient peak bytes, µs per call)."""
+    tracemalloc.start()
+    for _ in range(iterations):
+        fn()
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / iterations, peak - before, elapsed / iterations * 1e6
+
+
+# ------------------------------------------------------------
+# CASES
+# ------------------------------------------------------------
+
+def daemon_tick():
+    import screen_saver_scr as scr
+    from simulator import AUDIO, FULLSCREEN, ONE, ScrDriver, VirtualClock
+    from daemon_config import Config
+
+    vc = VirtualClock()
+    config = Config(timeout_ms=60000, metrics_port=0, journal_dir=None)
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            driver = ScrDriver(vc, config, ONE)
+            driver.media(AUDIO, True)
+            driver.media(FULLSCREEN, True)
+            # Let the engine settle into ACTIVE-with-media before measuring.
+            for _ in range(10):
+                vc.sleep(1.0)
+                driver.engine.step()
+        finally:
+            sys.stdout = stdout
+    engine, pid = driver.engine, os.getpid()
+
+    def tick():
+        vc.sleep(1.0)
+        engine.step()
+        scr.get_system_idle_ms()
+        scr.get_monitors()
+        scr.get_windows_for_pid(pid)
+
+    return tick
+
+
+def win32_cases():
+    import ctypes
+    from ctypes import wintypes
+    from platform_backends import make_win32_idle_source
+    from fullscreen_detector import FullscreenDetector, Win32WindowSource
+    from monitor_cache import MonitorTopologyCache, Win32MonitorBackend
+    from saver_launcher import Win32WindowMap
+
+    idle = make_win32_idle_source()
+    monitors = Win32MonitorBackend()
+    detector = FullscreenDetector(Win32WindowSource(), MonitorTopologyCache(monitors).rects)
+    window_map = Win32WindowMap()
+    pid = os.getpid()
+
+    def legacy_idle():
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info))
+        return ctypes.windll.kernel32.GetTickCount() - info.dwTime
+
+    def legacy_monitors():
+        class RECT(ctypes.Structure):
+            _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long),
+                        ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+        found = []
+        proc = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong,
+                                  ctypes.POINTER(RECT), ctypes.c_double)(
+            lambda hmonitor, hdc, rect, data: found.append(
+                (rect.contents.left, rect.contents.top, rect.contents.right, rect.contents.bottom)) or 1)
+        ctypes.windll.user32.EnumDisplayMonitors(0, 0, proc, 0)
+        return found
+
+    def legacy_windows():
+        found = []
+
+        def collect(hwnd, lparam):
+            rect = wintypes.RECT()
+            ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
+            found.append((rect.left, rect.top, rect.right, rect.bottom))
+            return True
+
+        proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)(collect)
+        ctypes.windll.user32.EnumWindows(proc, 0)
+        return found
+
+    return [
+        ("win32 idle", idle),
+        ("legacy idle", legacy_idle),
+        ("win32 monitors", monitors.enumerate),
+        ("legacy monitors", legacy_monitors),
+        ("win32 fullscreen", detector.covered_monitors),
+        ("legacy window rects", legacy_windows),
+        ("win32 window map", lambda: window_map.windows_by_pid([pid])),
+    ]
+
+
+def cases():
+    """(name, fn) pairs to measure on this platform."""
+    found = [("daemon tick", daemon_tick())]
+    if sys.platform == "win32":
+        found += win32_cases()
+    return found
+
+
+def gated(name):
+    # Only the probes this repo ships have to hold the line.
+    return not name.startswith("legacy")
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--max-growth", type=float, default=MAX_GROWTH, help="bytes per iteration")
+    args = parser.parse_args()
+
+    failed = False
+    for name, fn in cases():
+        grown, peak, us = measure(fn, args.iterations)
+        bad = gated(name) and grown > args.max_growth
+        failed |= bad
+        print(f"{name:20s} {us:8.2f} µs/call  growth {grown:7.3f} B/iteration  "
+              f"transient peak {peak / 1024:7.1f} KiB" + ("  ❌" if bad else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Activity journal: append cost, bounded disk use and query throughput.
+
+    python bench_journal.py [--machines N] [--days D] [--appends A] [--large R]
+
+1. ``--appends`` records are appended to a journal with small segments,
+   reporting the cost per append and the disk use against its cap.
+2. ``--machines`` x ``--days`` of desktop use (bench_schedule's synthetic
+   day, a different seed per machine and day) are run through the
+   IdleEngine on a virtual clock, each machine journaling its own
+   transitions.  journal_query then summarises every machine and merges
+   the summaries, as a fleet roll-up would, reporting records per second
+   and the size of the per-machine JSON summaries against the journals.
+3. ``--large`` records (machine 0's history repeated) are written to one
+   journal and streamed through journal_query in one go.
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+from activity_journal import ActivityJournal, HEADER, RECORD, iter_records, segments
+from bench_schedule import DAY_S, COST, Trace, build_day
+from idle_engine import IdleEngine, SAVER_RUNNING
+from probe_scheduler import ProbeScheduler
+import journal_query
+
+
+def bench_appends(directory, count):
+    journal = ActivityJournal(directory, segment_records=4096, max_segments=4)
+    start = time.perf_counter()
+    for i in range(count):
+        journal.append("IDLE_PENDING" if i % 2 else "ACTIVE", "input", i)
+    elapsed = time.perf_counter() - start
+    journal.close()
+    cap = 4 * (HEADER.size + 4096 * RECORD.size)
+    return elapsed / count, journal.disk_bytes(), cap
+
+
+def simulate_machine(directory, machine, days, timeout_ms):
+    """Run ``days`` synthetic days through the engine, journaling every transition."""
+    inputs, video = [], []
+    for day in range(days):
+        day_inputs, day_video = build_day(machine * 1000 + day)
+        inputs += [t + day * DAY_S for t in day_inputs]
+        video += [(a + day * DAY_S, b + day * DAY_S) for a, b in day_video]
+    trace = Trace(inputs, video)
+
+    journal = ActivityJournal(directory, clock=trace.clock)
+    probes = ProbeScheduler(trace.idle_ms, timeout_ms, clock=trace.clock,
+                            timer=lambda: sum(trace.cost.values()))
+    probes.add("fullscreen", trace.fullscreen, COST["fullscreen"], 2.0, 10.0)
+    probes.add("audio", trace.audio, COST["audio"], 1.0, 10.0)
+    engine = IdleEngine(timeout_ms, trace.idle_ms, lambda: None, clock=trace.clock,
+                        media_probe=probes)
+
+    def journal_transition(old, new, reason):
+        if reason == "media":
+            reason = probes.last_hit or reason
+        journal.append(new, reason, engine.idle_ms())
+
+    engine.add_listener(journal_transition)
+    end = days * DAY_S
+    while trace.now < end:
+        delay = engine.step()
+        if delay is None and engine.state == SAVER_RUNNING:
+            upcoming = trace.upcoming_input()
+            if upcoming is None:
+                break
+            trace.advance(upcoming)
+            engine.notify_saver_exited()
+            continue
+        trace.advance(min(trace.now + max(delay, 0.001), end))
+    journal.close()
+    return journal.appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--appends", type=int, default=200000)
+    parser.add_argument("--large", type=int, default=2000000, help="records in the long journal")
+    parser.add_argument("--timeout-min", type=float, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        per_append, disk, cap = bench_appends(os.path.join(workdir, "appends"), args.appends)
+        print(f"append: {per_append * 1e6:.2f} µs/record; {args.appends} records in "
+              f"{disk / 1024:.0f} KiB on disk (cap {cap / 1024:.0f} KiB)")
+
+        records, journal_bytes, summary_bytes, dirs = 0, 0, 0, []
+        for machine in range(args.machines):
+            directory = os.path.join(workdir, f"machine{machine:03d}")
+            records += simulate_machine(directory, machine, args.days, int(args.timeout_min * 60000))
+            journal_bytes += sum(os.path.getsize(p) for p in segments(directory))
+            dirs.append(directory)
+        print(f"fleet: {args.machines} machines x {args.days} days -> {records} records, "
+              f"{journal_bytes / 2**20:.1f} MiB of journal segments")
+
+        start = time.perf_counter()
+        fleet = journal_query.JournalSummary()
+        for directory in dirs:
+            data = journal_query.summarize(directory).to_dict()
+            summary_bytes += len(json.dumps(data))
+            fleet.merge(data)
+        elapsed = time.perf_counter() - start
+        print(f"query: {records / elapsed / 1e6:.2f} M records/s; per-machine summaries "
+              f"{summary_bytes / args.machines / 1024:.1f} KiB each")
+
+        # One long journal: machine 0's transitions repeated back to back.
+        big = os.path.join(workdir, "large")
+        template = list(iter_records(segments(dirs[0])))
+        span = template[-1][0] - template[0][0] + 1
+        clock = [0.0]
+        journal = ActivityJournal(big, max_segments=1 << 20, clock=lambda: clock[0])
+        for i in range(args.large):
+            t, idle_ms, event, reason = template[i % len(template)]
+            clock[0] = t + i // len(template) * span
+            journal.append(event, reason, idle_ms)
+        journal.close()
+        start = time.perf_counter()
+        summary = journal_query.summarize(big)
+        elapsed = time.perf_counter() - start
+        print(f"large journal: {summary.records} records, {journal.disk_bytes() / 2**20:.0f} MiB, "
+              f"streamed in {elapsed:.2f}s ({summary.records / elapsed / 1e6:.1f} M records/s)")
+
+        print()
+        journal_query.report(fleet, [1, 2, 5, 10, 15, 30, 60])
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Microbenchmarks for the screen_saver_scr probe hot path on fake backends.
+
+    python bench_probes.py [--windows N] [--monitors M] [--sessions K]
+                           [--calls C] [--out results.json] [--compare old.json]
+
+Each probe is timed per call (percentiles in µs) and then re-run under
+tracemalloc to report retained bytes per call and peak traced memory.
+Results are written as JSON so runs can be compared across commits.
+"""
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+
+import screen_saver_scr as scr
+from idle_engine import FakeIdleSource
+from monitor_cache import FakeMonitorBackend
+from fullscreen_detector import FakeWindowSource
+from saver_launcher import FakeWindowMap
+from audio_sampler import AudioSampler, RecordedAudioBackend
+
+
+# ------------------------------------------------------------
+# FAKE DESKTOP
+# ------------------------------------------------------------
+
+def build_desktop(windows, monitors, sessions, calls):
+    width, height = 1920, 1080
+    monitor_rects = [(i * width, 0, (i + 1) * width, height) for i in range(monitors)]
+
+    # Ordinary overlapping windows, none fullscreen, so every probe has to
+    # do its full amount of work.
+    window_list = [
+        (hwnd, (hwnd % 200, hwnd % 150, hwnd % 200 + 800, hwnd % 150 + 600))
+        for hwnd in range(1, windows + 1)
+    ]
+
+    traces = {f"session-{i}": [0.0] * (calls + 1) for i in range(sessions)}
+    audio_backend = RecordedAudioBackend(traces)
+    sampler = AudioSampler(audio_backend)
+
+    scr.install_backends(
+        idle=FakeIdleSource(),
+        monitors=FakeMonitorBackend(monitor_rects),
+        windows=FakeWindowSource(window_list, foreground=1),
+        window_map=FakeWindowMap(time.monotonic, windows=[(h, h % 97) for h, _ in window_list]),
+        audio=sampler,
+    )
+    return sampler, audio_backend
+
+
+def probes(sampler, audio_backend):
+    def sample_audio():
+        sampler.sample_once()
+        audio_backend.advance()
+
+    return {
+        "get_system_idle_ms": scr.get_system_idle_ms,
+        "is_audio_playing": scr.is_audio_playing,
+        "audio_sampler.sample_once": sample_audio,
+        "is_fullscreen_active_any_monitor": scr.is_fullscreen_active_any_monitor,
+        "get_monitors": scr.get_monitors,
+        "get_windows_for_pid": lambda: scr.get_windows_for_pid(42),
+    }
+
+
+# ------------------------------------------------------------
+# MEASUREMENT
+# ------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    index = min(int(len(sorted_values) * pct / 100), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def measure(fn, calls):
+    fn()  # warm caches, as the daemon would after its first tick
+
+    timings = []
+    clock = time.perf_counter_ns
+    for _ in range(calls):
+        start = clock()
+        fn()
+        timings.append(clock() - start)
+    timings.sort()
+
+    tracemalloc.start()
+    fn()
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(calls):
+        fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    us = [t / 1000 for t in timings]
+    return {
+        "calls": calls,
+        "mean_us": round(sum(us) / len(us), 3),
+        "p50_us": round(percentile(us, 50), 3),
+        "p90_us": round(percentile(us, 90), 3),
+        "p99_us": round(percentile(us, 99), 3),
+        "max_us": round(us[-1], 3),
+        "retained_bytes_per_call": round((after - before) / calls, 2),
+        "peak_traced_kib": round(peak / 1024, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(current, previous_path):
+    with open(previous_path, "r") as f:
+        previous = json.load(f)
+    print(f"\nvs {previous_path} ({previous['meta'].get('revision')}):")
+    for name, result in current["probes"].items():
+        old = previous["probes"].get(name)
+        if old:
+            ratio = result["p50_us"] / old["p50_us"] if old["p50_us"] else float("inf")
+            print(f"  {name:34s} p50 x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=300)
+    parser.add_argument("--monitors", type=int, default=3)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--out")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    sampler, audio_backend = build_desktop(args.windows, args.monitors, args.sessions, 3 * args.calls)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "windows": args.windows,
+            "monitors": args.monitors,
+            "sessions": args.sessions,
+        },
+        "probes": {},
+    }
+    for name, fn in probes(sampler, audio_backend).items():
+        r = results["probes"][name] = measure(fn, args.calls)
+        print(f"{name:34s} p50={r['p50_us']:9.2f}µs p99={r['p99_us']:9.2f}µs "
+              f"retained={r['retained_bytes_per_call']:7.1f}B/call")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Frames per second and CPU per frame of the built-in renderer, headless.
+
+    python bench_renderer.py [--size WxH] [--frames N] [--seconds S] [--fps F] [--budget-ms B]
+
+Needs no display: frames are presented to an in-memory screen buffer
+(HeadlessPresenter), which still costs a copy of every dirty region.  For
+each effect:
+
+* ``uncapped``  as many frames as possible at full quality
+* ``capped``    ``--seconds`` of wall time at ``--fps`` with automatic
+                quality, reporting CPU use and the quality it settled on
+                (``--budget-ms`` below the frame time forces it down)
+* ``loop``      for mystify and starfield, the same frame drawn with a
+                per-object Python loop, for comparison with the NumPy path
+"""
+import time
+import argparse
+
+import numpy as np
+
+from saver_renderer import (EFFECTS, HeadlessPresenter, SaverRenderer, MystifyEffect,
+                            StarfieldEffect)
+
+
+# ------------------------------------------------------------
+# PER-OBJECT BASELINES
+# ------------------------------------------------------------
+
+def loop_starfield(effect, frame, dt):
+    """StarfieldEffect.draw, one star at a time."""
+    cx, cy = effect.width / 2, effect.height / 2
+    for x, y in effect._drawn_loop:
+        frame[y, x] = 0
+    drawn = []
+    for star in effect.xyz[:effect.stars]:
+        star[2] -= effect.speed * dt
+        sx = cx + star[0] / star[2] * cx if star[2] > 0.01 else -1
+        sy = cy + star[1] / star[2] * cy if star[2] > 0.01 else -1
+        if not (0 <= sx < effect.width - 1 and 0 <= sy < effect.height - 1):
+            star[0], star[1], star[2] = effect.rng.uniform(-1, 1), effect.rng.uniform(-1, 1), 1.0
+            sx, sy = cx + star[0] * cx, cy + star[1] * cy
+        shade = min(max(int((1.0 - star[2]) * 255), 40), 255)
+        frame[int(sy), int(sx)] = shade
+        drawn.append((int(sx), int(sy)))
+    effect._drawn_loop = drawn
+
+
+def loop_mystify(effect, frame, dt):
+    """MystifyEffect.draw, one line segment and one pixel at a time."""
+    for x, y in effect._drawn_loop:
+        frame[y, x] = 0
+    effect.pos += effect.vel * dt
+    low, high = effect.pos < 0, effect.pos > effect.size
+    effect.vel[low | high] *= -1
+    np.clip(effect.pos, 0, effect.size, out=effect.pos)
+    effect.history = [effect.pos.copy()] + effect.history[:effect.trail - 1]
+    drawn = []
+    for age, shape in enumerate(effect.history):
+        for polygon, points in enumerate(shape):
+            color = effect.colors[polygon] * (1.0 - age / effect.trail)
+            for i in range(len(points)):
+                (x0, y0), (x1, y1) = points[i], points[(i + 1) % len(points)]
+                steps = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+                for step in range(steps):
+                    t = step / max(steps - 1, 1)
+                    x, y = round(x0 + t * (x1 - x0)), round(y0 + t * (y1 - y0))
+                    frame[y, x] = color
+                    drawn.append((x, y))
+    effect._drawn_loop = drawn
+
+
+LOOPS = {"starfield": (StarfieldEffect, loop_starfield), "mystify": (MystifyEffect, loop_mystify)}
+
+
+# ------------------------------------------------------------
+# RUNS
+# ------------------------------------------------------------
+
+def uncapped(name, width, height, frames):
+    presenter = HeadlessPresenter(width, height)
+    renderer = SaverRenderer(EFFECTS[name](width, height, seed=1), presenter,
+                             fps=1e6, budget_s=float("inf"))
+    wall, cpu = time.perf_counter(), time.process_time()
+    renderer.run(frames=frames)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    dirty = presenter.pixels / frames / (width * height)
+    return frames / wall, cpu / frames, dirty
+
+
+def capped(name, width, height, seconds, fps, budget_s):
+    renderer = SaverRenderer(EFFECTS[name](width, height, seed=1),
+                             HeadlessPresenter(width, height), fps=fps, budget_s=budget_s)
+    cpu = time.process_time()
+    renderer.run(seconds=seconds)
+    cpu = time.process_time() - cpu
+    return renderer.frames / seconds, cpu / seconds, renderer.quality, renderer.downgrades
+
+
+def loop(name, width, height, frames):
+    cls, draw = LOOPS[name]
+    effect = cls(width, height, seed=1)
+    effect._drawn_loop, effect.history = [], []
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    cpu = time.process_time()
+    for _ in range(frames):
+        draw(effect, frame, 1 / 30)
+    return (time.process_time() - cpu) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--budget-ms", type=float, help="frame time budget (default: 1000 / fps)")
+    args = parser.parse_args()
+    width, height = map(int, args.size.lower().split("x"))
+
+    print(f"{width}x{height}, headless")
+    for name in EFFECTS:
+        rate, cpu, dirty = uncapped(name, width, height, args.frames)
+        print(f"{name:10s} uncapped  {rate:8.1f} fps  cpu={cpu * 1000:7.3f}ms/frame  "
+              f"dirty={dirty * 100:5.1f}% of screen/frame")
+        rate, share, quality, downgrades = capped(name, width, height, args.seconds, args.fps,
+                                                   args.budget_ms and args.budget_ms / 1000)
+        print(f"{'':10s} capped    {rate:8.1f} fps  cpu={share * 100:6.2f}% of a core  "
+              f"quality={quality:g} (downgrades={downgrades})")
+        if name in LOOPS:
+            # The loops are slow; a few frames are enough.
+            frames = max(args.frames // 30, 3)
+            print(f"{'':10s} loop      cpu={loop(name, width, height, frames) * 1000:7.3f}ms/frame "
+                  f"(NumPy draw: {cpu * 1000:.3f}ms incl. present)")
+
+
+if __name__ == "__main__":
+    main()
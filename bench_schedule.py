@@ -0,0 +1,191 @@
+"""Probe CPU over a simulated day, with and without the probe scheduler.
+
+    python bench_schedule.py [--timeout-min N] [--seed S] [--out results.json]
+
+A synthetic 24 h desktop trace (office hours with typing bursts and short
+pauses, an idle lunch, an evening of fullscreen video with no input, idle
+night) is replayed on a virtual clock.  Three strategies are compared:
+
+* ``poll``       the original loop: both media probes once per second
+* ``engine``     the deadline IdleEngine calling audio, then fullscreen
+* ``scheduler``  the IdleEngine with ProbeScheduler (cost ordering,
+                 idle gate, per-probe intervals, short-circuiting)
+
+Probe cost is charged from a per-call cost model, so the result does not
+depend on the machine running the bench.
+"""
+import json
+import random
+import argparse
+
+from idle_engine import IdleEngine, SAVER_RUNNING
+from probe_scheduler import ProbeScheduler
+
+
+DAY_S = 24 * 3600
+# Seconds per call, roughly what bench_probes measures on a busy desktop.
+COST = {"audio": 0.002, "fullscreen": 0.0005}
+
+
+# ------------------------------------------------------------
+# SYNTHETIC DAY
+# ------------------------------------------------------------
+
+def build_day(seed):
+    """Return (sorted input times, [(start, end)] of fullscreen video with audio)."""
+    rng = random.Random(seed)
+    inputs = []
+    # The evening video is started by hand, so input runs right up to it.
+    for start_h, end_h in ((8, 12), (13, 18), (18.9, 19.0), (21.5, 22.5)):
+        t = start_h * 3600
+        while t < end_h * 3600:
+            # Mostly steady typing/mousing, sometimes reading or a meeting.
+            roll = rng.random()
+            if roll < 0.02:
+                t += rng.uniform(300, 1500)
+            elif roll < 0.10:
+                t += rng.uniform(20, 120)
+            else:
+                t += rng.expovariate(1 / 3.0)
+            inputs.append(t)
+    video = [(19 * 3600, 21 * 3600)]
+    return inputs, video
+
+
+class Trace:
+    """Virtual clock plus the probes' answers at any instant of the day."""
+
+    def __init__(self, inputs, video):
+        self.inputs = inputs
+        self.video = video
+        self.now = 0.0
+        self.last_input = 0.0
+        self.next_input = 0
+        self.cost = {name: 0.0 for name in COST}
+        self.calls = {name: 0 for name in COST}
+
+    def clock(self):
+        return self.now
+
+    def advance(self, t):
+        """Move the clock to ``t``, consuming inputs on the way; return True if any."""
+        self.now = t
+        seen = False
+        while self.next_input < len(self.inputs) and self.inputs[self.next_input] <= t:
+            self.last_input = self.inputs[self.next_input]
+            self.next_input += 1
+            seen = True
+        return seen
+
+    def upcoming_input(self):
+        if self.next_input < len(self.inputs):
+            return self.inputs[self.next_input]
+        return None
+
+    def idle_ms(self):
+        return int((self.now - self.last_input) * 1000)
+
+    def _media(self):
+        return any(start <= self.now < end for start, end in self.video)
+
+    def audio(self):
+        self.calls["audio"] += 1
+        self.cost["audio"] += COST["audio"]
+        return self._media()
+
+    def fullscreen(self):
+        self.calls["fullscreen"] += 1
+        self.cost["fullscreen"] += COST["fullscreen"]
+        return self._media()
+
+
+# ------------------------------------------------------------
+# STRATEGIES
+# ------------------------------------------------------------
+
+def run_poll(trace, timeout_ms):
+    """The original one-second loop: both probes every tick the saver is down."""
+    saver_running, activations, media_until = False, 0, 0.0
+    for second in range(DAY_S):
+        if trace.advance(second) and saver_running:
+            saver_running = False
+        if saver_running:
+            continue
+        if trace.audio() or trace.fullscreen():
+            media_until = second
+        if second - max(trace.last_input, media_until) >= timeout_ms / 1000:
+            saver_running = True
+            activations += 1
+    return {"activations": activations}
+
+
+def run_engine(trace, timeout_ms, scheduled):
+    activations = []
+    media_probe = lambda: trace.audio() or trace.fullscreen()
+    scheduler = None
+    if scheduled:
+        # Time calls by the cost model, not by the host running the bench.
+        scheduler = ProbeScheduler(trace.idle_ms, timeout_ms, clock=trace.clock,
+                                   timer=lambda: sum(trace.cost.values()))
+        scheduler.add("fullscreen", trace.fullscreen, COST["fullscreen"], 2.0, 10.0)
+        scheduler.add("audio", trace.audio, COST["audio"], 1.0, 10.0)
+        media_probe = scheduler
+
+    engine = IdleEngine(timeout_ms, trace.idle_ms, lambda: activations.append(trace.now),
+                        clock=trace.clock, media_probe=media_probe)
+    while trace.now < DAY_S:
+        delay = engine.step()
+        if delay is None and engine.state == SAVER_RUNNING:
+            # The saver runs until the next input dismisses it.
+            upcoming = trace.upcoming_input()
+            if upcoming is None:
+                break
+            trace.advance(upcoming)
+            engine.notify_saver_exited()
+            continue
+        trace.advance(min(trace.now + max(delay, 0.001), DAY_S))
+    result = {"activations": len(activations), "steps": engine.wakeups}
+    if scheduler is not None:
+        result["scheduler"] = scheduler.stats()
+    return result
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout-min", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    timeout_ms = int(args.timeout_min * 60000)
+    inputs, video = build_day(args.seed)
+    results = {}
+    for name, run in (("poll", lambda t: run_poll(t, timeout_ms)),
+                      ("engine", lambda t: run_engine(t, timeout_ms, False)),
+                      ("scheduler", lambda t: run_engine(t, timeout_ms, True))):
+        trace = Trace(inputs, video)
+        outcome = run(trace)
+        outcome.update(calls=trace.calls, cpu_s=round(sum(trace.cost.values()), 4))
+        results[name] = outcome
+
+    baseline = results["poll"]["cpu_s"]
+    print(f"{len(inputs)} input events, timeout {args.timeout_min:g} min, {len(video)} video session(s)")
+    for name, outcome in results.items():
+        saved = 100 * (1 - outcome["cpu_s"] / baseline) if baseline else 0
+        print(f"{name:10s} probe cpu={outcome['cpu_s']:9.3f}s/day  "
+              f"audio={outcome['calls']['audio']:6d}  fullscreen={outcome['calls']['fullscreen']:6d}  "
+              f"vs poll: -{saved:.2f}%")
+    engine_cpu, sched_cpu = results["engine"]["cpu_s"], results["scheduler"]["cpu_s"]
+    print(f"scheduler vs engine alone: -{100 * (1 - sched_cpu / engine_cpu):.1f}% probe cpu")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
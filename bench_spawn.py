@@ -0,0 +1,77 @@
+"""Spawn latency and leaked children: shell launch vs. supervised process trees.
+
+    python bench_spawn.py [--runs N] [--program CMD]
+
+POSIX only.  ``shell`` reproduces the old ``Popen(..., shell=True)``
+launch, where the pid and ``terminate()`` belong to the shell (``sh -c``
+with a trailing command stands in for cmd.exe, which always stays
+resident); ``tree`` is process_tree.spawn_tree.  For each, the bench
+reports per-spawn latency and how many processes are still alive after
+``terminate()`` on what the launcher handed back.
+"""
+import os
+import sys
+import time
+import shlex
+import signal
+import argparse
+import statistics
+import subprocess
+
+from process_tree import group_members, spawn_tree
+
+
+def alive(pids):
+    still = []
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        if stat[stat.rfind(b")") + 2:].split()[0] != b"Z":
+            still.append(pid)
+    return still
+
+
+def run(kind, argv, runs):
+    spawn_ms, leaked = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        if kind == "shell":
+            proc = subprocess.Popen(shlex.join(argv) + "; :", shell=True, start_new_session=True)
+        else:
+            proc = spawn_tree(argv)
+        spawn_ms.append((time.perf_counter() - start) * 1000)
+
+        time.sleep(0.05)
+        # Both run in their own session, so the group is everything started.
+        members = group_members(proc.pid)
+
+        proc.terminate()
+        proc.wait()
+        time.sleep(0.05)
+        survivors = alive(members)
+        leaked += len(survivors)
+        for pid in survivors:
+            os.kill(pid, signal.SIGKILL)
+    return statistics.median(spawn_ms), max(spawn_ms), leaked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--program", default="sleep 30")
+    args = parser.parse_args()
+    if not os.path.isdir("/proc/self"):
+        sys.exit("bench_spawn.py needs /proc")
+
+    argv = shlex.split(args.program)
+    for kind in ("shell", "tree"):
+        p50, worst, leaked = run(kind, argv, args.runs)
+        print(f"{kind:6s} spawn p50={p50:6.2f}ms max={worst:6.2f}ms   "
+              f"processes left after terminate(): {leaked}/{args.runs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Activation latency with and without warm standby, on fake saver processes.
+
+    python bench_standby.py [--monitors N] [--lead S] [--near-misses K]
+
+For several saver start-up times (how long a .scr takes to put up its
+window), the deadline-to-covered latency of a cold launch is compared with
+showing a warm-standby batch.  Then a run of "near misses" (the user comes
+back a second before the deadline) is replayed under both standby
+policies to show what each costs in extra launches.  Everything runs on
+a virtual clock, so it is quick and machine independent.
+"""
+import argparse
+
+from idle_engine import IdleEngine, FakeIdleSource
+from saver_launcher import SaverLauncher, FakeLauncher, FakeWindowMap
+from saver_standby import WarmStandby, TEARDOWN, KEEP_WARM
+
+
+class VirtualTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class NoTimer:
+    """Keep-warm expiry never fires within the bench."""
+
+    def __init__(self, delay, fn, args=()):
+        pass
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        pass
+
+
+def build(startup_s, monitors, policy, lead_s, timeout_s, standby):
+    vt = VirtualTime()
+    window_map = FakeWindowMap(vt.clock, delay_s=startup_s)
+    launcher = FakeLauncher(window_map)
+    saver_launcher = SaverLauncher(launcher, window_map, clock=vt.clock, sleep=vt.sleep)
+    rects = [(i * 1920, 0, (i + 1) * 1920, 1080) for i in range(monitors)]
+    warm = WarmStandby(saver_launcher, window_map, policy, clock=vt.clock,
+                       timer=NoTimer, background=False)
+    latencies = []
+
+    def activate():
+        deadline = vt.now
+        result = warm.take("bench.scr", rects) if standby else None
+        if result is None:
+            result = saver_launcher.launch_all("bench.scr", rects)
+        # None: the launcher gave up before every monitor was covered.
+        latencies.append(None if result.uncovered else vt.now - deadline)
+
+    idle = FakeIdleSource(vt.clock)
+    engine = IdleEngine(
+        timeout_s * 1000, idle, activate, clock=vt.clock,
+        prepare=(lambda: warm.prepare("bench.scr", rects)) if standby else None,
+        cancel_prepare=warm.cancel, prepare_lead_s=lead_s,
+    )
+    return vt, idle, engine, launcher, warm, latencies
+
+
+def until_prepared_or_activated(vt, engine):
+    # The prepare launch itself advances virtual time while it waits for
+    # windows, so step until the engine has nothing left before the deadline.
+    while True:
+        delay = engine.step()
+        if delay is None:
+            return
+        vt.now += delay
+
+
+def latency(startup_s, monitors, lead_s, standby):
+    """(deadline -> covered, whether a warm batch was shown rather than cold-started)."""
+    vt, idle, engine, _, warm, latencies = build(startup_s, monitors, TEARDOWN, lead_s, 60, standby)
+    until_prepared_or_activated(vt, engine)
+    return latencies[0], warm.last_show_s is not None
+
+
+def near_misses(policy, count, monitors, lead_s):
+    vt, idle, engine, launcher, warm, latencies = build(1.0, monitors, policy, lead_s, 60, True)
+    for _ in range(count):
+        while not engine.prepared:
+            vt.now += engine.step()
+        # Come back one second before the deadline.
+        vt.now += max((engine.timeout_ms - engine.idle_ms()) / 1000 - 1.0, 0)
+        idle.input()
+        engine.step()
+    until_prepared_or_activated(vt, engine)
+    return len(launcher.launched), latencies[-1]
+
+
+def fmt(seconds):
+    return "  not covered" if seconds is None else f"{seconds * 1000:9.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--monitors", type=int, default=2)
+    parser.add_argument("--lead", type=float, default=5.0)
+    parser.add_argument("--near-misses", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"deadline -> all {args.monitors} monitors covered (lead {args.lead:g}s)")
+    # 8 s is past SaverLauncher's 3 s timeout, and past the lead.
+    for startup_s in (0.1, 0.5, 1.0, 2.5, 8.0):
+        cold, _ = latency(startup_s, args.monitors, args.lead, standby=False)
+        warm, shown = latency(startup_s, args.monitors, args.lead, standby=True)
+        print(f"  saver start-up {startup_s:4.1f}s   cold={fmt(cold)}   warm={fmt(warm)}"
+              + ("" if shown else "  (warm batch unusable, cold-started)"))
+
+    print(f"{args.near_misses} near misses, then a real timeout (start-up 1s):")
+    for policy in (TEARDOWN, KEEP_WARM):
+        launched, last = near_misses(policy, args.near_misses, args.monitors, args.lead)
+        print(f"  policy={policy:8s}  saver processes started={launched:4d}  "
+              f"final activation={fmt(last)}")
+
+
+if __name__ == "__main__":
+    main()
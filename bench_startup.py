@@ -0,0 +1,116 @@
+"""Measure screen_saver_scr startup cost and enforce a budget.
+
+    python bench_startup.py [--runs N] [--import-budget-ms MS] [--first-tick-budget-ms MS]
+
+* import time: ``python -X importtime -c "import screen_saver_scr"``,
+  cumulative time of the module plus the slowest imports underneath it.
+* time to first loop iteration: wall time from spawning the interpreter to
+  the idle engine's first step, with fake platform backends so it runs
+  headless on Linux.
+
+Medians over ``--runs`` are compared against the budgets; the exit status
+is 1 if either is exceeded.  The test suite runs the same measurement
+against the default budgets.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Also enforced by tests/test_startup_budget.py.
+IMPORT_BUDGET_MS = 150.0
+FIRST_TICK_BUDGET_MS = 600.0
+
+FIRST_TICK = """
+import screen_saver_scr as scr
+from daemon_config import Config
+from idle_engine import FakeIdleSource
+from monitor_cache import FakeMonitorBackend
+from fullscreen_detector import FakeWindowSource
+from saver_launcher import FakeLauncher, FakeWindowMap
+import time
+
+scr.install_backends(
+    idle=FakeIdleSource(),
+    monitors=FakeMonitorBackend([(0, 0, 1920, 1080)]),
+    windows=FakeWindowSource([]),
+    window_map=FakeWindowMap(time.monotonic),
+)
+saver = scr.Screensaver(Config(metrics_port=0, detect_audio=False), run=False)
+saver.engine.step()
+print("<first-tick>", flush=True)
+"""
+
+
+def import_times(runs):
+    totals, last = [], None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import screen_saver_scr"],
+            cwd=HERE, capture_output=True, text=True, check=True
+        )
+        rows = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+        totals.append(next(c for _, c, n in rows if n.strip() == "screen_saver_scr") / 1000)
+        last = rows
+    return statistics.median(totals), sorted(last, reverse=True)[:10]
+
+
+def first_tick_times(runs):
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-c", FIRST_TICK],
+            cwd=HERE, stdout=subprocess.PIPE, text=True
+        )
+        for line in proc.stdout:
+            # Background threads may print onto the same line.
+            if "<first-tick>" in line:
+                break
+        else:
+            raise RuntimeError("startup probe did not reach the first loop iteration")
+        elapsed = (time.perf_counter() - start) * 1000
+        proc.wait()
+        results.append(elapsed)
+    return statistics.median(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--first-tick-budget-ms", type=float, default=FIRST_TICK_BUDGET_MS)
+    args = parser.parse_args()
+
+    import_ms, slowest = import_times(args.runs)
+    tick_ms = first_tick_times(args.runs)
+
+    print(f"import screen_saver_scr:      {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f})")
+    print(f"spawn -> first loop iteration: {tick_ms:8.1f} ms (budget {args.first_tick_budget_ms:.0f})")
+    print("slowest imports (self µs):")
+    for self_us, cumulative_us, name in slowest:
+        print(f"  {self_us:8d} {cumulative_us:8d} {name}")
+
+    over = []
+    if import_ms > args.import_budget_ms:
+        over.append("import")
+    if tick_ms > args.first_tick_budget_ms:
+        over.append("first tick")
+    if over:
+        print(f"❌ over budget: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
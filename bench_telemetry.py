@@ -0,0 +1,189 @@
+"""Telemetry: daemon-side cost per event, upload throughput and an outage.
+
+    python bench_telemetry.py [--events N] [--batch B] [--naive N] [--outage S]
+
+Everything runs against a TelemetryCollector on a local port.
+
+1. ``record``    cost of TelemetryAgent.record() in the calling thread,
+                 with the sender uploading in the background
+2. ``batched``   ``--events`` state events end to end: events/s until the
+                 collector has them all, wire bytes per event, connections
+3. ``naive``     the same events POSTed one by one as plain JSON on a new
+                 connection each (urllib), as a baseline
+4. ``jitter``    oversleep of a thread waking every 10 ms (the idle loop's
+                 shortest sleeps) alone and while the agent uploads flat out
+5. ``outage``    the collector goes away for ``--outage`` seconds while
+                 events keep coming; reports what was spooled and whether
+                 every event arrived once it was back
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import urllib.request
+
+from telemetry import TelemetryAgent
+from telemetry_collector import TelemetryCollector
+
+
+STATES = ("ACTIVE", "IDLE_PENDING", "SAVER_RUNNING", "DISMISSED")
+
+
+def event(i):
+    return {"old": STATES[i % 4], "new": STATES[(i + 1) % 4], "reason": "input", "idle_ms": i * 37 % 600000}
+
+
+def wait_for(collector, events, timeout_s=60.0):
+    deadline = time.monotonic() + timeout_s
+    while collector.events < events and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return collector.events >= events
+
+
+# ------------------------------------------------------------
+# SCENARIOS
+# ------------------------------------------------------------
+
+def bench_batched(spool, count, batch):
+    collector = TelemetryCollector().start()
+    agent = TelemetryAgent(collector.url, spool, batch_size=batch, flush_s=0.05,
+                           queue_max=count + 1).start()
+    fields = [event(i) for i in range(count)]
+    start = time.perf_counter()
+    for f in fields:
+        agent.record("state", **f)
+    recorded = time.perf_counter() - start
+    wait_for(collector, count)
+    elapsed = time.perf_counter() - start
+    agent.stop()
+    collector.stop()
+    raw = len(json.dumps([[0.0, "state", f] for f in fields[:1000]])) / 1000
+    return {"record_us": recorded / count * 1e6, "rate": collector.events / elapsed,
+            "wire_bytes": collector.bytes / max(collector.events, 1), "raw_bytes": raw,
+            "connects": agent.sender.connects, "batches": collector.batches,
+            "delivered": collector.events}
+
+
+def bench_naive(count):
+    collector = TelemetryCollector().start()
+    start = time.perf_counter()
+    for i in range(count):
+        body = json.dumps({"machine": "bench", "session": "naive", "seq": i,
+                           "events": [[time.time(), "state", event(i)]]}).encode("utf-8")
+        request = urllib.request.Request(collector.url, body, {"Content-Type": "application/json"})
+        urllib.request.urlopen(request).read()
+    elapsed = time.perf_counter() - start
+    collector.stop()
+    return {"rate": count / elapsed, "wire_bytes": collector.bytes / count}
+
+
+def oversleep(duration_s, period_s=0.01):
+    late, end = [], time.perf_counter() + duration_s
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        time.sleep(period_s)
+        late.append(time.perf_counter() - start - period_s)
+    late.sort()
+    return late[len(late) // 2], late[int(len(late) * 0.99)]
+
+
+def bench_jitter(spool, duration_s, batch):
+    quiet = oversleep(duration_s)
+    collector = TelemetryCollector().start()
+    agent = TelemetryAgent(collector.url, spool, batch_size=batch, flush_s=0.05).start()
+    stop = threading.Event()
+
+    def flood():
+        i = 0
+        while not stop.is_set():
+            agent.record("state", **event(i))
+            i += 1
+            if i % batch == 0:
+                time.sleep(0.001)
+
+    threading.Thread(target=flood, daemon=True).start()
+    busy = oversleep(duration_s)
+    stop.set()
+    agent.stop()
+    collector.stop()
+    return quiet, busy, collector.events / duration_s
+
+
+def bench_outage(spool, outage_s, rate_hz):
+    collector = TelemetryCollector().start()
+    port = collector.port
+    agent = TelemetryAgent(collector.url, spool, batch_size=50, flush_s=0.2,
+                           backoff_s=0.2, backoff_max_s=2.0).start()
+    sent, peak_spool = 0, 0
+
+    def produce(seconds):
+        nonlocal sent, peak_spool
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            agent.record("state", **event(sent))
+            sent += 1
+            peak_spool = max(peak_spool, agent.pending()[1])
+            time.sleep(1 / rate_hz)
+
+    produce(1.0)
+    collector.stop()
+    produce(outage_s)
+    spooled = agent.pending()[1]
+    delivered_before = collector.events
+    collector = TelemetryCollector(port=port).start()
+    back = time.monotonic()
+    produce(1.0)
+    complete = wait_for(collector, sent - delivered_before, timeout_s=30.0)
+    recovered_s = time.monotonic() - back
+    agent.stop()
+    collector.stop()
+    return {"sent": sent, "delivered": delivered_before + collector.events, "spooled": spooled,
+            "peak_spool": peak_spool, "failures": agent.failures, "dropped": agent.dropped,
+            "duplicates": collector.duplicates, "complete": complete, "recovered_s": recovered_s}
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--naive", type=int, default=2000, help="events for the one-POST-per-event baseline")
+    parser.add_argument("--jitter-s", type=float, default=3.0)
+    parser.add_argument("--outage", type=float, default=5.0, help="seconds without a collector")
+    parser.add_argument("--rate", type=float, default=200.0, help="events/s during the outage run")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        b = bench_batched(os.path.join(workdir, "batched"), args.events, args.batch)
+        print(f"record:  {b['record_us']:.2f} µs/event in the calling thread")
+        print(f"batched: {b['rate']:10.0f} events/s end to end, {b['delivered']}/{args.events} delivered "
+              f"in {b['batches']} batches over {b['connects']} connection(s); "
+              f"{b['wire_bytes']:.1f} B/event on the wire ({b['raw_bytes']:.0f} B as plain JSON)")
+
+        n = bench_naive(args.naive)
+        print(f"naive:   {n['rate']:10.0f} events/s, {n['wire_bytes']:.0f} B/event "
+              f"-> batched is {b['rate'] / n['rate']:.0f}x faster")
+
+        quiet, busy, rate = bench_jitter(os.path.join(workdir, "jitter"), args.jitter_s, args.batch)
+        print(f"jitter:  10 ms sleeps oversleep median/p99 {quiet[0] * 1000:.2f}/{quiet[1] * 1000:.2f} ms "
+              f"alone, {busy[0] * 1000:.2f}/{busy[1] * 1000:.2f} ms while uploading {rate:.0f} events/s")
+
+        o = bench_outage(os.path.join(workdir, "outage"), args.outage, args.rate)
+        print(f"outage:  {args.outage:g}s offline at {args.rate:g} events/s: {o['spooled']} batches spooled "
+              f"(peak {o['peak_spool']}), {o['failures']} failed upload(s); "
+              f"{o['delivered']}/{o['sent']} delivered, {o['duplicates']} duplicate(s), "
+              f"{o['dropped']} dropped; caught up {o['recovered_s']:.1f}s after the collector returned"
+              + ("" if o["complete"] else "  ⚠️ INCOMPLETE"))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
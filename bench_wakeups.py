@@ -0,0 +1,203 @@
+"""Wakeups and input detection latency: one-second poll vs. the Linux idle backends.
+
+    python bench_wakeups.py [--idle S] [--burst S] [--rate HZ] [--cycles N] [--record FILE]
+
+Linux only, runs in real time.  One scripted session (a few cycles of
+idle, a mouse burst, idle, some keypresses) is fed at once to:
+
+* ``poll``        the old loop: wake every second and compare idle time
+* ``evdev``       EvdevIdleSource reading a FIFO the events are written to
+* ``interrupts``  InterruptsIdleSource sampling a fake /proc/interrupts
+                  whose keyboard/mouse counters the script bumps
+
+For each, the bench reports thread wakeups (overall and during the final idle stretch)
+and how long after the first event of each burst the idle -> active edge
+was reported.  ``--record`` replays a raw evdev capture
+(``cat /dev/input/eventN > FILE``) in place of the scripted input.
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+
+from activity import ActivityAggregator
+from linux_input import (EvdevIdleSource, InterruptsIdleSource, EV_KEY, EV_REL, EV_SYN,
+                         pack_event, unpack_events)
+
+
+# ------------------------------------------------------------
+# INPUT SCRIPT
+# ------------------------------------------------------------
+
+def scripted(idle_s, burst_s, rate_hz, cycles):
+    """(timestamp, packet) pairs: ``cycles`` times idle, mouse burst, idle, keys; then idle."""
+    packets, t = [], 0.0
+    for cycle in range(cycles):
+        # Shift each cycle by a fraction of a second so bursts do not all
+        # land at the same phase of the one-second poll.
+        t += idle_s + cycle / cycles
+        for i in range(int(burst_s * rate_hz)):
+            packets.append((t + i / rate_hz, pack_event(EV_REL, 0, 1) + pack_event(EV_SYN, 0, 0)))
+        t += burst_s + idle_s
+        for i in range(10):
+            for value in (1, 0):
+                packets.append((t, pack_event(EV_KEY, 30, value) + pack_event(EV_SYN, 0, 0)))
+                t += 0.125
+    return packets, t + idle_s
+
+
+def recorded(path, idle_s):
+    """(timestamp, packet) pairs from a raw capture, starting after ``idle_s``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    packets, packet, start = [], [], None
+    for timestamp, type, code, value in unpack_events(data):
+        start = timestamp if start is None else start
+        packet.append(pack_event(type, code, value))
+        if type == EV_SYN:
+            packets.append((idle_s + timestamp - start, b"".join(packet)))
+            packet = []
+    return packets, (packets[-1][0] if packets else 0) + idle_s
+
+
+def edge_starts(packets, gap_s=1.0):
+    starts, previous = [], None
+    for t, _ in packets:
+        if previous is None or t - previous > gap_s:
+            starts.append(t)
+        previous = t
+    return starts
+
+
+# ------------------------------------------------------------
+# SOURCES
+# ------------------------------------------------------------
+
+class PollSource:
+    """The one-second loop, looking at when the script last wrote input."""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.activity = ActivityAggregator(edge_gap_s=1.5)
+        self.wakeups = 0
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        seen = 0
+        while not self._stop.wait(1.0):
+            self.wakeups += 1
+            if self.feed.writes != seen:
+                seen = self.feed.writes
+                self.activity.touch("poll")
+
+    def stop(self):
+        self._stop.set()
+
+
+class Feed:
+    """Writes packets to the FIFO and bumps the fake interrupt counter."""
+
+    def __init__(self, fifo, interrupts):
+        self.fifo = fifo
+        self.interrupts = interrupts
+        self.writes = 0
+
+    def write_interrupts(self):
+        tmp = self.interrupts + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("           CPU0\n")
+            f.write(f"  1: {self.writes:10d}  IO-APIC   1-edge      i8042\n")
+            f.write(f" 28: {999:10d}  PCI-MSI   0-edge      nvme0q0\n")
+        os.replace(tmp, self.interrupts)
+
+    def run(self, packets, start):
+        fd = os.open(self.fifo, os.O_WRONLY)
+        try:
+            for t, packet in packets:
+                delay = start + t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                os.write(fd, packet)
+                self.writes += 1
+                self.write_interrupts()
+        finally:
+            os.close(fd)
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+
+def latencies(edges, starts, start):
+    result = []
+    for begin in starts:
+        after = [t - start - begin for t in edges if t - start >= begin]
+        if after:
+            result.append(min(after))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds of idle between bursts")
+    parser.add_argument("--burst", type=float, default=3.0, help="seconds of mouse movement")
+    parser.add_argument("--rate", type=float, default=125.0, help="mouse report rate")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--record", help="raw evdev capture to replay instead")
+    args = parser.parse_args()
+
+    if args.record:
+        packets, duration = recorded(args.record, args.idle)
+    else:
+        packets, duration = scripted(args.idle, args.burst, args.rate, args.cycles)
+    starts = edge_starts(packets)
+    # Seconds in which nothing is typed or moved.
+    busy = sum(min(b - a, 1.0) for (a, _), (b, _) in zip(packets, packets[1:]))
+    idle_s = duration - busy
+
+    workdir = tempfile.mkdtemp()
+    try:
+        fifo = os.path.join(workdir, "event0")
+        os.mkfifo(fifo)
+        feed = Feed(fifo, os.path.join(workdir, "interrupts"))
+        feed.write_interrupts()
+
+        sources = {
+            "poll": PollSource(feed),
+            "evdev": EvdevIdleSource([fifo]).start(),
+            "interrupts": InterruptsIdleSource(path=feed.interrupts).start(),
+        }
+        edges = {name: [] for name in sources}
+        for name, source in sources.items():
+            source.activity.on_activity = lambda _, name=name: edges[name].append(time.monotonic())
+
+        print(f"{len(packets)} input packets, {len(starts)} bursts, {duration:.1f}s "
+              f"({idle_s:.1f}s without input); running in real time...")
+        start = time.monotonic()
+        feed.run(packets, start)
+        # The trailing idle period, after the last burst has been absorbed.
+        time.sleep(2.0)
+        tail_start = time.monotonic()
+        before = {name: source.wakeups for name, source in sources.items()}
+        time.sleep(max(start + duration - time.monotonic(), 0))
+        tail_s = time.monotonic() - tail_start
+        elapsed = time.monotonic() - start
+        for source in sources.values():
+            source.stop()
+    finally:
+        shutil.rmtree(workdir)
+
+    for name, source in sources.items():
+        lat = latencies(edges[name], starts, start)
+        mean = f"{statistics.mean(lat) * 1000:8.1f}ms" if lat else "       n/a"
+        idle_rate = (source.wakeups - before[name]) / tail_s
+        print(f"{name:10s} wakeups={source.wakeups:5d} ({source.wakeups / elapsed:4.2f}/s, "
+              f"{idle_rate:4.2f}/s idle)  edges={len(edges[name]):3d}/{len(starts)}  edge latency mean={mean}")
+
+
+if __name__ == "__main__":
+    main()
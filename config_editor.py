@@ -1,34 +1,44 @@
 import tkinter as tk
 from tkinter import messagebox
 import tkinter.ttk as ttk
-import json
-import glob
 import os
 import subprocess
 
-CONFIG_FILE = "config.json"
-SYSTEM32 = os.path.join(os.environ["WINDIR"], "System32")
+from daemon_config import CONFIG_FILE, ConfigError, parse_config, read_raw, write_raw
+from daemon_control import ControlError, DaemonNotRunning, send_command
+from saver_catalog import SaverCatalog
 
 # -------------------------------
 # Utility functions
 # -------------------------------
+def saver_dirs():
+    """Directories to list savers from, as configured (System32 by default)."""
+    try:
+        return parse_config(read_raw(CONFIG_FILE)).saver_dirs
+    except (ConfigError, ValueError, OSError):
+        return parse_config({}).saver_dirs
+
+catalog = SaverCatalog(saver_dirs())
+
 def list_screensavers():
-    """Return list of .scr files in System32."""
-    return [os.path.basename(f) for f in glob.glob(os.path.join(SYSTEM32, "*.scr"))]
+    """Return .scr file names from the catalog index (may be stale until refreshed)."""
+    return catalog.names()
 
 def load_config():
     """Load config.json or return defaults."""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
+        config = read_raw(CONFIG_FILE)
     except Exception:
-        config = {"timeout": 1, "lock_on_activate": False, "screensaver": None}
-    return config
+        config = {}
+    return config or {"timeout": 1, "lock_on_activate": False, "screensaver": None}
 
 def save_config(config):
-    """Save config.json with pretty formatting."""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+    """Save config.json atomically and have the running daemon apply it now."""
+    write_raw(config, CONFIG_FILE)
+    try:
+        send_command("reload")
+    except DaemonNotRunning:
+        pass
 
 # -------------------------------
 # Tkinter callbacks
@@ -40,25 +50,45 @@ def submit():
         use_lock = lock_var.get()
         chosen_saver = screensaver_var.get()
 
-        config = {
+        # Keep keys this dialog does not edit (metrics settings etc.)
+        config = load_config()
+        # parse_config prefers timeout_ms over timeout, so a leftover one
+        # would silently undo the edit.
+        config.pop("screensaver_path", None)
+        config.pop("timeout_ms", None)
+        config.update({
             "timeout": timeout_minutes,
             "lock_on_activate": use_lock,
             "screensaver": chosen_saver
-        }
+        })
         save_config(config)
         messagebox.showinfo("Success", "Configuration saved!")
     except ValueError:
         messagebox.showerror("Error", "Timeout must be a whole number (in minutes)!")
+    except ControlError as e:
+        messagebox.showwarning("Saved", f"Configuration saved, but the daemon rejected it:\n{e}")
 
 def preview_screensaver():
     """Run the chosen screensaver immediately (preview)."""
     chosen_saver = screensaver_var.get()
-    if chosen_saver:
-        saver_path = os.path.join(SYSTEM32, chosen_saver)
-        try:
-            subprocess.Popen([saver_path])
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not launch screensaver:\n{e}")
+    if not chosen_saver:
+        return
+    try:
+        # The daemon covers every monitor and supervises the children.
+        send_command("preview", chosen_saver)
+        return
+    except DaemonNotRunning:
+        pass
+    except ControlError as e:
+        messagebox.showerror("Error", f"Could not preview screensaver:\n{e}")
+        return
+    # No daemon running: launch it directly on the primary monitor.
+    saver = catalog.find(chosen_saver)
+    saver_path = saver.path if saver else os.path.join(catalog.dirs[0], chosen_saver)
+    try:
+        subprocess.Popen([saver_path])
+    except Exception as e:
+        messagebox.showerror("Error", f"Could not launch screensaver:\n{e}")
 
 # -------------------------------
 # Tkinter UI setup
@@ -73,7 +103,7 @@ root.geometry("400x250")
 # Timeout
 tk.Label(root, text="Timeout (minutes):").pack(pady=5)
 timeout_entry = tk.Entry(root)
-timeout_entry.insert(0, str(config.get("timeout", 1)))
+timeout_entry.insert(0, str(max(config["timeout_ms"] // 60000, 1) if "timeout_ms" in config else config.get("timeout", 1)))
 timeout_entry.pack(pady=5)
 
 # Lock option
@@ -86,6 +116,22 @@ screensaver_var = tk.StringVar(value=config.get("screensaver", screensavers[0] i
 screensaver_combo = ttk.Combobox(root, textvariable=screensaver_var, values=screensavers, state="readonly")
 screensaver_combo.pack(pady=5)
 
+def show_screensavers():
+    """Refill the dropdown from the catalog, keeping the current choice."""
+    names = list_screensavers()
+    screensaver_combo["values"] = names
+    if not screensaver_var.get() and names:
+        screensaver_var.set(names[0])
+
+def wait_for_scan(scan):
+    # Tk may only be touched from this thread, so poll the worker briefly.
+    if scan.is_alive():
+        root.after(100, wait_for_scan, scan)
+    else:
+        show_screensavers()
+
+wait_for_scan(catalog.refresh_async())
+
 # Buttons
 tk.Button(root, text="Save Configuration", command=submit).pack(pady=10)
 tk.Button(root, text="Preview Screensaver", command=preview_screensaver).pack(pady=5)
@@ -0,0 +1,324 @@
+import os
+import sys
+import json
+import time
+import threading
+from dataclasses import dataclass
+
+
+CONFIG_FILE = "config.json"
+# Built-in renderer effects for screen_saver.py ("blank": black window).
+EFFECTS = ("mystify", "starfield", "clock", "blank")
+SYSTEM32 = os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "System32")
+
+
+class ConfigError(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# SCHEMA
+# ------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Config:
+    """The one config schema shared by every entry point.
+
+    On disk ``timeout`` is in minutes (what config_editor writes).  Legacy
+    files that stored milliseconds (values >= 1000) are still understood,
+    as is the old ``screensaver_path`` key.
+    """
+
+    timeout_ms: int = 60000
+    lock_on_activate: bool = False
+    screensaver: str = "Mystify.scr"
+    detect_audio: bool = True
+    detect_fullscreen: bool = True
+    metrics_port: int = 9464
+    metrics_file: str = None
+    metrics_flush_s: float = 60.0
+    saver_dirs: tuple = (SYSTEM32,)
+    warm_standby: bool = False
+    standby_lead_s: float = 5.0
+    standby_policy: str = "teardown"
+    standby_keep_s: float = 300.0
+    effect: str = "mystify"
+    effect_fps: float = 30.0
+    journal_dir: str = "journal"
+    journal_max_mb: float = 16.0
+    telemetry_url: str = None
+    telemetry_spool_dir: str = "telemetry-spool"
+    telemetry_flush_s: float = 30.0
+
+    @property
+    def scr_path(self):
+        """Absolute path of the configured saver (bare names live in the first saver dir)."""
+        if os.path.isabs(self.screensaver):
+            return self.screensaver
+        return os.path.join(self.saver_dirs[0], self.screensaver)
+
+
+def parse_config(raw):
+    """Validate a decoded config.json dict and return a Config."""
+    if not isinstance(raw, dict):
+        raise ConfigError("config must be a JSON object")
+
+    values = {}
+    if "timeout_ms" in raw:
+        timeout_ms = raw["timeout_ms"]
+    elif "timeout" in raw:
+        timeout = raw["timeout"]
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)):
+            raise ConfigError(f"timeout must be a number of minutes, got {timeout!r}")
+        timeout_ms = timeout if timeout >= 1000 else timeout * 60000
+    else:
+        timeout_ms = Config.timeout_ms
+    if isinstance(timeout_ms, bool) or not isinstance(timeout_ms, (int, float)) or timeout_ms <= 0:
+        raise ConfigError(f"timeout must be positive, got {timeout_ms!r}")
+    values["timeout_ms"] = int(timeout_ms)
+
+    saver = raw.get("screensaver") or raw.get("screensaver_path")
+    if saver is not None:
+        if not isinstance(saver, str):
+            raise ConfigError(f"screensaver must be a file name, got {saver!r}")
+        values["screensaver"] = saver
+
+    for key in ("lock_on_activate", "detect_audio", "detect_fullscreen", "warm_standby"):
+        if key in raw:
+            if not isinstance(raw[key], bool):
+                raise ConfigError(f"{key} must be true or false")
+            values[key] = raw[key]
+
+    if "saver_dirs" in raw:
+        dirs = raw["saver_dirs"]
+        if (not isinstance(dirs, list) or not dirs
+                or not all(isinstance(d, str) and d for d in dirs)):
+            raise ConfigError(f"saver_dirs must be a non-empty list of directories, got {dirs!r}")
+        values["saver_dirs"] = tuple(dirs)
+
+    for key in ("standby_lead_s", "standby_keep_s"):
+        if key in raw:
+            value = raw[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ConfigError(f"{key} must be a number of seconds, got {value!r}")
+            values[key] = float(value)
+    if "standby_policy" in raw:
+        if raw["standby_policy"] not in ("teardown", "keep"):
+            raise ConfigError(f"standby_policy must be \"teardown\" or \"keep\", got {raw['standby_policy']!r}")
+        values["standby_policy"] = raw["standby_policy"]
+
+    if "effect" in raw:
+        if raw["effect"] not in EFFECTS:
+            raise ConfigError(f"effect must be one of {', '.join(EFFECTS)}, got {raw['effect']!r}")
+        values["effect"] = raw["effect"]
+    if "effect_fps" in raw:
+        fps = raw["effect_fps"]
+        if isinstance(fps, bool) or not isinstance(fps, (int, float)) or fps <= 0:
+            raise ConfigError(f"effect_fps must be a positive number, got {fps!r}")
+        values["effect_fps"] = float(fps)
+
+    if "journal_dir" in raw:
+        if raw["journal_dir"] is not None and not isinstance(raw["journal_dir"], str):
+            raise ConfigError(f"journal_dir must be a directory or null, got {raw['journal_dir']!r}")
+        values["journal_dir"] = raw["journal_dir"]
+    if "journal_max_mb" in raw:
+        size = raw["journal_max_mb"]
+        if isinstance(size, bool) or not isinstance(size, (int, float)) or size < 1:
+            raise ConfigError(f"journal_max_mb must be at least 1, got {size!r}")
+        values["journal_max_mb"] = float(size)
+
+    if "telemetry_url" in raw:
+        url = raw["telemetry_url"]
+        if url is not None and not (isinstance(url, str) and url.startswith(("http://", "https://"))):
+            raise ConfigError(f"telemetry_url must be an http(s) URL or null, got {url!r}")
+        values["telemetry_url"] = url
+    if "telemetry_spool_dir" in raw:
+        if not isinstance(raw["telemetry_spool_dir"], str) or not raw["telemetry_spool_dir"]:
+            raise ConfigError(f"telemetry_spool_dir must be a directory, got {raw['telemetry_spool_dir']!r}")
+        values["telemetry_spool_dir"] = raw["telemetry_spool_dir"]
+    if "telemetry_flush_s" in raw:
+        flush = raw["telemetry_flush_s"]
+        if isinstance(flush, bool) or not isinstance(flush, (int, float)) or flush <= 0:
+            raise ConfigError(f"telemetry_flush_s must be a positive number of seconds, got {flush!r}")
+        values["telemetry_flush_s"] = float(flush)
+
+    if "metrics_port" in raw:
+        port = raw["metrics_port"]
+        if port is not None and (isinstance(port, bool) or not isinstance(port, int)
+                                 or not 0 <= port <= 65535):
+            raise ConfigError(f"metrics_port must be a port number (0 or null to disable), got {port!r}")
+        values["metrics_port"] = port or 0
+    if "metrics_file" in raw:
+        if raw["metrics_file"] is not None and not (isinstance(raw["metrics_file"], str) and raw["metrics_file"]):
+            raise ConfigError(f"metrics_file must be a file name or null, got {raw['metrics_file']!r}")
+        values["metrics_file"] = raw["metrics_file"]
+    if "metrics_flush_s" in raw:
+        flush = raw["metrics_flush_s"]
+        if isinstance(flush, bool) or not isinstance(flush, (int, float)) or flush <= 0:
+            raise ConfigError(f"metrics_flush_s must be a positive number of seconds, got {flush!r}")
+        values["metrics_flush_s"] = float(flush)
+
+    return Config(**values)
+
+
+# ------------------------------------------------------------
+# FILE I/O
+# ------------------------------------------------------------
+
+def read_raw(path=CONFIG_FILE):
+    """Decoded config.json, or {} if it does not exist."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_raw(raw, path=CONFIG_FILE):
+    """Write config.json atomically so watchers never see a half-written file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(raw, f, indent=4)
+    os.replace(tmp, path)
+
+
+def load_config(path=CONFIG_FILE):
+    """Load and validate config.json; fall back to defaults if it is unusable."""
+    try:
+        return parse_config(read_raw(path))
+    except (ConfigError, ValueError, OSError) as e:
+        print(f"⚠️ Invalid config {path}: {e} — using defaults")
+        return Config()
+
+
+# ------------------------------------------------------------
+# CHANGE WATCHING
+# ------------------------------------------------------------
+
+class ConfigWatcher:
+    """Call ``on_change(config)`` whenever the config file changes validly.
+
+    Uses inotify on Linux and directory change notifications on Windows,
+    both blocking with no polling; elsewhere (or if those fail) it falls
+    back to checking the mtime every ``poll_s`` seconds.  Invalid edits are
+    reported and ignored, keeping the previous config.  A config someone
+    else already applied (see ``accept``) is not applied again.
+    """
+
+    def __init__(self, path, on_change, poll_s=2.0):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.poll_s = poll_s
+        self.current = load_config(path)
+        self._signature = self._stat()
+        self._running = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        try:
+            if sys.platform.startswith("linux"):
+                return self._run_inotify()
+            if sys.platform == "win32":
+                return self._run_win32()
+        except OSError as e:
+            print(f"⚠️ Config change notifications unavailable ({e}); polling instead")
+        self._run_mtime()
+
+    # --------------------------------------------------------
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def check(self):
+        """Reload if the file changed on disk; return True if a new config was applied."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            config = parse_config(read_raw(self.path))
+        except (ConfigError, ValueError, OSError) as e:
+            print(f"⚠️ Ignoring invalid config change: {e}")
+            return False
+        if not self.accept(config):
+            return False
+        self.on_change(config)
+        return True
+
+    def accept(self, config):
+        """Make ``config`` current; False if it already was, so only one caller applies it."""
+        with self._lock:
+            if config == self.current:
+                return False
+            self.current = config
+            return True
+
+    def _run_mtime(self):
+        while self._running:
+            time.sleep(self.poll_s)
+            self.check()
+
+    def _run_inotify(self):
+        import ctypes
+        import struct
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x8, 0x80, 0x100
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory, name = os.path.split(self.path)
+        # Watch the directory: editors and write_raw replace the file.
+        if libc.inotify_add_watch(fd, directory.encode(), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+        header = struct.Struct("iIII")
+        try:
+            while self._running:
+                data = os.read(fd, 4096)
+                offset, changed = 0, False
+                while offset < len(data):
+                    _, _, _, length = header.unpack_from(data, offset)
+                    start = offset + header.size
+                    event_name = data[start:start + length].rstrip(b"\0").decode(errors="replace")
+                    changed |= event_name == name
+                    offset = start + length
+                if changed:
+                    self.check()
+        finally:
+            os.close(fd)
+
+    def _run_win32(self):
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        FILE_NOTIFY_CHANGE_FILE_NAME, FILE_NOTIFY_CHANGE_LAST_WRITE = 0x1, 0x10
+        INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+        handle = kernel32.FindFirstChangeNotificationW(
+            os.path.dirname(self.path), False,
+            FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if handle in (None, INVALID_HANDLE_VALUE):
+            raise OSError("FindFirstChangeNotificationW failed")
+        try:
+            while self._running:
+                kernel32.WaitForSingleObject(ctypes.c_void_p(handle), 0xFFFFFFFF)
+                self.check()
+                if not kernel32.FindNextChangeNotification(ctypes.c_void_p(handle)):
+                    raise OSError("FindNextChangeNotification failed")
+        finally:
+            kernel32.FindCloseChangeNotification(ctypes.c_void_p(handle))
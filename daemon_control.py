@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+# Per user, like the control address: on a shared host every user's
+# daemon needs its own lock (and could not open someone else's file).
+if sys.platform == "win32":
+    _USER = os.environ.get("USERNAME", "user")
+    ADDRESS = r"\\.\pipe\screensaver-control-" + _USER
+else:
+    _USER = str(os.getuid())
+    ADDRESS = os.path.join(tempfile.gettempdir(), f"screensaver-{_USER}.sock")
+LOCK_FILE = os.path.join(tempfile.gettempdir(), f"screensaver-daemon-{_USER}.lock")
+
+
+class ControlError(RuntimeError):
+    pass
+
+
+class DaemonNotRunning(ControlError):
+    pass
+
+
+class AlreadyRunning(RuntimeError):
+    def __init__(self, pid):
+        super().__init__(f"another screensaver daemon is running (pid {pid or '?'})")
+        self.pid = pid
+
+
+# ------------------------------------------------------------
+# SINGLE-INSTANCE LOCK
+# ------------------------------------------------------------
+
+class InstanceLock:
+    """Exclusive lock on a file, released by the OS when the process dies.
+
+    Uses ``msvcrt.locking`` on Windows and ``fcntl.flock`` elsewhere, so a
+    crashed daemon never leaves a stale lock behind.  The owner's pid is
+    written into the file for error messages.
+    """
+
+    def __init__(self, path=LOCK_FILE):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        f = open(self.path, "a+")
+        try:
+            f.seek(0)
+            if sys.platform == "win32":
+                import msvcrt
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            raise AlreadyRunning(self._owner())
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return self
+
+    def _owner(self):
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def single_instance(path=LOCK_FILE):
+    """Take the daemon lock or exit; every daemon entry point shares it."""
+    try:
+        return InstanceLock(path).acquire()
+    except AlreadyRunning as e:
+        print(f"⚠️ {str(e).capitalize()} — exiting")
+        sys.exit(1)
+    except OSError as e:
+        print(f"⚠️ Cannot open the daemon lock {path}: {e} — exiting")
+        sys.exit(1)
+
+
+# ------------------------------------------------------------
+# CONTROL CHANNEL
+# ------------------------------------------------------------
+
+class ControlServer:
+    """Serve ``handlers`` (name -> fn(*args)) over a named pipe / Unix socket.
+
+    Requests and replies are small JSON documents; nothing is unpickled
+    from clients.  Each connection gets its own thread and may send any
+    number of requests.
+    """
+
+    def __init__(self, handlers, address=ADDRESS):
+        self.handlers = dict(handlers)
+        self.address = address
+        self._listener = None
+
+    def handle(self, request):
+        """Dispatch one decoded request and return the reply dict."""
+        try:
+            fn = self.handlers[request["cmd"]]
+        except (KeyError, TypeError):
+            return {"ok": False, "error": f"unknown command {request!r}"}
+        try:
+            return {"ok": True, "result": fn(*request.get("args", []))}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def start(self):
+        from multiprocessing.connection import Listener
+
+        if not self.address.startswith("\\\\") and os.path.exists(self.address):
+            # Left over from a crashed daemon; the instance lock says it is ours.
+            os.unlink(self.address)
+        self._listener = Listener(self.address)
+        if not self.address.startswith("\\\\"):
+            os.chmod(self.address, 0o600)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def _accept_loop(self):
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._listener is None:
+                    return
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            while True:
+                try:
+                    data = conn.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self.handle(json.loads(data))
+                except ValueError as e:
+                    reply = {"ok": False, "error": f"bad request: {e}"}
+                conn.send_bytes(json.dumps(reply, default=str).encode("utf-8"))
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+
+def send_command(cmd, *args, address=ADDRESS, timeout=5.0):
+    """Run ``cmd`` in the daemon and return its result."""
+    from multiprocessing.connection import Client
+
+    try:
+        conn = Client(address)
+    except OSError as e:
+        raise DaemonNotRunning(f"no screensaver daemon at {address} ({e})")
+    with conn:
+        conn.send_bytes(json.dumps({"cmd": cmd, "args": list(args)}).encode("utf-8"))
+        if not conn.poll(timeout):
+            raise ControlError(f"daemon did not answer {cmd!r} within {timeout}s")
+        reply = json.loads(conn.recv_bytes())
+    if not reply["ok"]:
+        raise ControlError(reply["error"])
+    return reply["result"]
+
+
+def inhibit(name, reason="", duration_s=None, address=ADDRESS):
+    """Keep the saver away until ``uninhibit`` or this process exits; return the token."""
+    return send_command("inhibit", name, reason, duration_s, os.getpid(), address=address)
+
+
+def uninhibit(token, address=ADDRESS):
+    return send_command("uninhibit", token, address=address)
+
+
+@contextmanager
+def inhibited(name, reason="", duration_s=None, address=ADDRESS):
+    """``with inhibited("kiosk", "playing video"):`` holds a lock for the block."""
+    token = inhibit(name, reason, duration_s, address)
+    try:
+        yield token
+    finally:
+        uninhibit(token, address)
@@ -0,0 +1,227 @@
+import numpy as np
+
+
+# ------------------------------------------------------------
+# GEOMETRY CORE (PLATFORM-INDEPENDENT)
+# ------------------------------------------------------------
+
+def coverage_matrix(window_rects, monitor_rects, tolerance=5):
+    """Return a (windows x monitors) bool matrix of which window covers which monitor.
+
+    Rects are (left, top, right, bottom).  A window covers a monitor when it
+    reaches every edge of it, give or take ``tolerance`` pixels.
+    """
+    w = np.asarray(window_rects, dtype=np.int64).reshape(-1, 4)
+    m = np.asarray(monitor_rects, dtype=np.int64).reshape(-1, 4)
+    return (
+        (w[:, None, 0] <= m[None, :, 0] + tolerance) &
+        (w[:, None, 1] <= m[None, :, 1] + tolerance) &
+        (w[:, None, 2] >= m[None, :, 2] - tolerance) &
+        (w[:, None, 3] >= m[None, :, 3] - tolerance)
+    )
+
+
+# ------------------------------------------------------------
+# WINDOW SOURCES
+# ------------------------------------------------------------
+
+class Win32WindowSource:
+    """Visible top-level windows in z-order via EnumWindows."""
+
+    DESKTOP_CLASSES = ("Progman", "WorkerW")
+
+    def __init__(self):
+        import ctypes
+        from win32_api import RECT, WNDENUMPROC, user32
+
+        self._user32 = user32
+        self._rect = RECT()
+        self._rect_ref = ctypes.byref(self._rect)
+        self._class_buf = ctypes.create_unicode_buffer(64)
+        self._limit = 0
+        self._found = []
+        self._enum_proc = WNDENUMPROC(self._collect)
+
+    def _collect(self, hwnd, lparam):
+        if self._user32.IsWindowVisible(hwnd):
+            self._found.append(hwnd)
+            if self._limit and len(self._found) >= self._limit:
+                return False
+        return True
+
+    def foreground(self):
+        return self._user32.GetForegroundWindow() or 0
+
+    def z_order(self, limit=0):
+        self._found = []
+        self._limit = limit
+        self._user32.EnumWindows(self._enum_proc, 0)
+        return self._found
+
+    def rect(self, hwnd):
+        r = self._rect
+        if not self._user32.GetWindowRect(hwnd, self._rect_ref):
+            return None
+        return (r.left, r.top, r.right, r.bottom)
+
+    def is_desktop(self, hwnd):
+        """The shell/wallpaper windows span every monitor but are not fullscreen apps."""
+        if hwnd == self._user32.GetShellWindow():
+            return True
+        self._user32.GetClassNameW(hwnd, self._class_buf, len(self._class_buf))
+        return self._class_buf.value in self.DESKTOP_CLASSES
+
+
+class NullWindowSource:
+    """No windows, for platforms without a window enumeration backend."""
+
+    def foreground(self):
+        return 0
+
+    def z_order(self, limit=0):
+        return []
+
+    def rect(self, hwnd):
+        return None
+
+    def is_desktop(self, hwnd):
+        return False
+
+
+class FakeWindowSource:
+    """Synthetic window list: ``windows`` is [(hwnd, rect), ...] top to bottom."""
+
+    def __init__(self, windows, foreground=0, desktop=()):
+        self.set_windows(windows)
+        self.foreground_hwnd = foreground
+        self.desktop = set(desktop)
+        self.rect_calls = 0
+        self.enum_calls = 0
+
+    def set_windows(self, windows):
+        self.windows = list(windows)
+        self._rects = dict(self.windows)
+
+    def foreground(self):
+        return self.foreground_hwnd
+
+    def z_order(self, limit=0):
+        self.enum_calls += 1
+        hwnds = [hwnd for hwnd, _ in self.windows]
+        return hwnds[:limit] if limit else hwnds
+
+    def rect(self, hwnd):
+        self.rect_calls += 1
+        return self._rects.get(hwnd)
+
+    def is_desktop(self, hwnd):
+        return hwnd in self.desktop
+
+
+# ------------------------------------------------------------
+# INCREMENTAL DETECTOR
+# ------------------------------------------------------------
+
+class FullscreenDetector:
+    """Report which monitors are covered by a fullscreen window.
+
+    The foreground window and the top of the z-order are checked first since
+    that is where a fullscreen video or game lives; if any of them covers a
+    monitor, only those hits are reported.  Otherwise the full window list is
+    swept, and only windows whose hwnd or geometry changed since the previous
+    sweep are re-tested.
+    """
+
+    def __init__(self, window_source, monitor_source, tolerance=5, top_n=8):
+        self.windows = window_source
+        self.monitor_source = monitor_source
+        self.tolerance = tolerance
+        self.top_n = top_n
+
+        self.fast_hits = 0
+        self.sweeps = 0
+        self.retested = 0
+
+        self._monitors = None
+        self._monitor_array = None
+        self._fast = {}          # hwnd -> (rect, covered row)
+        self._sweep_hwnds = None
+        self._sweep_rects = None
+        self._sweep_covers = None
+
+    def _refresh_monitors(self):
+        monitors = self.monitor_source()
+        if monitors != self._monitors:
+            self._monitors = monitors
+            self._monitor_array = np.asarray(monitors, dtype=np.int64).reshape(-1, 4)
+            self._fast = {}
+            self._sweep_hwnds = None
+        return self._monitor_array
+
+    def _fast_path(self, monitors):
+        result = np.zeros(len(monitors), dtype=bool)
+        fast = {}
+        candidates = [self.windows.foreground()] + self.windows.z_order(self.top_n)
+        for hwnd in candidates:
+            if not hwnd or hwnd in fast:
+                continue
+            rect = self.windows.rect(hwnd)
+            if rect is None:
+                continue
+            cached = self._fast.get(hwnd)
+            if cached is not None and cached[0] == rect:
+                covers = cached[1]
+            else:
+                self.retested += 1
+                covers = coverage_matrix(rect, monitors, self.tolerance)[0]
+            fast[hwnd] = (rect, covers)
+            if covers.any() and not self.windows.is_desktop(hwnd):
+                result |= covers
+        self._fast = fast
+        return result if result.any() else None
+
+    def _sweep(self, monitors):
+        self.sweeps += 1
+        hwnds, rects = [], []
+        for hwnd in self.windows.z_order():
+            rect = self.windows.rect(hwnd)
+            if rect is not None:
+                hwnds.append(hwnd)
+                rects.append(rect)
+        hwnds = np.asarray(hwnds, dtype=np.int64)
+        rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+
+        if self._sweep_hwnds is not None and np.array_equal(hwnds, self._sweep_hwnds):
+            covers = self._sweep_covers
+            changed = np.flatnonzero((rects != self._sweep_rects).any(axis=1))
+            if changed.size:
+                covers = covers.copy()
+                covers[changed] = coverage_matrix(rects[changed], monitors, self.tolerance)
+            self.retested += changed.size
+        else:
+            covers = coverage_matrix(rects, monitors, self.tolerance)
+            self.retested += len(hwnds)
+
+        self._sweep_hwnds, self._sweep_rects, self._sweep_covers = hwnds, rects, covers
+
+        result = np.zeros(len(monitors), dtype=bool)
+        for row in np.flatnonzero(covers.any(axis=1)):
+            if not self.windows.is_desktop(int(hwnds[row])):
+                result |= covers[row]
+        return result
+
+    def covered_monitors(self):
+        """Indices of monitors currently covered by a fullscreen window."""
+        monitors = self._refresh_monitors()
+        if not len(monitors):
+            return ()
+
+        covers = self._fast_path(monitors)
+        if covers is not None:
+            self.fast_hits += 1
+        else:
+            covers = self._sweep(monitors)
+        return tuple(int(i) for i in np.flatnonzero(covers))
+
+    def is_fullscreen(self):
+        return bool(self.covered_monitors())
@@ -0,0 +1,297 @@
+import time
+import threading
+
+
+# ------------------------------------------------------------
+# STATES
+# ------------------------------------------------------------
+
+ACTIVE = "ACTIVE"
+IDLE_PENDING = "IDLE_PENDING"
+SAVER_RUNNING = "SAVER_RUNNING"
+DISMISSED = "DISMISSED"
+LOCKED = "LOCKED"
+
+
+# ------------------------------------------------------------
+# FAKE IDLE SOURCE (TESTS / BENCHMARKS)
+# ------------------------------------------------------------
+
+class FakeIdleSource:
+    """Idle milliseconds derived from an injected clock; ``input()`` simulates a keypress."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.last_input = clock()
+
+    def input(self):
+        self.last_input = self.clock()
+
+    def __call__(self):
+        return int((self.clock() - self.last_input) * 1000)
+
+
+# ------------------------------------------------------------
+# DEADLINE-DRIVEN IDLE ENGINE
+# ------------------------------------------------------------
+
+class IdleEngine:
+    """Idle state machine that sleeps until the next instant anything can change.
+
+    Idle time only grows while nothing happens, so instead of polling every
+    second the engine computes when the timeout would expire and sleeps until
+    then.  If input arrived meanwhile the idle source reports a smaller value
+    and a new deadline is computed.  Media probes only run once the timeout
+    is reached (and while media keeps the saver away), and not at all while
+    an ``inhibitors`` registry holds a lock.
+
+    With ``prepare`` set, the engine also wakes ``prepare_lead_s`` before
+    the deadline and calls it (warm standby); if activity pushes the
+    deadline back out again, ``cancel_prepare`` is called.
+
+    ``clock`` returns seconds, ``idle_source`` returns milliseconds since the
+    last real input.  Both are injectable so the engine can be driven with a
+    virtual clock.
+    """
+
+    def __init__(self, timeout_ms, idle_source, activate,
+                 clock=time.monotonic, media_probe=None, media_poll_s=10.0,
+                 pending_after_ms=2000, inhibitors=None, inhibit_poll_s=30.0,
+                 prepare=None, cancel_prepare=None, prepare_lead_s=5.0):
+        self.timeout_ms = timeout_ms
+        self.idle_source = idle_source
+        self.activate = activate
+        self.clock = clock
+        self.media_probe = media_probe
+        self.media_poll_s = media_poll_s
+        self.pending_after_ms = pending_after_ms
+        self.inhibitors = inhibitors
+        self.inhibit_poll_s = inhibit_poll_s
+        self.prepare = prepare
+        self.cancel_prepare = cancel_prepare
+        self.prepare_lead_s = prepare_lead_s
+
+        self.state = ACTIVE
+        self.last_activity = clock()
+        self.media_active = False
+        self.paused_until = None
+        self.inhibited = False
+        self.prepared = False
+        self.wakeups = 0
+
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._running = False
+        self._listeners = []
+
+    # --------------------------------------------------------
+
+    def add_listener(self, fn):
+        """Call ``fn(old_state, new_state, reason)`` on every transition."""
+        self._listeners.append(fn)
+
+    def _set_state(self, new, reason):
+        old = self.state
+        if old == new:
+            return
+        self.state = new
+        for fn in self._listeners:
+            try:
+                fn(old, new, reason)
+            except Exception as e:
+                print(f"⚠️ State listener failed: {e}")
+
+    # --------------------------------------------------------
+    # EVENTS (callable from any thread)
+    # --------------------------------------------------------
+
+    def register_activity(self, reason):
+        """Treat ``reason`` as user activity at the current instant."""
+        with self._lock:
+            self.last_activity = self.clock()
+            if self.state == IDLE_PENDING:
+                self._set_state(ACTIVE, reason)
+
+    def notify_saver_exited(self):
+        """Tell the engine the saver processes are gone."""
+        with self._lock:
+            if self.state == SAVER_RUNNING:
+                self._set_state(DISMISSED, "saver exit")
+        self.wake()
+
+    def set_session_locked(self, locked):
+        """Park the engine while the session is locked; unlocking starts a fresh idle period."""
+        with self._lock:
+            if locked:
+                self._unprepare()
+                self._set_state(LOCKED, "session locked")
+            elif self.state == LOCKED:
+                self.last_activity = self.clock()
+                self.media_active = False
+                self._set_state(ACTIVE, "session unlocked")
+        self.wake()
+
+    def pause(self, duration_s=None):
+        """Hold off activation for ``duration_s`` seconds (``None``: until ``resume``)."""
+        with self._lock:
+            self.paused_until = float("inf") if duration_s is None else self.clock() + duration_s
+        self.wake()
+
+    def resume(self):
+        """End a pause; idle time is counted afresh from now."""
+        with self._lock:
+            if self.paused_until is not None:
+                self.paused_until = None
+                self.last_activity = self.clock()
+        self.wake()
+
+    def activate_now(self, reason="requested"):
+        """Start the saver immediately; return False if it is running or the session is locked."""
+        with self._lock:
+            if self.state in (SAVER_RUNNING, LOCKED):
+                return False
+            started = self._activate(self.clock(), reason)
+        self.wake()
+        return started
+
+    def set_timeout(self, timeout_ms):
+        """Change the timeout in place; idle time accumulated so far is kept."""
+        with self._lock:
+            self.timeout_ms = timeout_ms
+        self.wake()
+
+    def wake(self):
+        """Interrupt the current sleep and re-evaluate immediately."""
+        self._wake.set()
+
+    def stop(self):
+        self._running = False
+        self.wake()
+
+    # --------------------------------------------------------
+    # STATE MACHINE
+    # --------------------------------------------------------
+
+    def idle_ms(self):
+        """Virtual idle: time since real input or registered activity."""
+        since_activity = int((self.clock() - self.last_activity) * 1000)
+        return min(self.idle_source(), since_activity)
+
+    def _probe_media(self, now):
+        if self.media_probe is None:
+            return False
+        try:
+            active = bool(self.media_probe())
+        except Exception as e:
+            # A broken probe must not hold the saver back or stop the engine.
+            print(f"⚠️ Media probe failed, treating as no media: {e}")
+            active = False
+        # Media counts as activity until a probe sees it stopped, so the
+        # timeout starts from the first negative probe, never earlier.
+        if active or self.media_active:
+            self.last_activity = now
+        self.media_active = active
+        return active
+
+    def step(self):
+        """Evaluate once and return seconds until the next deadline.
+
+        ``None`` means nothing can change until an event arrives.
+        """
+        with self._lock:
+            self.wakeups += 1
+            now = self.clock()
+
+            if self.state in (SAVER_RUNNING, LOCKED):
+                return None
+
+            if self.state == DISMISSED:
+                self.last_activity = now
+                self.media_active = False
+                self._set_state(ACTIVE, "dismissed")
+
+            if self.paused_until is not None:
+                if now < self.paused_until:
+                    self._unprepare()
+                    self._set_state(ACTIVE, "paused")
+                    return None if self.paused_until == float("inf") else self.paused_until - now
+                self.paused_until = None
+                self.last_activity = now
+
+            # An inhibitor says for certain what the media probes would guess.
+            if self.inhibitors is not None and self.inhibitors.held():
+                self.inhibited = True
+                self.last_activity = now
+                self._unprepare()
+                self._set_state(ACTIVE, "inhibited")
+                expiry = self.inhibitors.next_expiry()
+                # Re-check now and then to notice owners that died.
+                return self.inhibit_poll_s if expiry is None else min(expiry, self.inhibit_poll_s)
+            if self.inhibited:
+                self.inhibited = False
+                self.last_activity = now
+
+            idle = self.idle_ms()
+            if self.media_probe is not None and (
+                    self.media_active or idle >= self.timeout_ms):
+                self._probe_media(now)
+                idle = self.idle_ms()
+
+            if idle >= self.timeout_ms:
+                if not self._activate(now, "timeout"):
+                    return self.timeout_ms / 1000
+                return None
+
+            if idle < self.pending_after_ms:
+                self._set_state(ACTIVE, "media" if self.media_active else "input")
+            else:
+                self._set_state(IDLE_PENDING, "idle")
+            delay = (self.timeout_ms - idle) / 1000
+
+            if self.prepare is not None:
+                lead = self.prepare_lead_s
+                if delay <= lead:
+                    if not self.prepared:
+                        self.prepared = True
+                        self._hook(self.prepare, "prepare")
+                else:
+                    self._unprepare()
+                    delay -= lead
+
+            # While media is playing it has to be re-probed to notice it stop.
+            if self.media_active:
+                delay = min(delay, self.media_poll_s)
+            return delay
+
+    def _hook(self, fn, name):
+        try:
+            fn()
+        except Exception as e:
+            print(f"⚠️ {name} hook failed: {e}")
+
+    def _unprepare(self):
+        if self.prepared:
+            self.prepared = False
+            if self.cancel_prepare is not None:
+                self._hook(self.cancel_prepare, "cancel_prepare")
+
+    def _activate(self, now, reason):
+        # The prepared savers (if any) are consumed by this activation.
+        self.prepared = False
+        self._set_state(SAVER_RUNNING, reason)
+        try:
+            self.activate()
+        except Exception as e:
+            print(f"⚠️ Failed to activate screensaver: {e}")
+            self.last_activity = now
+            self._set_state(ACTIVE, "activation failed")
+            return False
+        return True
+
+    def run(self):
+        """Block, stepping the engine at each deadline or early event."""
+        self._running = True
+        while self._running:
+            delay = self.step()
+            self._wake.wait(delay)
+            self._wake.clear()
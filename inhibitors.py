@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+import itertools
+import threading
+from collections import namedtuple
+
+
+# expires_at is on the registry clock (None: until released); pid is the
+# owning client process (None: not tied to a process).
+Inhibitor = namedtuple("Inhibitor", "token name reason expires_at pid")
+
+
+def pid_alive(pid):
+    """True if process ``pid`` still exists."""
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        PROCESS_QUERY_LIMITED_INFORMATION, STILL_ACTIVE = 0x1000, 259
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ------------------------------------------------------------
+# REGISTRY
+# ------------------------------------------------------------
+
+class InhibitorRegistry:
+    """Named locks that keep the saver away, in the spirit of idle-inhibit.
+
+    A client that knows it is presenting or playing media takes a lock,
+    optionally with an expiry and its pid; the engine then skips the audio
+    and fullscreen heuristics entirely.  Expired locks and locks whose
+    owning process has died are dropped by ``cleanup()``, which ``held()``
+    runs on every call.  ``on_change()`` fires after any lock is added or
+    removed so the engine can re-plan its deadline.
+    """
+
+    def __init__(self, clock=time.monotonic, on_change=None, pid_alive=pid_alive):
+        self.clock = clock
+        self.on_change = on_change
+        self.pid_alive = pid_alive
+        self._locks = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def acquire(self, name, reason="", duration_s=None, pid=None):
+        """Take a lock and return its token (for ``release``)."""
+        expires_at = None if duration_s is None else self.clock() + duration_s
+        with self._lock:
+            token = next(self._tokens)
+            self._locks[token] = Inhibitor(token, name, reason, expires_at, pid)
+        self._changed()
+        return token
+
+    def release(self, token):
+        """Drop a lock; return False if it was already gone."""
+        with self._lock:
+            removed = self._locks.pop(token, None) is not None
+        if removed:
+            self._changed()
+        return removed
+
+    def cleanup(self):
+        """Drop expired and orphaned locks; return how many were removed."""
+        now = self.clock()
+        with self._lock:
+            stale = [
+                token for token, lock in self._locks.items()
+                if (lock.expires_at is not None and lock.expires_at <= now)
+                or (lock.pid is not None and not self.pid_alive(lock.pid))
+            ]
+            for token in stale:
+                del self._locks[token]
+        if stale:
+            self._changed()
+        return len(stale)
+
+    def held(self):
+        """True while any live lock exists."""
+        if not self._locks:
+            return False
+        self.cleanup()
+        return bool(self._locks)
+
+    def active(self):
+        """Live locks, oldest first."""
+        self.cleanup()
+        with self._lock:
+            return sorted(self._locks.values())
+
+    def next_expiry(self):
+        """Seconds until the earliest expiry, or None if no lock expires."""
+        with self._lock:
+            expiries = [lock.expires_at for lock in self._locks.values()
+                        if lock.expires_at is not None]
+        return max(min(expiries) - self.clock(), 0) if expiries else None
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
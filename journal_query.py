@@ -0,0 +1,233 @@
+"""Summarise activity journals: idle durations, activations, media suppressions.
+
+    python journal_query.py PATH... [--timeouts 1,2,5,10,15,30,60] [--json]
+    python journal_query.py --merge SUMMARY.json... [--timeouts ...] [--json]
+
+Each PATH is one machine's journal directory (or a single segment).
+Segments are streamed one at a time through NumPy, so memory stays at
+one segment whatever the journal size.  ``--json`` prints a summary of a few KB; summaries from
+many machines are combined with ``--merge``, so only those need to be
+collected to tune ``timeout`` fleet-wide.
+
+An idle period runs from the last input before the engine saw the user
+idle to the input that ended it; lock, pause, inhibitors and media end a
+period without counting it.  Periods that reached the saver are exact.
+Shorter ones are only noticed at the engine's next deadline, so their
+length is an upper bound: the what-if table is reliable for timeouts at
+or above the one the journal was recorded with.
+"""
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from activity_journal import EVENTS, REASONS, EVENT_CODES, REASON_CODES, read_segment, segments
+
+
+RECORDS = np.dtype([("t", "<f8"), ("idle_ms", "<u4"), ("event", "u1"), ("reason", "u1"), ("pad", "V2")])
+
+ACTIVE, IDLE_PENDING, SAVER_RUNNING, DISMISSED, LOCKED = (EVENT_CODES[name] for name in EVENTS)
+MEDIA = [REASON_CODES[name] for name in ("audio", "fullscreen", "media")]
+ENDS_UNCOUNTED = [REASON_CODES[name] for name in ("paused", "inhibited")] + MEDIA
+
+# Idle durations are kept per whole second up to this, then one overflow bin.
+MAX_IDLE_S = 4 * 3600
+START, END, CANCEL = 1, 2, 3
+QUICK_DISMISS_S = 10
+
+
+# ------------------------------------------------------------
+# STREAMING SUMMARY
+# ------------------------------------------------------------
+
+class JournalSummary:
+    """Counters and histograms fed one segment (record array) at a time."""
+
+    def __init__(self):
+        self.records = 0
+        self.first = None
+        self.last = None
+        self.transitions = {}
+        self.idle = np.zeros(MAX_IDLE_S + 1, dtype=np.int64)
+        self.suppressed = {}
+        self.suppressed_s = {}
+        self.merged_s = 0.0
+        # Carried across segments.
+        self._marker = None
+        self._start = None
+        self._pending = None
+
+    def feed(self, records):
+        if not len(records):
+            return
+        self.records += len(records)
+        t, event, reason = records["t"], records["event"].astype(np.int64), records["reason"]
+        self.first = float(t[0]) if self.first is None else self.first
+        self.last = float(t[-1])
+
+        keys, counts = np.unique(event * 256 + reason, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            name = f"{EVENTS[key // 256]}/{REASONS[key % 256]}"
+            self.transitions[name] = self.transitions.get(name, 0) + count
+
+        self._idle_periods(t - records["idle_ms"] / 1000.0, event, reason)
+        self._suppressions(t, event, reason)
+
+    def _idle_periods(self, last_input, event, reason):
+        kind = np.zeros(len(event), dtype=np.int8)
+        kind[(event == IDLE_PENDING) | (event == SAVER_RUNNING)] = START
+        kind[((event == ACTIVE) & (reason == REASON_CODES["input"])) | (event == DISMISSED)] = END
+        kind[(event == LOCKED) | ((event == ACTIVE) & np.isin(reason, ENDS_UNCOUNTED))] = CANCEL
+        marked = np.flatnonzero(kind)
+        kinds, points = kind[marked], last_input[marked]
+        if self._marker is not None:
+            kinds = np.concatenate(([self._marker], kinds))
+            points = np.concatenate(([self._start if self._start is not None else 0.0], points))
+        if not len(kinds):
+            return
+
+        previous = np.concatenate(([0], kinds[:-1]))
+        # The first START of a run opens the period; an END right after a
+        # START closes it.
+        opens = (kinds == START) & (previous != START)
+        closes = (kinds == END) & (previous == START)
+        opener = np.maximum.accumulate(np.where(opens, np.arange(len(kinds)), -1))
+        ends = np.flatnonzero(closes)
+        durations = points[ends] - points[opener[ends]]
+        seconds = np.clip(durations, 0, MAX_IDLE_S).astype(np.int64)
+        self.idle += np.bincount(seconds, minlength=MAX_IDLE_S + 1)
+
+        self._marker = int(kinds[-1])
+        self._start = float(points[opener[-1]]) if self._marker == START else None
+
+    def _suppressions(self, t, event, reason):
+        # Media keeps the engine ACTIVE until the next transition.
+        media = (event == ACTIVE) & np.isin(reason, MEDIA)
+        if self._pending is not None:
+            started, name = self._pending
+            self.suppressed_s[name] = self.suppressed_s.get(name, 0.0) + float(t[0]) - started
+            self._pending = None
+        rows = np.flatnonzero(media)
+        for row in rows.tolist():
+            name = REASONS[reason[row]]
+            self.suppressed[name] = self.suppressed.get(name, 0) + 1
+            if row + 1 < len(t):
+                self.suppressed_s[name] = self.suppressed_s.get(name, 0.0) + float(t[row + 1] - t[row])
+            else:
+                self._pending = (float(t[row]), name)
+
+    # --------------------------------------------------------
+
+    def activations(self):
+        return {name.split("/")[1]: count for name, count in self.transitions.items()
+                if name.startswith("SAVER_RUNNING/")}
+
+    def what_if(self, timeout_s):
+        """(idle periods reaching ``timeout_s``, of those ended within QUICK_DISMISS_S)."""
+        t = min(int(timeout_s), MAX_IDLE_S)
+        reached = int(self.idle[t:].sum())
+        quick = int(self.idle[t:min(t + QUICK_DISMISS_S, MAX_IDLE_S)].sum())
+        return reached, quick
+
+    def span_s(self):
+        """Journal seconds covered: this journal's span plus every merged one."""
+        own = self.last - self.first if self.first is not None else 0.0
+        return own + self.merged_s
+
+    def days(self):
+        return max(self.span_s(), 1.0) / 86400
+
+    def to_dict(self):
+        return {
+            "records": self.records,
+            "span_s": self.span_s(),
+            "transitions": self.transitions,
+            "idle_seconds": {str(s): int(n) for s, n in enumerate(self.idle.tolist()) if n},
+            "suppressed": self.suppressed,
+            "suppressed_s": self.suppressed_s,
+        }
+
+    def merge(self, data):
+        """Add a ``to_dict()`` summary (e.g. from another machine)."""
+        self.records += data["records"]
+        # Machines run side by side, so their spans add up (machine-days).
+        self.merged_s += data["span_s"]
+        for field in ("transitions", "suppressed", "suppressed_s"):
+            target = getattr(self, field)
+            for name, value in data[field].items():
+                target[name] = target.get(name, 0) + value
+        for second, count in data["idle_seconds"].items():
+            self.idle[int(second)] += count
+
+
+def summarize(path):
+    """Summary of one journal (directory of segments, or one segment)."""
+    summary = JournalSummary()
+    for segment in (segments(path) if os.path.isdir(path) else [path]):
+        try:
+            summary.feed(np.frombuffer(read_segment(segment), dtype=RECORDS))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping {segment}: {e}", file=sys.stderr)
+    return summary
+
+
+# ------------------------------------------------------------
+# REPORT
+# ------------------------------------------------------------
+
+BUCKETS_S = (0, 10, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, MAX_IDLE_S)
+
+
+def report(summary, timeouts_min):
+    days = summary.days()
+    print(f"{summary.records} records over {days:.1f} machine-day(s)")
+    periods = int(summary.idle.sum())
+    print(f"idle periods: {periods}")
+    for low, high in zip(BUCKETS_S, BUCKETS_S[1:] + (None,)):
+        count = int(summary.idle[low:high].sum()) if high else int(summary.idle[low:].sum())
+        label = f"{low}s+" if high is None else f"{low:>5d}-{high:<5d}s"
+        bar = "#" * (50 * count // periods if periods else 0)
+        print(f"  {label:14s} {count:8d}  {bar}")
+
+    activations = summary.activations()
+    print("activations: " + (", ".join(f"{n} {name}" for name, n in sorted(activations.items())) or "none"))
+    for name in sorted(summary.suppressed):
+        print(f"suppressed by {name}: {summary.suppressed[name]} time(s), "
+              f"{summary.suppressed_s.get(name, 0.0) / 3600:.1f} h held off")
+
+    print(f"what-if timeout (per machine-day; quick = user back within {QUICK_DISMISS_S}s):")
+    for minutes in timeouts_min:
+        reached, quick = summary.what_if(minutes * 60)
+        print(f"  {minutes:5g} min  activations={reached / days:8.1f}  quick dismissals={quick / days:7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="journal directories or segments (or summaries with --merge)")
+    parser.add_argument("--merge", action="store_true", help="combine --json summaries instead")
+    parser.add_argument("--timeouts", default="1,2,5,10,15,30,60",
+                        help="candidate timeouts in minutes for the what-if table")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    # Each path is one machine's journal: summarised on its own, then merged.
+    summary = JournalSummary()
+    for path in args.paths:
+        if args.merge:
+            with open(path) as f:
+                summary.merge(json.load(f))
+        else:
+            summary.merge(summarize(path).to_dict())
+
+    if args.json:
+        json.dump(summary.to_dict(), sys.stdout)
+        print()
+    else:
+        report(summary, [float(m) for m in args.timeouts.split(",")])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
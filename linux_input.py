@@ -0,0 +1,359 @@
+import os
+import glob
+import time
+import errno
+import select
+import struct
+import threading
+
+from activity import ActivityAggregator
+
+
+# ------------------------------------------------------------
+# EVDEV EVENT FORMAT
+# ------------------------------------------------------------
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+EVENT = struct.Struct("llHHi")
+
+EV_SYN, EV_KEY, EV_REL, EV_ABS = 0x00, 0x01, 0x02, 0x03
+# Keys/buttons, mouse motion and wheels, touch and tablets; not LEDs,
+# sounds, switches (lid) or SYN/MSC bookkeeping.
+ACTIVITY_TYPES = frozenset((EV_KEY, EV_REL, EV_ABS))
+
+INPUT_PROP_ACCELEROMETER = 0x06
+
+
+def pack_event(type, code, value, timestamp=0.0):
+    """One raw input_event, as read from /dev/input/event*."""
+    sec = int(timestamp)
+    return EVENT.pack(sec, int((timestamp - sec) * 1e6), type, code, value)
+
+
+def unpack_events(data):
+    """Yield ``(timestamp, type, code, value)`` for every whole event in ``data``."""
+    for sec, usec, type, code, value in EVENT.iter_unpack(data[:len(data) - len(data) % EVENT.size]):
+        yield sec + usec / 1e6, type, code, value
+
+
+def has_activity(data):
+    return any(type in ACTIVITY_TYPES for _, type, _, _ in unpack_events(data))
+
+
+def _eviocgprop(length):
+    # _IOC(_IOC_READ, 'E', 0x09, length)
+    return (2 << 30) | (length << 16) | (ord("E") << 8) | 0x09
+
+
+def is_accelerometer(fd):
+    """True for orientation sensors, whose EV_ABS stream is not user input."""
+    import fcntl
+
+    try:
+        props = fcntl.ioctl(fd, _eviocgprop(4), bytes(4))
+    except OSError:
+        return False
+    return bool(props[INPUT_PROP_ACCELEROMETER // 8] & (1 << INPUT_PROP_ACCELEROMETER % 8))
+
+
+# ------------------------------------------------------------
+# EVDEV + EPOLL SOURCE
+# ------------------------------------------------------------
+
+class EvdevIdleSource:
+    """Idle time from /dev/input/event* devices, with no polling.
+
+    A background thread blocks in epoll on every readable input device
+    (and, for hot-plugged keyboards and mice, an inotify watch on the
+    input directory), so it only runs when the kernel has input for it.
+    Each read is ``touch()``-ed into an ActivityAggregator; calling the
+    source returns milliseconds since the last input, and ``watch()``
+    registers for idle -> active edges.
+
+    During a burst of input the thread sleeps ``coalesce_s`` after each
+    read and then drains whatever queued up, instead of waking for every
+    packet; the first event after idle is still seen at once.  ``paths``
+    may name any event stream, e.g. a FIFO a recorded trace is replayed
+    into (see ``replay``).
+    """
+
+    def __init__(self, paths=None, input_dir="/dev/input", coalesce_s=0.5,
+                 clock=time.monotonic):
+        self.input_dir = input_dir
+        self.hotplug = paths is None
+        self.paths = sorted(glob.glob(os.path.join(input_dir, "event*"))) if paths is None else list(paths)
+        self.coalesce_s = coalesce_s
+        self.activity = ActivityAggregator(on_activity=self._edge, clock=clock)
+        self.wakeups = 0
+
+        self._callbacks = []
+        self._devices = {}
+        self._epoll = None
+        self._inotify = None
+        self._stop_r = self._stop_w = None
+        self._thread = None
+
+    # --------------------------------------------------------
+
+    def start(self):
+        """Open the devices and start the reader; OSError if none can be read."""
+        self._epoll = select.epoll()
+        for path in self.paths:
+            self._open(path)
+        if not self._devices:
+            self._epoll.close()
+            raise OSError(errno.EACCES, f"no readable input devices in {self.input_dir}")
+        if self.hotplug:
+            self._watch_dir()
+        self._stop_r, self._stop_w = os.pipe()
+        self._epoll.register(self._stop_r, select.EPOLLIN)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        os.write(self._stop_w, b"x")
+        self._thread.join()
+        self._thread = None
+
+    def watch(self, callback):
+        """Call ``callback(source)`` from the reader thread on each idle -> active edge."""
+        self._callbacks.append(callback)
+
+    def devices(self):
+        return sorted(self._devices.values())
+
+    def __call__(self):
+        return int(self.activity.idle_s() * 1000)
+
+    # --------------------------------------------------------
+
+    def _edge(self, source):
+        for callback in self._callbacks:
+            try:
+                callback(source)
+            except Exception as e:
+                print(f"⚠️ Input edge handler failed: {e}")
+
+    def _open(self, path):
+        if path in self._devices.values():
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+        except OSError:
+            return
+        if is_accelerometer(fd):
+            os.close(fd)
+            return
+        self._devices[fd] = path
+        self._epoll.register(fd, select.EPOLLIN)
+
+    def _close(self, fd):
+        self._epoll.unregister(fd)
+        os.close(fd)
+        del self._devices[fd]
+
+    def _watch_dir(self):
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        IN_ATTRIB, IN_CREATE = 0x4, 0x100
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            print("⚠️ inotify unavailable; new input devices need a restart")
+            return
+        # udev creates the node first and fixes its permissions after.
+        if libc.inotify_add_watch(fd, self.input_dir.encode(), IN_CREATE | IN_ATTRIB) < 0:
+            os.close(fd)
+            return
+        self._inotify = fd
+        self._epoll.register(fd, select.EPOLLIN)
+
+    def _hotplug(self):
+        header = struct.Struct("iIII")
+        try:
+            data = os.read(self._inotify, 4096)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = header.unpack_from(data, offset)
+            start = offset + header.size
+            name = data[start:start + length].rstrip(b"\0").decode(errors="replace")
+            offset = start + length
+            if name.startswith("event"):
+                self._open(os.path.join(self.input_dir, name))
+
+    def _read(self, fd):
+        """Drain one device; return True if it held user input."""
+        active = False
+        while True:
+            try:
+                data = os.read(fd, EVENT.size * 64)
+            except BlockingIOError:
+                return active
+            except OSError:
+                # ENODEV: unplugged.
+                self._close(fd)
+                return active
+            if not data:
+                # EOF: the writer of a replayed stream went away.
+                self._close(fd)
+                return active
+            active = active or has_activity(data)
+
+    def _run(self):
+        try:
+            while True:
+                events = self._epoll.poll()
+                if any(fd == self._stop_r for fd, _ in events):
+                    return
+                self.wakeups += 1
+                active = None
+                for fd, _ in events:
+                    if fd == self._inotify:
+                        self._hotplug()
+                    elif fd in self._devices:
+                        name = os.path.basename(self._devices[fd])
+                        if self._read(fd):
+                            active = name
+                if active is not None:
+                    self.activity.touch(active)
+                    if self.coalesce_s:
+                        time.sleep(self.coalesce_s)
+        finally:
+            for fd in list(self._devices):
+                self._close(fd)
+            for fd in (self._inotify, self._stop_r, self._stop_w):
+                if fd is not None:
+                    os.close(fd)
+            self._epoll.close()
+
+
+# ------------------------------------------------------------
+# /proc/interrupts FALLBACK
+# ------------------------------------------------------------
+
+class InterruptsIdleSource:
+    """Idle time from input IRQ counters, for when no event device is readable.
+
+    /proc/interrupts is world-readable, so this works without the
+    ``input`` group.  Interrupt counters carry no event data and there is
+    nothing to block on, so a thread samples the lines whose handler names
+    match ``names`` every ``poll_s`` seconds and counts any increase as
+    input; idle time is accurate to ``poll_s``.  USB host controller
+    interrupts also fire for storage and webcams, so on busy USB buses
+    narrow ``names`` to the HID controllers.
+    """
+
+    NAMES = ("i8042", "hid", "xhci", "ehci", "ohci", "uhci")
+
+    def __init__(self, poll_s=2.0, names=NAMES, path="/proc/interrupts",
+                 clock=time.monotonic):
+        self.poll_s = poll_s
+        self.names = tuple(names)
+        self.path = path
+        # Busy samples are poll_s apart, so only a longer gap is a new burst.
+        self.activity = ActivityAggregator(on_activity=self._edge, edge_gap_s=poll_s * 1.5,
+                                           clock=clock)
+        self.wakeups = 0
+
+        self._callbacks = []
+        self._last = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """Total count over the matching interrupt lines."""
+        total, found = 0, False
+        with open(self.path) as f:
+            f.readline()
+            for line in f:
+                _, _, rest = line.partition(":")
+                handlers = rest.lower()
+                if not any(name in handlers for name in self.names):
+                    continue
+                for field in rest.split():
+                    if not field.isdigit():
+                        break
+                    total += int(field)
+                found = True
+        return total if found else None
+
+    def check(self):
+        """Sample once; return True if input interrupts arrived since the last sample."""
+        total = self.sample()
+        changed = self._last is not None and total != self._last
+        self._last = total
+        if changed:
+            self.activity.touch("irq")
+        return changed
+
+    def start(self):
+        """Start sampling; RuntimeError if no interrupt line matches ``names``."""
+        if self.sample() is None:
+            raise RuntimeError(f"no input interrupts ({', '.join(self.names)}) in {self.path}")
+        self.check()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+
+    def __call__(self):
+        return int(self.activity.idle_s() * 1000)
+
+    def _edge(self, source):
+        for callback in self._callbacks:
+            try:
+                callback(source)
+            except Exception as e:
+                print(f"⚠️ Input edge handler failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_s):
+            self.wakeups += 1
+            try:
+                self.check()
+            except OSError as e:
+                print(f"⚠️ Reading {self.path} failed: {e}")
+
+
+# ------------------------------------------------------------
+# BACKEND CHOICE / REPLAY
+# ------------------------------------------------------------
+
+def make_linux_idle_source():
+    """evdev when the input devices are readable, else interrupt counters."""
+    try:
+        return EvdevIdleSource().start()
+    except OSError as e:
+        print(f"⚠️ Input devices unavailable ({e}); using /proc/interrupts")
+    return InterruptsIdleSource().start()
+
+
+def replay(recording, fd, speed=1.0, sleep=time.sleep):
+    """Write a recorded event stream to ``fd``, keeping its timing.
+
+    ``recording`` is raw input_event data, e.g. captured with
+    ``cat /dev/input/eventN > trace.bin``.  Packets (runs of events up to
+    an EV_SYN) are written whole, ``speed`` times faster than recorded.
+    """
+    packet, previous = [], None
+    for timestamp, type, code, value in unpack_events(recording):
+        packet.append(pack_event(type, code, value, timestamp))
+        if type != EV_SYN:
+            continue
+        if previous is not None and speed:
+            sleep(max(timestamp - previous, 0) / speed)
+        previous = timestamp
+        os.write(fd, b"".join(packet))
+        packet = []
+    if packet:
+        os.write(fd, b"".join(packet))
@@ -1,15 +1,19 @@
-import time
-import win32gui
-import subprocess
+import threading
+
+from platform_backends import PlatformBackends
+from session_events import LOCK
 
 def wait_for_unlock():
-    """Continuously monitor login status and restart the screensaver after unlocking."""
-    while True:
-        time.sleep(2)  # Short pause before checking again
-        hwnd = win32gui.GetForegroundWindow()
-        if hwnd == win32gui.GetDesktopWindow():
-            subprocess.Popen(["python", "screensaver.py"])  # Restart screensaver
-            time.sleep(10)  # Give time for reset before looping again
+    """Print session lock/unlock events as the running daemon receives them.
+
+    The screensaver daemon (screen_saver_scr.py) handles unlocks itself and
+    resets its idle state in place, so nothing is restarted here.
+    """
+    def on_event(event):
+        print("🔒 Session locked" if event == LOCK else "🔓 Session unlocked")
+
+    PlatformBackends().session.watch(on_event)
+    threading.Event().wait()
 
 if __name__ == "__main__":
-    wait_for_unlock()
\ No newline at end of file
+    wait_for_unlock()
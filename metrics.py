@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import bisect
+import threading
+
+
+# ------------------------------------------------------------
+# METRIC TYPES
+# ------------------------------------------------------------
+
+class _Metric:
+    """Base for metrics; ``fn`` makes a value read at collection time.
+
+    With a ``label``, ``fn`` returns a dict of label value -> value.
+    """
+
+    kind = None
+
+    def __init__(self, name, help, label=None, fn=None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.fn = fn
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, value):
+        """Child metric for one value of this metric's label."""
+        child = self._children.get(value)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(value, self._new_child())
+        return child
+
+    def _series(self):
+        if self.fn is not None:
+            # Labelled metrics read a {label value: value} dict from fn.
+            values = self.fn() if self.label else {None: self.fn()}
+            for label_value, v in sorted(values.items(), key=lambda kv: str(kv[0])):
+                value = _Value()
+                value.value = v
+                yield (f'{self.label}="{label_value}"' if self.label else ""), value
+        elif self.label is None:
+            yield "", self._children.setdefault(None, self._new_child())
+        else:
+            for value, child in sorted(self._children.items()):
+                yield f'{self.label}="{value}"', child
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1, label=None):
+        self.labels(label).value += amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value, label=None):
+        self.labels(label).value = value
+
+
+class _HistogramValue:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help, label=None, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, label)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return _HistogramValue(len(self.buckets) + 1)
+
+    def observe(self, value, label=None):
+        child = self.labels(label)
+        child.counts[bisect.bisect_left(self.buckets, value)] += 1
+        child.sum += value
+        child.count += 1
+
+    def time(self, fn, label=None):
+        """Wrap ``fn`` so every call is observed in seconds."""
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.observe(clock() - start, label)
+        return timed
+
+
+# ------------------------------------------------------------
+# REGISTRY / EXPOSITION
+# ------------------------------------------------------------
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, label=None, fn=None):
+        return self._add(Counter(name, help, label, fn))
+
+    def gauge(self, name, help, label=None, fn=None):
+        return self._add(Gauge(name, help, label, fn))
+
+    def histogram(self, name, help, label=None, buckets=Histogram.DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, label, buckets))
+
+    def prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            for labels, v in m._series():
+                if m.kind != "histogram":
+                    lines.append(f"{m.name}{{{labels}}} {v.value}" if labels
+                                 else f"{m.name} {v.value}")
+                    continue
+                sep = labels + "," if labels else ""
+                cumulative = 0
+                for bound, count in zip(m.buckets + (float("inf"),), v.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{m.name}_bucket{{{sep}le="{le}"}} {cumulative}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{m.name}_sum{suffix} {v.sum}")
+                lines.append(f"{m.name}_count{suffix} {v.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Plain-dict view of every metric, for JSON."""
+        out = {}
+        for m in self.metrics:
+            series = {}
+            for labels, v in m._series():
+                if m.kind == "histogram":
+                    series[labels] = {"count": v.count, "sum": v.sum,
+                                      "buckets": dict(zip(map(str, m.buckets + (float("inf"),)), v.counts))}
+                else:
+                    series[labels] = v.value
+            out[m.name] = series if m.label else series.get("", 0)
+        return out
+
+
+def serve_http(registry, port, host="127.0.0.1"):
+    """Serve ``/metrics`` on a local port from a daemon thread; return the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class JsonFlusher:
+    """Write ``registry.snapshot()`` to ``path`` every ``interval_s`` seconds."""
+
+    def __init__(self, registry, path, interval_s=60.0):
+        self.registry = registry
+        self.path = path
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+
+    def flush(self):
+        data = {"time": time.time(), "metrics": self.registry.snapshot()}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp, self.path)
+
+    def run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Failed to write metrics: {e}")
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,190 @@
+import threading
+from collections import namedtuple
+
+
+# ------------------------------------------------------------
+# TOPOLOGY SNAPSHOT
+# ------------------------------------------------------------
+
+# rect / work are (left, top, right, bottom); dpi is the effective DPI.
+Monitor = namedtuple("Monitor", "rect work dpi primary")
+
+
+# ------------------------------------------------------------
+# WIN32 BACKEND
+# ------------------------------------------------------------
+
+class Win32MonitorBackend:
+    """Enumerate monitors with EnumDisplayMonitors and watch for changes.
+
+    Changes are reported by a hidden top-level window that receives
+    WM_DISPLAYCHANGE, WM_DPICHANGED and work-area WM_SETTINGCHANGE.
+    Message-only windows do not get those broadcasts, so the window is a
+    normal one that is simply never shown.
+    """
+
+    WM_DISPLAYCHANGE = 0x007E
+    WM_SETTINGCHANGE = 0x001A
+    WM_DPICHANGED = 0x02E0
+    SPI_SETWORKAREA = 0x002F
+    MONITORINFOF_PRIMARY = 1
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        from win32_api import MONITORINFO, MONITORENUMPROC, user32, shcore
+
+        self._user32 = user32
+        self._shcore = shcore
+
+        self._info = MONITORINFO()
+        self._info.cbSize = ctypes.sizeof(MONITORINFO)
+        self._info_ref = ctypes.byref(self._info)
+        self._dpi_x, self._dpi_y = wintypes.UINT(), wintypes.UINT()
+        self._dpi_refs = (ctypes.byref(self._dpi_x), ctypes.byref(self._dpi_y))
+        self._handles = []
+        self._enum_proc = MONITORENUMPROC(self._collect)
+
+    def _collect(self, hmonitor, hdc, lprect, lparam):
+        self._handles.append(hmonitor)
+        return True
+
+    def _dpi(self, hmonitor):
+        if self._shcore is None:
+            return 96
+        # MDT_EFFECTIVE_DPI = 0
+        if self._shcore.GetDpiForMonitor(hmonitor, 0, *self._dpi_refs) != 0:
+            return 96
+        return self._dpi_x.value
+
+    def enumerate(self):
+        self._handles = []
+        self._user32.EnumDisplayMonitors(None, None, self._enum_proc, 0)
+
+        monitors = []
+        info = self._info
+        for hmonitor in self._handles:
+            if not self._user32.GetMonitorInfoW(hmonitor, self._info_ref):
+                continue
+            r, w = info.rcMonitor, info.rcWork
+            monitors.append(Monitor(
+                (r.left, r.top, r.right, r.bottom),
+                (w.left, w.top, w.right, w.bottom),
+                self._dpi(hmonitor),
+                bool(info.dwFlags & self.MONITORINFOF_PRIMARY),
+            ))
+        return monitors
+
+    def watch(self, callback):
+        """Call ``callback()`` from a background thread on display changes."""
+        threading.Thread(target=self._message_loop, args=(callback,), daemon=True).start()
+
+    def _message_loop(self, callback):
+        from win32_api import MessageWindow
+
+        def on_message(msg, wparam, lparam):
+            if (msg in (self.WM_DISPLAYCHANGE, self.WM_DPICHANGED) or
+                    (msg == self.WM_SETTINGCHANGE and wparam == self.SPI_SETWORKAREA)):
+                callback()
+
+        self._window = MessageWindow("ScreensaverDisplayWatcher", on_message)
+        try:
+            self._window.create()
+        except OSError as e:
+            print(f"⚠️ Display change window unavailable ({e}); monitor changes will not be noticed")
+            return
+        self._window.pump()
+
+
+# ------------------------------------------------------------
+# OTHER PLATFORMS
+# ------------------------------------------------------------
+
+class NullMonitorBackend:
+    """An empty topology where displays cannot be enumerated.
+
+    Nothing then counts as fullscreen and there is nothing to place saver
+    windows on; the idle engine itself still works.
+    """
+
+    def enumerate(self):
+        return []
+
+    def watch(self, callback):
+        pass
+
+
+# ------------------------------------------------------------
+# FAKE BACKEND (TESTS / BENCHMARKS)
+# ------------------------------------------------------------
+
+class FakeMonitorBackend:
+    """In-memory monitor list; ``set_monitors`` simulates a display change."""
+
+    def __init__(self, monitors):
+        self.monitors = [self._coerce(m) for m in monitors]
+        self.enumerate_calls = 0
+        self._callbacks = []
+
+    @staticmethod
+    def _coerce(m):
+        if isinstance(m, Monitor):
+            return m
+        return Monitor(tuple(m), tuple(m), 96, False)
+
+    def enumerate(self):
+        self.enumerate_calls += 1
+        return list(self.monitors)
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+
+    def set_monitors(self, monitors):
+        self.monitors = [self._coerce(m) for m in monitors]
+        for callback in self._callbacks:
+            callback()
+
+
+# ------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------
+
+class MonitorTopologyCache:
+    """Immutable monitor snapshot, re-enumerated only after a display change."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._snapshot = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        backend.watch(self.invalidate)
+
+    def invalidate(self):
+        # Bumping the generation also discards an enumeration in flight.
+        self._generation += 1
+        self._snapshot = None
+
+    def get(self):
+        """Return the current topology as a tuple of ``Monitor``."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
+            generation = self._generation
+            snapshot = tuple(self.backend.enumerate())
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    def rects(self):
+        """Monitor rectangles as (left, top, right, bottom) tuples."""
+        return [m.rect for m in self.get()]
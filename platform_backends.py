@@ -0,0 +1,127 @@
+import sys
+import threading
+
+
+# ------------------------------------------------------------
+# WINDOWS REAL IDLE TIME
+# ------------------------------------------------------------
+
+def make_win32_idle_source():
+    """Return a callable giving system idle time in ms via GetLastInputInfo.
+
+    One LASTINPUTINFO (and ``byref`` to it) serves every call.
+    """
+    import ctypes
+    from win32_api import LASTINPUTINFO, user32, kernel32
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+    ref = ctypes.byref(info)
+    get_last_input, get_tick_count = user32.GetLastInputInfo, kernel32.GetTickCount
+
+    def win32_idle_ms():
+        get_last_input(ref)
+        # Both are 32-bit tick counts that wrap every 49.7 days.
+        return (get_tick_count() - info.dwTime) & 0xFFFFFFFF
+
+    return win32_idle_ms
+
+
+# ------------------------------------------------------------
+# LAZY BACKEND SET
+# ------------------------------------------------------------
+
+class PlatformBackends:
+    """Platform integrations, each imported and built on first use.
+
+    ``idle``       callable returning ms since the last input; may also
+                   offer ``watch(callback)`` for idle -> active edges
+    ``audio``      started AudioSampler
+    ``monitors``   MonitorTopologyCache
+    ``fullscreen`` FullscreenDetector
+    ``window_map`` pid -> windows lookup and window placement
+    ``launcher``   SaverLauncher
+    ``session``    session lock/unlock event source
+
+    Nothing heavy (pycaw/comtypes, NumPy, window hooks) is imported until
+    the matching attribute is first read.  Off Windows, audio, monitors and
+    fullscreen fall back to null backends that never report media.  ``install`` swaps in fakes or
+    other platforms' implementations.
+    """
+
+    NAMES = ("idle", "audio", "monitors", "fullscreen", "window_map", "launcher", "session")
+
+    def __init__(self, **instances):
+        self._lock = threading.RLock()
+        self.install(**instances)
+
+    def install(self, **instances):
+        for name, instance in instances.items():
+            if name not in self.NAMES:
+                raise TypeError(f"unknown backend {name!r}")
+            if instance is not None:
+                setattr(self, name, instance)
+
+    def loaded(self):
+        """Names of backends that have been constructed so far."""
+        return sorted(name for name in self.NAMES if name in self.__dict__)
+
+    def __getattr__(self, name):
+        # Only reached until the backend exists; afterwards it is a plain
+        # instance attribute and costs nothing extra on the hot path.
+        if name not in PlatformBackends.NAMES:
+            raise AttributeError(name)
+        with self._lock:
+            instance = self.__dict__.get(name)
+            if instance is None:
+                instance = getattr(self, "_make_" + name)()
+                setattr(self, name, instance)
+        return instance
+
+    # --------------------------------------------------------
+
+    def _make_idle(self):
+        if sys.platform == "win32":
+            return make_win32_idle_source()
+        if sys.platform.startswith("linux"):
+            from linux_input import make_linux_idle_source
+            return make_linux_idle_source()
+        raise RuntimeError(f"no idle backend for {sys.platform}")
+
+    def _make_audio(self):
+        from audio_sampler import AudioSampler, NullAudioBackend
+        if sys.platform == "win32":
+            try:
+                from audio_sampler import PycawAudioBackend
+                return AudioSampler(PycawAudioBackend()).start()
+            except ImportError as e:
+                print(f"⚠️ Audio detection unavailable ({e}); treating audio as silent")
+        return AudioSampler(NullAudioBackend()).start()
+
+    def _make_monitors(self):
+        if sys.platform == "win32":
+            from monitor_cache import MonitorTopologyCache, Win32MonitorBackend
+            return MonitorTopologyCache(Win32MonitorBackend())
+        from monitor_cache import MonitorTopologyCache, NullMonitorBackend
+        return MonitorTopologyCache(NullMonitorBackend())
+
+    def _make_fullscreen(self):
+        if sys.platform == "win32":
+            from fullscreen_detector import FullscreenDetector, Win32WindowSource
+            return FullscreenDetector(Win32WindowSource(), self.monitors.rects)
+        from fullscreen_detector import FullscreenDetector, NullWindowSource
+        return FullscreenDetector(NullWindowSource(), self.monitors.rects)
+
+    def _make_window_map(self):
+        from saver_launcher import Win32WindowMap
+        return Win32WindowMap()
+
+    def _make_launcher(self):
+        from saver_launcher import SaverLauncher, PopenLauncher
+        return SaverLauncher(PopenLauncher(), self.window_map)
+
+    def _make_session(self):
+        if sys.platform == "win32":
+            from session_events import Win32SessionSource
+            return Win32SessionSource()
+        raise RuntimeError(f"no session event backend for {sys.platform}")
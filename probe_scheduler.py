@@ -0,0 +1,119 @@
+import time
+
+
+# ------------------------------------------------------------
+# PROBE
+# ------------------------------------------------------------
+
+class Probe:
+    """One activity heuristic and what it costs to ask it.
+
+    ``cost_s`` is the declared cost per call; it is replaced by a moving
+    average of measured calls once the probe has run.  ``min_interval_s``
+    is how long a negative answer stays good, ``hit_interval_s`` how long a
+    positive one does (media rarely stops within seconds).  ``lead_s``
+    lets a probe start running that long before the idle timeout.
+    """
+
+    def __init__(self, name, fn, cost_s, min_interval_s=0.0, hit_interval_s=None, lead_s=0.0):
+        self.name = name
+        self.fn = fn
+        self.cost_s = cost_s
+        self.min_interval_s = min_interval_s
+        self.hit_interval_s = min_interval_s if hit_interval_s is None else hit_interval_s
+        self.lead_s = lead_s
+        self.enabled = True
+
+        self.runs = 0
+        self.skips = {"not_idle": 0, "interval": 0, "short_circuit": 0}
+        self.last_run = None
+        self.last_result = False
+
+
+# ------------------------------------------------------------
+# SCHEDULER
+# ------------------------------------------------------------
+
+class ProbeScheduler:
+    """Answer "is media keeping the user busy?" as cheaply as possible.
+
+    ``check()`` first reads real input idle time (the cheapest probe of
+    all).  A probe is only asked once idle time is within its ``lead_s`` of
+    the timeout, at most once per interval, and cheapest first; the first
+    positive answer short-circuits the rest.  ``last_hit`` names the probe
+    behind the last positive answer.
+    """
+
+    def __init__(self, idle_source, timeout_ms, clock=time.monotonic, timer=time.perf_counter):
+        self.idle_source = idle_source
+        self.timeout_ms = timeout_ms
+        self.clock = clock
+        self.timer = timer
+        self.probes = []
+        self.checks = 0
+        self.last_hit = None
+
+    def add(self, name, fn, cost_s, min_interval_s=0.0, hit_interval_s=None, lead_s=0.0):
+        probe = Probe(name, fn, cost_s, min_interval_s, hit_interval_s, lead_s)
+        self.probes.append(probe)
+        return probe
+
+    def enable(self, name, enabled=True):
+        """Switch a probe on or off (e.g. from config) without losing its counters."""
+        for probe in self.probes:
+            if probe.name == name:
+                probe.enabled = enabled
+
+    def _run(self, probe, now):
+        start = self.timer()
+        result = bool(probe.fn())
+        elapsed = self.timer() - start
+        probe.runs += 1
+        probe.cost_s = 0.8 * probe.cost_s + 0.2 * elapsed
+        probe.last_run = now
+        probe.last_result = result
+        return result
+
+    def check(self):
+        """True if any probe reports activity."""
+        self.checks += 1
+        now = self.clock()
+        remaining_ms = self.timeout_ms - self.idle_source()
+        ordered = sorted((p for p in self.probes if p.enabled), key=lambda p: p.cost_s)
+
+        for i, probe in enumerate(ordered):
+            if remaining_ms > probe.lead_s * 1000:
+                # Recent input already proves activity; nothing to ask.
+                probe.skips["not_idle"] += 1
+                continue
+
+            interval = probe.hit_interval_s if probe.last_result else probe.min_interval_s
+            if probe.last_run is not None and now - probe.last_run < interval:
+                probe.skips["interval"] += 1
+                result = probe.last_result
+            else:
+                result = self._run(probe, now)
+
+            if result:
+                for rest in ordered[i + 1:]:
+                    rest.skips["short_circuit"] += 1
+                self.last_hit = probe.name
+                return True
+        self.last_hit = None
+        return False
+
+    __call__ = check
+
+    # --------------------------------------------------------
+
+    def runs(self):
+        return {p.name: p.runs for p in self.probes}
+
+    def skips(self):
+        return {p.name: sum(p.skips.values()) for p in self.probes}
+
+    def stats(self):
+        return {
+            p.name: {"runs": p.runs, "skips": dict(p.skips), "cost_s": p.cost_s}
+            for p in self.probes
+        }
@@ -0,0 +1,188 @@
+import os
+import sys
+import signal
+import subprocess
+
+
+# ------------------------------------------------------------
+# POSIX: PROCESS GROUPS
+# ------------------------------------------------------------
+
+def group_members(pgid):
+    """Pids of live (non-zombie) processes in process group ``pgid``."""
+    if not os.path.isdir("/proc/self"):
+        try:
+            os.killpg(pgid, 0)
+        except (ProcessLookupError, PermissionError):
+            return []
+        return [pgid]
+    pids = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command: state ppid pgrp ...
+        fields = stat[stat.rfind(b")") + 2:].split()
+        if int(fields[2]) == pgid and fields[0] != b"Z":
+            pids.append(int(name))
+    return pids
+
+
+class PosixProcessTree:
+    """A child started in a new session, so its whole tree shares one process group.
+
+    ``terminate()`` and ``kill()`` signal the group, reaching grandchildren
+    the saver spawned.  ``members()`` lists the group's live processes
+    (from /proc where available).
+    """
+
+    def __init__(self, argv, **popen_kwargs):
+        self.popen = subprocess.Popen(argv, start_new_session=True, **popen_kwargs)
+        self.pid = self.popen.pid
+        self.pgid = self.pid
+
+    @property
+    def returncode(self):
+        return self.popen.returncode
+
+    def poll(self):
+        return self.popen.poll()
+
+    def wait(self, timeout=None):
+        return self.popen.wait(timeout)
+
+    def _signal(self, sig):
+        try:
+            os.killpg(self.pgid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def terminate(self):
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        self._signal(signal.SIGKILL)
+
+    def members(self):
+        """Pids of live (non-zombie) processes in the group."""
+        return group_members(self.pgid)
+
+    def leaked(self):
+        """Members still running after the saver itself exited."""
+        if self.poll() is None:
+            return []
+        return [pid for pid in self.members() if pid != self.pid]
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# WINDOWS: JOB OBJECTS
+# ------------------------------------------------------------
+
+class Win32JobTree:
+    """A child assigned to its own job object; the job holds its whole tree.
+
+    The child is created suspended and only resumed once it is in the job,
+    so every descendant joins the job too.  ``terminate()``/``kill()`` end
+    every process in it with TerminateJobObject, and the job is created
+    with KILL_ON_JOB_CLOSE so nothing outlives the daemon either.  If the
+    child cannot be assigned (e.g. it already runs in a job that forbids
+    nesting), ``in_job`` is False and only the child itself is tracked
+    and ended, through Popen.
+    """
+
+    JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    JobObjectBasicProcessIdList = 3
+    JobObjectExtendedLimitInformation = 9
+    CREATE_SUSPENDED = 0x4
+
+    def __init__(self, argv, **popen_kwargs):
+        import ctypes
+        from win32_api import JOBOBJECT_EXTENDED_LIMIT_INFORMATION, kernel32, resume_process
+
+        self._ctypes = ctypes
+        self._kernel32 = kernel32
+        self.job = kernel32.CreateJobObjectW(None, None)
+        if not self.job:
+            raise ctypes.WinError(ctypes.get_last_error())
+        limits = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+        limits.BasicLimitInformation.LimitFlags = self.JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+        kernel32.SetInformationJobObject(self.job, self.JobObjectExtendedLimitInformation,
+                                         ctypes.byref(limits), ctypes.sizeof(limits))
+
+        flags = popen_kwargs.pop("creationflags", 0) | self.CREATE_SUSPENDED
+        try:
+            self.popen = subprocess.Popen(argv, creationflags=flags, **popen_kwargs)
+        except Exception:
+            self.close()
+            raise
+        self.pid = self.popen.pid
+        self.in_job = bool(kernel32.AssignProcessToJobObject(self.job, int(self.popen._handle)))
+        if not self.in_job:
+            print(f"⚠️ Could not put saver pid {self.pid} in a job object "
+                  f"(error {ctypes.get_last_error()}); its child processes are not tracked")
+        try:
+            resume_process(self.pid)
+        except OSError:
+            self.popen.kill()
+            self.popen.wait()
+            self.close()
+            raise
+
+    @property
+    def returncode(self):
+        return self.popen.returncode
+
+    def poll(self):
+        return self.popen.poll()
+
+    def wait(self, timeout=None):
+        return self.popen.wait(timeout)
+
+    def _end(self, fallback):
+        if self.in_job and self.job and self._kernel32.TerminateJobObject(self.job, 1):
+            return
+        if self.popen.poll() is None:
+            fallback()
+
+    def terminate(self):
+        self._end(self.popen.terminate)
+
+    def kill(self):
+        self._end(self.popen.kill)
+
+    def members(self):
+        if not (self.in_job and self.job):
+            return [self.pid] if self.poll() is None else []
+        from win32_api import JOBOBJECT_BASIC_PROCESS_ID_LIST
+
+        ctypes = self._ctypes
+        pids = JOBOBJECT_BASIC_PROCESS_ID_LIST()
+        if not self._kernel32.QueryInformationJobObject(
+                self.job, self.JobObjectBasicProcessIdList,
+                ctypes.byref(pids), ctypes.sizeof(pids), None):
+            return []
+        return list(pids.ProcessIdList[:pids.NumberOfProcessIdsInList])
+
+    def leaked(self):
+        if self.poll() is None:
+            return []
+        return [pid for pid in self.members() if pid != self.pid]
+
+    def close(self):
+        if self.job:
+            self._kernel32.CloseHandle(self.job)
+            self.job = None
+
+
+def spawn_tree(argv, **popen_kwargs):
+    """Start ``argv`` directly (no shell) as the root of a supervised process tree."""
+    if sys.platform == "win32":
+        return Win32JobTree(argv, **popen_kwargs)
+    return PosixProcessTree(argv, **popen_kwargs)
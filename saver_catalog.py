@@ -0,0 +1,192 @@
+import os
+import json
+import mmap
+import threading
+from collections import namedtuple
+
+
+INDEX_FILE = "saver_catalog.json"
+INDEX_VERSION = 1
+
+SaverInfo = namedtuple("SaverInfo", "name path display_name size version mtime_ns")
+
+
+# ------------------------------------------------------------
+# METADATA EXTRACTION
+# ------------------------------------------------------------
+
+_VERSION_INFO = "VS_VERSION_INFO".encode("utf-16-le")
+
+
+def _version_string(data, start, key):
+    """Value of one StringFileInfo entry, found by key after VS_VERSION_INFO."""
+    needle = (key + "\0").encode("utf-16-le")
+    at = data.find(needle, start)
+    if at < 0:
+        return None
+    # A String entry is wLength, wValueLength, wType, szKey, padding, Value;
+    # the value starts on the next 32-bit boundary after the key.
+    struct_start = at - 6
+    value_at = at + len(needle)
+    value_at += (4 - (value_at - struct_start) % 4) % 4
+    end = value_at
+    while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+        end += 2
+    try:
+        return data[value_at:end].decode("utf-16-le").strip() or None
+    except UnicodeDecodeError:
+        return None
+
+
+def read_metadata(path):
+    """Return (display_name, version) from a PE version resource, if any.
+
+    This scans for the VS_VERSION_INFO block instead of walking PE
+    resources, so it works on every platform and on test fixtures.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None, None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = data.find(_VERSION_INFO)
+                if start < 0:
+                    return None, None
+                return (_version_string(data, start, "FileDescription"),
+                        _version_string(data, start, "FileVersion"))
+    except (OSError, ValueError):
+        return None, None
+
+
+def scan_file(path, st):
+    name = os.path.basename(path)
+    description, version = read_metadata(path)
+    return SaverInfo(
+        name, path, description or os.path.splitext(name)[0],
+        st.st_size, version, st.st_mtime_ns
+    )
+
+
+# ------------------------------------------------------------
+# CATALOG INDEX
+# ------------------------------------------------------------
+
+class SaverCatalog:
+    """Index of available .scr files, persisted between runs.
+
+    ``savers()`` answers from the on-disk index straight away.  ``refresh()``
+    rescans only directories whose mtime changed, and within those only
+    files whose size or mtime changed; ``refresh_async()`` does that on a
+    worker thread.
+    """
+
+    def __init__(self, dirs, index_path=INDEX_FILE):
+        self.dirs = [os.path.abspath(d) for d in dirs]
+        self.index_path = index_path
+        self.files_scanned = 0
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                raw = json.load(f)
+            if raw.get("version") != INDEX_VERSION:
+                return {}
+            return {
+                d: {"mtime_ns": entry["mtime_ns"],
+                    "savers": [SaverInfo(*s) for s in entry["savers"]]}
+                for d, entry in raw["dirs"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save(self):
+        raw = {
+            "version": INDEX_VERSION,
+            "dirs": {d: {"mtime_ns": e["mtime_ns"], "savers": [list(s) for s in e["savers"]]}
+                     for d, e in self._index.items()},
+        }
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(raw, f, indent=1)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"⚠️ Could not save saver catalog: {e}")
+
+    # --------------------------------------------------------
+
+    def savers(self):
+        """Known savers across all directories, sorted by file name."""
+        with self._lock:
+            found = [s for d in self.dirs for s in self._index.get(d, {}).get("savers", [])]
+        return sorted(found, key=lambda s: s.name.lower())
+
+    def names(self):
+        return [s.name for s in self.savers()]
+
+    def find(self, name):
+        """SaverInfo for a file name or path, or None if it is not installed."""
+        key = os.path.basename(name).lower()
+        for saver in self.savers():
+            if saver.name.lower() == key:
+                if not os.path.isabs(name) or os.path.normcase(saver.path) == os.path.normcase(name):
+                    return saver
+        if os.path.isabs(name) and os.path.isfile(name):
+            return scan_file(name, os.stat(name))
+        return None
+
+    def _scan_dir(self, directory, previous):
+        cached = {s.name: s for s in previous}
+        savers = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".scr") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                old = cached.get(entry.name)
+                if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                    savers.append(old)
+                else:
+                    self.files_scanned += 1
+                    savers.append(scan_file(entry.path, st))
+        return savers
+
+    def refresh(self):
+        """Bring the index up to date; return True if anything changed."""
+        changed = False
+        index = dict(self._index)
+        for directory in self.dirs:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                changed |= index.pop(directory, None) is not None
+                continue
+            entry = index.get(directory)
+            if entry is not None and entry["mtime_ns"] == mtime_ns:
+                continue
+            savers = self._scan_dir(directory, entry["savers"] if entry else [])
+            index[directory] = {"mtime_ns": mtime_ns, "savers": savers}
+            changed = True
+
+        if changed:
+            with self._lock:
+                self._index = index
+            self._save()
+        return changed
+
+    def refresh_async(self, on_done=None):
+        """Refresh on a worker thread; ``on_done(changed)`` runs on that thread."""
+        def work():
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                print(f"⚠️ Saver catalog scan failed: {e}")
+                changed = False
+            if on_done is not None:
+                on_done(changed)
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        return thread
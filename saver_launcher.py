@@ -0,0 +1,276 @@
+import time
+import itertools
+import threading
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from process_tree import spawn_tree
+
+
+# windows maps pid -> [hwnd] for every child whose window was placed;
+# spawn_s is how long starting all the children took.
+LaunchResult = namedtuple(
+    "LaunchResult", "processes time_to_first_cover time_to_all_covered uncovered windows spawn_s"
+)
+
+
+# ------------------------------------------------------------
+# PROCESS LAUNCH
+# ------------------------------------------------------------
+
+class PopenLauncher:
+    """Start a .scr in fullscreen mode, directly rather than through cmd.exe.
+
+    The returned process is the saver itself (so its pid owns the saver
+    window) and the root of a tree that ``terminate()``/``kill()`` end as
+    a whole; see process_tree.
+    """
+
+    def __init__(self, spawn=spawn_tree):
+        self.spawn = spawn
+
+    def launch(self, scr_path, hidden=False):
+        kwargs = {}
+        if hidden:
+            # Asks the first ShowWindow to hide; savers that force
+            # SW_SHOW flash until SaverLauncher hides their window.
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = 0  # SW_HIDE
+            kwargs["startupinfo"] = startupinfo
+        return self.spawn([scr_path, "/s"], **kwargs)
+
+
+class FakeProcess:
+    """Process-tree look-alike that runs until ``exit()``, ``terminate()`` or ``kill()``.
+
+    ``leaks`` children survive a plain ``exit()`` of the saver, as a
+    misbehaving .scr's helpers would; terminating the tree ends them too.
+    """
+
+    _pids = itertools.count(1000)
+
+    def __init__(self, leaks=0):
+        self.pid = next(self._pids)
+        self.returncode = None
+        self.children = [next(self._pids) for _ in range(leaks)]
+        self._exited = threading.Event()
+
+    def exit(self, code=0):
+        if self.returncode is None:
+            self.returncode = code
+        self._exited.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired("fake", timeout)
+        return self.returncode
+
+    def terminate(self):
+        self.children = []
+        self.exit(-15)
+
+    def kill(self):
+        self.children = []
+        self.exit(-9)
+
+    def members(self):
+        return ([self.pid] if self.returncode is None else []) + self.children
+
+    def leaked(self):
+        return list(self.children) if self.returncode is not None else []
+
+    def close(self):
+        pass
+
+
+class FakeLauncher:
+    """Hands out FakeProcess objects and announces them to a FakeWindowMap."""
+
+    def __init__(self, window_map=None, leaks=0):
+        self.window_map = window_map
+        self.leaks = leaks
+        self.launched = []
+
+    def launch(self, scr_path, hidden=False):
+        proc = FakeProcess(self.leaks)
+        self.launched.append((scr_path, proc))
+        if self.window_map is not None:
+            self.window_map.expect(proc.pid, hidden=hidden)
+        return proc
+
+
+# ------------------------------------------------------------
+# WINDOW DISCOVERY / PLACEMENT
+# ------------------------------------------------------------
+
+class Win32WindowMap:
+    """One EnumWindows pass mapping the wanted pids to their windows.
+
+    Only visible windows count unless ``hidden=True``, which is how savers
+    started with SW_HIDE are found; the IME windows every GUI thread owns
+    are skipped then, since showing those would put junk on screen.
+    """
+
+    HELPER_CLASSES = ("IME", "MSCTFIME UI")
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        from win32_api import WNDENUMPROC, user32
+
+        self._user32 = user32
+        self._proc_id = wintypes.DWORD()
+        self._proc_id_ref = ctypes.byref(self._proc_id)
+        self._class_buf = ctypes.create_unicode_buffer(64)
+        self._wanted = set()
+        self._hidden = False
+        self._found = {}
+        self._enum_proc = WNDENUMPROC(self._collect)
+
+    def _collect(self, hwnd, lparam):
+        self._user32.GetWindowThreadProcessId(hwnd, self._proc_id_ref)
+        pid = self._proc_id.value
+        if pid in self._wanted and (self._user32.IsWindowVisible(hwnd) or
+                                    self._hidden and not self._is_helper(hwnd)):
+            self._found.setdefault(pid, []).append(hwnd)
+        return True
+
+    def _is_helper(self, hwnd):
+        self._user32.GetClassNameW(hwnd, self._class_buf, len(self._class_buf))
+        return self._class_buf.value in self.HELPER_CLASSES
+
+    def windows_by_pid(self, pids, hidden=False):
+        self._wanted = set(pids)
+        self._hidden = hidden
+        self._found = {}
+        self._user32.EnumWindows(self._enum_proc, 0)
+        return self._found
+
+    def place(self, hwnd, rect, show=True):
+        left, top, right, bottom = rect
+        self._user32.SetWindowPos(
+            hwnd, None,
+            left, top,
+            right - left, bottom - top,
+            0x0040 if show else 0x0080 | 0x0010  # SWP_SHOWWINDOW / SWP_HIDEWINDOW | SWP_NOACTIVATE
+        )
+
+    def show(self, hwnd):
+        # SWP_NOMOVE | SWP_NOSIZE | SWP_SHOWWINDOW, raised to the top.
+        self._user32.SetWindowPos(hwnd, -1, 0, 0, 0, 0, 0x0002 | 0x0001 | 0x0040)
+        self._user32.SetForegroundWindow(hwnd)
+
+
+class FakeWindowMap:
+    """Windows appear ``delay_s`` after ``expect(pid)`` on the injected clock.
+
+    A window expected with ``hidden=True`` stays invisible, and is only
+    enumerated with ``windows_by_pid(..., hidden=True)``, until ``place()``
+    or ``show()`` shows it, as with a saver started with SW_HIDE.
+
+    ``windows`` is an optional static [(hwnd, pid), ...] list that every
+    enumeration walks, to model a desktop with many unrelated windows.
+    """
+
+    def __init__(self, clock, delay_s=0.0, windows=()):
+        self.clock = clock
+        self.delay_s = delay_s
+        self.windows = list(windows)
+        self.appear_at = {}
+        self.visible = {}
+        self.placed = {}
+        self.shown = {}
+        self.enum_calls = 0
+
+    def expect(self, pid, delay_s=None, hidden=False):
+        self.appear_at[pid] = self.clock() + (self.delay_s if delay_s is None else delay_s)
+        self.visible[pid * 10] = not hidden
+
+    def windows_by_pid(self, pids, hidden=False):
+        self.enum_calls += 1
+        wanted = set(pids)
+        found = {}
+        for hwnd, pid in self.windows:
+            if pid in wanted:
+                found.setdefault(pid, []).append(hwnd)
+        now = self.clock()
+        for pid in wanted:
+            if pid in self.appear_at and now >= self.appear_at[pid] and (
+                    hidden or self.visible[pid * 10]):
+                found.setdefault(pid, []).append(pid * 10)
+        return found
+
+    def place(self, hwnd, rect, show=True):
+        self.placed[hwnd] = rect
+        self.shown[hwnd] = show
+        self.visible[hwnd] = show
+
+    def show(self, hwnd):
+        self.shown[hwnd] = True
+        self.visible[hwnd] = True
+
+
+# ------------------------------------------------------------
+# PARALLEL LAUNCH
+# ------------------------------------------------------------
+
+class SaverLauncher:
+    """Launch one saver per monitor at once and place each window as it appears.
+
+    All children are started concurrently, then a single window enumeration
+    per poll serves every pending child.  Polling starts at ``first_poll_s``
+    and backs off to ``max_poll_s`` until every window is placed or
+    ``timeout_s`` expires.
+    """
+
+    def __init__(self, launcher, window_map, clock=time.monotonic, sleep=time.sleep,
+                 timeout_s=3.0, first_poll_s=0.02, max_poll_s=0.25):
+        self.launcher = launcher
+        self.window_map = window_map
+        self.clock = clock
+        self.sleep = sleep
+        self.timeout_s = timeout_s
+        self.first_poll_s = first_poll_s
+        self.max_poll_s = max_poll_s
+        self.last_result = None
+
+    def _spawn(self, scr_path, count, hidden):
+        if count == 1:
+            return [self.launcher.launch(scr_path, hidden)]
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            return list(pool.map(lambda _: self.launcher.launch(scr_path, hidden), range(count)))
+
+    def launch_all(self, scr_path, rects, show=True):
+        """Start and place one saver per rect; ``show=False`` leaves them hidden."""
+        start = self.clock()
+        processes = self._spawn(scr_path, len(rects), not show)
+        spawn_s = self.clock() - start
+        pending = {proc.pid: rect for proc, rect in zip(processes, rects)}
+
+        windows = {}
+        first = None
+        delay = self.first_poll_s
+        while pending:
+            # Savers started hidden are only found among hidden windows.
+            found = self.window_map.windows_by_pid(pending, hidden=not show)
+            for pid, hwnds in found.items():
+                for hwnd in hwnds:
+                    self.window_map.place(hwnd, pending[pid], show)
+                windows[pid] = hwnds
+                del pending[pid]
+                if first is None:
+                    first = self.clock() - start
+            if not pending or self.clock() - start >= self.timeout_s:
+                break
+            self.sleep(delay)
+            delay = min(delay * 2, self.max_poll_s)
+
+        everything = self.clock() - start if not pending else None
+        self.last_result = LaunchResult(processes, first, everything, list(pending.values()),
+                                        windows, spawn_s)
+        return self.last_result
@@ -0,0 +1,407 @@
+import time
+
+import numpy as np
+
+
+# ------------------------------------------------------------
+# DIRTY REGIONS
+# ------------------------------------------------------------
+
+TILE = 32
+
+
+def dirty_rects(ys, xs, width, height, tile=TILE, full_ratio=0.5, max_rects=64):
+    """Rectangles ``(x0, y0, x1, y1)`` covering every touched pixel.
+
+    Touched pixels are bucketed into ``tile``-sized tiles and each row of
+    tiles is merged into runs.  Past ``max_rects`` runs each row becomes a
+    single span, and once more than ``full_ratio`` of the screen is dirty
+    one full-screen rectangle is cheaper to push than many small ones.
+    """
+    if len(xs) == 0:
+        return []
+    rows, cols = -(-height // tile), -(-width // tile)
+    mark = np.zeros((rows, cols + 1), dtype=bool)
+    mark.reshape(-1)[ys // tile * (cols + 1) + xs // tile] = True
+    if mark.sum() > full_ratio * rows * cols:
+        return [(0, 0, width, height)]
+    # Run starts/ends per row: the trailing False column closes every run.
+    edges = np.diff(mark.astype(np.int8), axis=1, prepend=0)
+    run_rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+    if len(starts) > max_rects:
+        dirty = np.flatnonzero(mark.any(axis=1))
+        first = np.searchsorted(run_rows, dirty)
+        last = np.searchsorted(run_rows, dirty, side="right") - 1
+        run_rows, starts, ends = dirty, starts[first], ends[last]
+    y0 = run_rows * tile
+    y1 = np.minimum(y0 + tile, height)
+    x0 = starts * tile
+    x1 = np.minimum(ends * tile, width)
+    return list(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()))
+
+
+def line_pixels(x0, y0, x1, y1):
+    """All pixels on many line segments at once, as (ys, xs, segment index).
+
+    Each segment gets one sample per pixel of its longer axis; the samples
+    of every segment are laid out in one flat array, so there is no Python
+    loop over segments.
+    """
+    dx, dy = x1 - x0, y1 - y0
+    counts = np.maximum(np.abs(dx), np.abs(dy)).astype(np.int64) + 1
+    seg = np.repeat(np.arange(len(counts)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    t = (np.arange(counts.sum()) - first) / np.maximum(counts - 1, 1)[seg]
+    xs = np.rint(x0[seg] + t * dx[seg]).astype(np.int64)
+    ys = np.rint(y0[seg] + t * dy[seg]).astype(np.int64)
+    return ys, xs, seg
+
+
+# ------------------------------------------------------------
+# EFFECTS
+# ------------------------------------------------------------
+
+PIXEL = np.dtype((np.void, 3))
+BLACK = np.zeros(1, dtype=np.uint8).repeat(3).view(PIXEL)
+
+class Effect:
+    """One animation drawing into an (H, W, 3) uint8 frame.
+
+    ``draw(frame, dt)`` advances by ``dt`` seconds, erases what the
+    previous frame drew, draws the new state and returns the dirty
+    rectangles.  ``set_quality(q)`` scales the work per frame, 0 < q <= 1.
+    """
+
+    def __init__(self, width, height, seed=None):
+        self.width = width
+        self.height = height
+        self.quality = 1.0
+        self.rng = np.random.default_rng(seed)
+        self._drawn = (np.empty(0, np.int64), np.empty(0, np.int64))
+
+    def set_quality(self, quality):
+        self.quality = quality
+
+    def draw(self, frame, dt):
+        raise NotImplementedError
+
+    def _replace(self, frame, ys, xs, colors):
+        """Erase the previous frame's pixels, plot the new ones, return dirty rects."""
+        old_ys, old_xs = self._drawn
+        # Scatter whole 3-byte pixels by flat index: several times faster
+        # than assigning (N, 3) rows through (y, x) index pairs.
+        pixels = frame.reshape(-1, 3).view(PIXEL).reshape(-1)
+        pixels[old_ys * self.width + old_xs] = BLACK
+        colors = np.ascontiguousarray(np.broadcast_to(colors, (len(ys), 3)), dtype=np.uint8)
+        pixels[ys * self.width + xs] = colors.view(PIXEL).reshape(-1)
+        self._drawn = (ys, xs)
+        return dirty_rects(np.concatenate((old_ys, ys)), np.concatenate((old_xs, xs)),
+                           self.width, self.height)
+
+
+class MystifyEffect(Effect):
+    """Bouncing polygons leaving a fading trail of their previous positions.
+
+    Only the newest outline is rasterized each frame; the older ones are
+    kept as pixel arrays and just redrawn one shade darker.
+    """
+
+    def __init__(self, width, height, polygons=2, vertices=4, trail=8, speed=240.0, seed=None):
+        super().__init__(width, height, seed)
+        self.max_trail = trail
+        self.trail = trail
+        self.size = np.array([width - 1, height - 1], dtype=np.float64)
+        self.pos = self.rng.random((polygons, vertices, 2)) * self.size
+        angle = self.rng.random((polygons, vertices)) * 2 * np.pi
+        self.vel = np.stack((np.cos(angle), np.sin(angle)), axis=-1) * speed
+        hues = self.rng.random(polygons)
+        self.colors = np.stack([hsv_to_rgb(h) for h in hues])
+        # Rasterized outlines, newest first: (ys, xs, polygon of each pixel).
+        self.outlines = []
+
+    def set_quality(self, quality):
+        super().set_quality(quality)
+        self.trail = max(2, int(round(self.max_trail * quality)))
+
+    def draw(self, frame, dt):
+        self.pos += self.vel * dt
+        # Bounce: reflect position and velocity on any edge crossed.
+        low, high = self.pos < 0, self.pos > self.size
+        self.vel[low | high] *= -1
+        self.pos = np.where(low, -self.pos, np.where(high, 2 * self.size - self.pos, self.pos))
+        np.clip(self.pos, 0, self.size, out=self.pos)
+
+        start = self.pos.reshape(-1, 2)
+        end = np.roll(self.pos, -1, axis=1).reshape(-1, 2)
+        ys, xs, seg = line_pixels(start[:, 0], start[:, 1], end[:, 0], end[:, 1])
+        self.outlines.insert(0, (ys, xs, seg // self.pos.shape[1]))
+        del self.outlines[self.trail:]
+
+        # Palette row per (age, polygon), faded with age.
+        ages = len(self.outlines)
+        fade = 1.0 - np.arange(ages) / self.trail
+        palette = (fade[:, None, None] * self.colors[None]).astype(np.uint8).reshape(-1, 3)
+        lengths = [len(outline[0]) for outline in self.outlines]
+        age = np.repeat(np.arange(ages), lengths)
+        polygon = np.concatenate([outline[2] for outline in self.outlines])
+        return self._replace(frame,
+                             np.concatenate([outline[0] for outline in self.outlines]),
+                             np.concatenate([outline[1] for outline in self.outlines]),
+                             palette[age * len(self.colors) + polygon])
+
+
+class StarfieldEffect(Effect):
+    """Stars flying towards the viewer, brighter and bigger as they approach."""
+
+    def __init__(self, width, height, stars=2000, speed=0.6, seed=None):
+        super().__init__(width, height, seed)
+        self.max_stars = stars
+        self.stars = stars
+        self.speed = speed
+        self.xyz = self._spawn(stars, far=False)
+
+    def _spawn(self, count, far=True):
+        xyz = np.empty((count, 3))
+        xyz[:, :2] = self.rng.uniform(-1, 1, (count, 2))
+        xyz[:, 2] = 1.0 if far else self.rng.uniform(0.05, 1.0, count)
+        return xyz
+
+    def set_quality(self, quality):
+        super().set_quality(quality)
+        self.stars = max(50, int(self.max_stars * quality))
+
+    def draw(self, frame, dt):
+        xyz = self.xyz[:self.stars]
+        xyz[:, 2] -= self.speed * dt
+        cx, cy = self.width / 2, self.height / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sx = cx + xyz[:, 0] / xyz[:, 2] * cx
+            sy = cy + xyz[:, 1] / xyz[:, 2] * cy
+        gone = (xyz[:, 2] <= 0.01) | (sx < 0) | (sx >= self.width - 1) | (sy < 0) | (sy >= self.height - 1)
+        if gone.any():
+            xyz[gone] = self._spawn(int(gone.sum()))
+            sx[gone], sy[gone] = cx + xyz[gone, 0] * cx, cy + xyz[gone, 1] * cy
+
+        xs, ys = sx.astype(np.int64), sy.astype(np.int64)
+        shade = ((1.0 - xyz[:, 2]) * 255).clip(40, 255).astype(np.uint8)
+        # Near stars are 2x2 pixels.
+        near = xyz[:, 2] < 0.3
+        xs = np.concatenate((xs, xs[near] + 1, xs[near], xs[near] + 1))
+        ys = np.concatenate((ys, ys[near], ys[near] + 1, ys[near] + 1))
+        shade = np.concatenate((shade, np.tile(shade[near], 3)))
+        return self._replace(frame, ys, xs, shade[:, None])
+
+
+# Seven-segment layout: a, b, c, d, e, f, g.
+SEGMENTS = {
+    "0": "abcdef", "1": "bc", "2": "abdeg", "3": "abcdg", "4": "bcfg",
+    "5": "acdfg", "6": "acdefg", "7": "abc", "8": "abcdefg", "9": "abcdfg",
+}
+
+
+class ClockEffect(Effect):
+    """HH:MM:SS in seven-segment digits, hopping to a new spot every ``move_s``.
+
+    Glyphs are pre-rendered masks, so a frame only composes and copies one
+    small image, and only when the text or the position changes; all other
+    frames report nothing dirty.
+    """
+
+    def __init__(self, width, height, move_s=60.0, now=time.localtime, seed=None):
+        super().__init__(width, height, seed)
+        self.move_s = move_s
+        self.now = now
+        self.digit_h = max(height // 8, 14)
+        self.glyphs = self._glyphs(self.digit_h)
+        self.color = np.array([80, 200, 255], dtype=np.uint8)
+        self.text = None
+        self.box = None
+        self.since_move = move_s
+
+    @staticmethod
+    def _glyphs(h):
+        w, t = h // 2, max(h // 10, 2)
+        mid = h // 2
+        spans = {
+            "a": (slice(0, t), slice(0, w)), "d": (slice(h - t, h), slice(0, w)),
+            "g": (slice(mid - t // 2, mid - t // 2 + t), slice(0, w)),
+            "f": (slice(0, mid), slice(0, t)), "b": (slice(0, mid), slice(w - t, w)),
+            "e": (slice(mid, h), slice(0, t)), "c": (slice(mid, h), slice(w - t, w)),
+        }
+        glyphs = {}
+        for char, segments in SEGMENTS.items():
+            mask = np.zeros((h, w + t), dtype=bool)
+            for segment in segments:
+                mask[spans[segment]] = True
+            glyphs[char] = mask
+        colon = np.zeros((h, 3 * t), dtype=bool)
+        colon[h // 3:h // 3 + t, t:2 * t] = colon[2 * h // 3:2 * h // 3 + t, t:2 * t] = True
+        glyphs[":"] = colon
+        return glyphs
+
+    def draw(self, frame, dt):
+        text = time.strftime("%H:%M:%S", self.now())
+        self.since_move += dt
+        moved = self.since_move >= self.move_s
+        if text == self.text and not moved:
+            return []
+        self.text = text
+        image = np.hstack([self.glyphs[char] for char in text])
+        h, w = image.shape
+        old = self.box
+        if moved or old is None:
+            self.since_move = 0.0
+            x = int(self.rng.integers(0, max(self.width - w, 1)))
+            y = int(self.rng.integers(0, max(self.height - h, 1)))
+        else:
+            x, y = old[0], old[1]
+        if old is not None:
+            frame[old[1]:old[3], old[0]:old[2]] = 0
+        self.box = (x, y, min(x + w, self.width), min(y + h, self.height))
+        region = frame[y:y + h, x:x + w]
+        region[:] = 0
+        region[image[:region.shape[0], :region.shape[1]]] = self.color
+        return [old, self.box] if old is not None and old != self.box else [self.box]
+
+
+EFFECTS = {
+    "mystify": MystifyEffect,
+    "starfield": StarfieldEffect,
+    "clock": ClockEffect,
+}
+
+
+def hsv_to_rgb(hue):
+    """Fully saturated, full value colour for ``hue`` in [0, 1)."""
+    channels = [(hue + offset) % 1.0 for offset in (0.0, 2 / 3, 1 / 3)]
+    return np.array([255 * min(max(abs(c * 6 - 3) - 1, 0), 1) for c in channels])
+
+
+# ------------------------------------------------------------
+# PRESENTERS
+# ------------------------------------------------------------
+
+class HeadlessPresenter:
+    """Copies dirty regions into an in-memory screen buffer (benchmarks, no display)."""
+
+    def __init__(self, width, height):
+        self.screen = np.zeros((height, width, 3), dtype=np.uint8)
+        self.blits = 0
+        self.pixels = 0
+
+    def present(self, frame, rects):
+        for x0, y0, x1, y1 in rects:
+            self.screen[y0:y1, x0:x1] = frame[y0:y1, x0:x1]
+            self.blits += 1
+            self.pixels += (x1 - x0) * (y1 - y0)
+
+
+class TkPresenter:
+    """Pushes dirty regions into a Tk PhotoImage as binary PPM."""
+
+    def __init__(self, photo):
+        self.photo = photo
+        self.blits = 0
+        self.pixels = 0
+
+    def present(self, frame, rects):
+        for x0, y0, x1, y1 in rects:
+            region = frame[y0:y1, x0:x1]
+            header = b"P6 %d %d 255\n" % (x1 - x0, y1 - y0)
+            self.photo.tk.call(self.photo.name, "put", header + region.tobytes(),
+                               "-format", "ppm", "-to", x0, y0)
+            self.blits += 1
+            self.pixels += (x1 - x0) * (y1 - y0)
+
+
+# ------------------------------------------------------------
+# FRAME LOOP
+# ------------------------------------------------------------
+
+class SaverRenderer:
+    """Drives one effect at up to ``fps``, lowering its quality when frames run long.
+
+    ``frame()`` draws and presents one frame and returns seconds until the
+    next one is due, so a Tk ``after`` loop or ``run()`` can sleep until
+    then.  Frame time (draw + present) is smoothed; above ``budget_s``
+    (default: the frame interval) for ``patience`` frames in a row the
+    quality drops one step, and after ``2 * fps`` frames under half the
+    budget it comes back up one step.
+    """
+
+    QUALITY_STEPS = (1.0, 0.75, 0.5, 0.35, 0.25)
+
+    def __init__(self, effect, presenter, fps=30.0, budget_s=None, patience=5,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.effect = effect
+        self.presenter = presenter
+        self.interval = 1.0 / fps
+        self.budget_s = budget_s or self.interval
+        self.patience = patience
+        self.clock = clock
+        self.sleep = sleep
+        self.frame_buffer = np.zeros((effect.height, effect.width, 3), dtype=np.uint8)
+
+        self.level = 0
+        self.frames = 0
+        self.downgrades = 0
+        self.frame_s = 0.0
+        self._over = 0
+        self._under = 0
+        self._last = None
+        self._next = None
+
+    def frame(self):
+        start = self.clock()
+        dt = self.interval if self._last is None else start - self._last
+        self._last = start
+        rects = self.effect.draw(self.frame_buffer, dt)
+        if rects:
+            self.presenter.present(self.frame_buffer, rects)
+        end = self.clock()
+        self.frames += 1
+        self._adapt(end - start)
+
+        self._next = (start if self._next is None else self._next) + self.interval
+        if self._next < end:
+            # Behind schedule: drop the missed slots rather than catch up.
+            self._next = end
+        return self._next - end
+
+    def _adapt(self, spent):
+        self.frame_s = spent if self.frames == 1 else 0.8 * self.frame_s + 0.2 * spent
+        if spent > self.budget_s and self.frame_s > self.budget_s:
+            self._over, self._under = self._over + 1, 0
+            if self._over >= self.patience and self.level < len(self.QUALITY_STEPS) - 1:
+                self._set_level(self.level + 1)
+                self.downgrades += 1
+        elif self.frame_s < self.budget_s / 2:
+            self._over, self._under = 0, self._under + 1
+            if self._under >= 2 / self.interval and self.level > 0:
+                self._set_level(self.level - 1)
+        else:
+            self._over = self._under = 0
+
+    def _set_level(self, level):
+        self.level = level
+        self._over = self._under = 0
+        self.effect.set_quality(self.QUALITY_STEPS[level])
+
+    @property
+    def quality(self):
+        return self.QUALITY_STEPS[self.level]
+
+    def run(self, frames=None, seconds=None):
+        """Render until ``frames`` or ``seconds`` (wall time) are reached."""
+        end = None if seconds is None else self.clock() + seconds
+        while ((frames is None or self.frames < frames) and
+               (end is None or self.clock() < end)):
+            delay = self.frame()
+            if delay > 0:
+                self.sleep(delay)
+
+
+def make_renderer(name, width, height, presenter, fps=30.0, seed=None):
+    """Renderer for effect ``name`` (one of EFFECTS)."""
+    return SaverRenderer(EFFECTS[name](width, height, seed=seed), presenter, fps=fps)
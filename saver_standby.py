@@ -0,0 +1,170 @@
+import time
+import threading
+
+
+TEARDOWN = "teardown"
+KEEP_WARM = "keep"
+POLICIES = (TEARDOWN, KEEP_WARM)
+
+
+# ------------------------------------------------------------
+# WARM STANDBY
+# ------------------------------------------------------------
+
+class WarmStandby:
+    """Savers started hidden shortly before the deadline, shown at the deadline.
+
+    ``prepare()`` launches one hidden, already placed saver per monitor on
+    a background thread, so heavy savers have drawn their first frame by
+    the time ``take()`` only has to show the windows.  If activity returns
+    first, ``cancel()`` applies the policy: ``TEARDOWN`` stops the savers
+    at once, ``KEEP_WARM`` keeps them hidden for ``keep_s`` seconds in case
+    the user goes idle again.  A batch whose saver, monitors or processes
+    changed is never shown; the caller then cold-starts as before.
+    """
+
+    def __init__(self, launcher, window_map, policy=TEARDOWN, keep_s=300.0,
+                 clock=time.monotonic, timer=threading.Timer, background=True):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown standby policy {policy!r}")
+        self.launcher = launcher
+        self.window_map = window_map
+        self.policy = policy
+        self.keep_s = keep_s
+        self.clock = clock
+        self.timer = timer
+        self.background = background
+
+        self.prepares = 0
+        self.reuses = 0
+        self.teardowns = 0
+        self.last_show_s = None
+
+        self._lock = threading.Lock()
+        self._batch = None
+        self._expiry = None
+
+    # --------------------------------------------------------
+
+    def prepare(self, scr_path, rects):
+        """Start hidden savers for the coming deadline, unless a matching batch is warm."""
+        rects = tuple(map(tuple, rects))
+        with self._lock:
+            self._cancel_expiry()
+            batch = self._batch
+            if batch is not None and batch["key"] == (scr_path, rects):
+                self.reuses += 1
+                return
+        self.teardown()
+
+        batch = {"key": (scr_path, rects), "result": None, "thread": None}
+
+        def launch():
+            batch["result"] = self.launcher.launch_all(scr_path, rects, show=False)
+
+        if self.background:
+            batch["thread"] = threading.Thread(target=launch, daemon=True)
+        with self._lock:
+            self._batch = batch
+            self.prepares += 1
+            if batch["thread"] is not None:
+                batch["thread"].start()
+        if batch["thread"] is None:
+            launch()
+
+    def take(self, scr_path, rects):
+        """Show the warm savers and hand them over; None means cold-start instead.
+
+        The cover times of the returned result count from this call, as
+        launch_all's count from its own.
+        """
+        start = self.clock()
+        rects = tuple(map(tuple, rects))
+        with self._lock:
+            self._cancel_expiry()
+            batch = self._batch
+        if batch is None:
+            return None
+        if batch["key"] != (scr_path, rects):
+            self.teardown()
+            return None
+        if batch["thread"] is not None:
+            batch["thread"].join()
+
+        result = batch["result"]
+        if (result is None or result.uncovered or
+                any(proc.poll() is not None for proc in result.processes)):
+            self.teardown()
+            return None
+
+        shown, first = self.clock(), None
+        for hwnds in result.windows.values():
+            for hwnd in hwnds:
+                self.window_map.show(hwnd)
+            if first is None:
+                first = self.clock() - start
+        covered = self.clock()
+        self.last_show_s = covered - shown
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+        return result._replace(time_to_first_cover=first, time_to_all_covered=covered - start)
+
+    def cancel(self):
+        """Activity is back before the deadline: tear down or keep warm per policy."""
+        if self.policy == KEEP_WARM:
+            with self._lock:
+                if self._batch is None or self._expiry is not None:
+                    return
+                self._expiry = self.timer(self.keep_s, self._expire, args=(self._batch,))
+                self._expiry.daemon = True
+                self._expiry.start()
+            return
+        self.teardown()
+
+    def teardown(self):
+        """Stop any prepared savers."""
+        with self._lock:
+            batch = self._detach()
+        self._stop(batch)
+
+    @property
+    def warm(self):
+        return self._batch is not None
+
+    # --------------------------------------------------------
+
+    def _cancel_expiry(self):
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+
+    def _detach(self):
+        # Caller holds the lock.
+        self._cancel_expiry()
+        batch, self._batch = self._batch, None
+        return batch
+
+    def _stop(self, batch):
+        if batch is None:
+            return
+        if batch["thread"] is not None:
+            batch["thread"].join()
+        self.teardowns += 1
+        result = batch["result"]
+        for proc in (result.processes if result else ()):
+            try:
+                if proc.poll() is None:
+                    proc.terminate()
+            except Exception:
+                pass
+
+    def _expire(self, batch):
+        # Only for the batch this timer was started for, and only if no
+        # prepare() or take() has cancelled the timer meanwhile.
+        with self._lock:
+            if self._batch is not batch or self._expiry is None:
+                return
+            self._expiry = None
+            batch = self._detach()
+        self._stop(batch)
@@ -0,0 +1,118 @@
+import time
+import weakref
+import threading
+
+
+# ------------------------------------------------------------
+# BLOCKING-WAIT SUPERVISOR
+# ------------------------------------------------------------
+
+class SaverSupervisor:
+    """Supervise saver children with one blocking ``wait()`` thread each.
+
+    Nothing wakes up while the children run; each waiter returns the moment
+    its process exits.  Callbacks run on the waiter thread.  Watching a new
+    batch retires the previous one, so late exits from an old batch never
+    fire callbacks for the new one.
+
+    Children that are process trees (see process_tree) are also reaped:
+    whatever a saver leaves running after it exits is killed and counted
+    in ``leaked``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._remaining = 0
+        self._processes = []
+        self._reaped = weakref.WeakSet()
+        self.leaked = 0
+
+    def watch(self, processes, on_all_exited, on_exit=None):
+        """Call ``on_exit(proc)`` per child and ``on_all_exited()`` once all are gone."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._processes = list(processes)
+            self._remaining = len(self._processes)
+
+        if not self._processes:
+            on_all_exited()
+            return
+
+        for proc in self._processes:
+            threading.Thread(
+                target=self._wait, args=(generation, proc, on_all_exited, on_exit),
+                daemon=True
+            ).start()
+
+    def _wait(self, generation, proc, on_all_exited, on_exit):
+        try:
+            proc.wait()
+        except Exception:
+            pass
+        self._reap(proc)
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remaining -= 1
+            done = self._remaining == 0
+
+        if on_exit is not None:
+            on_exit(proc)
+        if done:
+            on_all_exited()
+
+    def _reap(self, proc):
+        """Kill what an exited saver left behind in its tree, once per child."""
+        with self._lock:
+            if proc in self._reaped:
+                return 0
+            self._reaped.add(proc)
+        leftovers = proc.leaked() if hasattr(proc, "leaked") else []
+        if leftovers:
+            print(f"⚠️ Saver {proc.pid} left {len(leftovers)} process(es) behind — killing")
+            try:
+                proc.kill()
+            except Exception:
+                pass
+            with self._lock:
+                self.leaked += len(leftovers)
+        if hasattr(proc, "close"):
+            proc.close()
+        return len(leftovers)
+
+    @property
+    def running(self):
+        return self._remaining > 0
+
+    def terminate_all(self, grace_s=2.0):
+        """Terminate every child's tree, kill whatever is left after ``grace_s``.
+
+        Returns the number of children that had to be killed.
+        """
+        with self._lock:
+            processes = list(self._processes)
+
+        for proc in processes:
+            try:
+                # Even if the saver itself is gone its tree may not be.
+                proc.terminate()
+            except Exception:
+                pass
+
+        deadline = time.monotonic() + grace_s
+        killed = 0
+        for proc in processes:
+            try:
+                proc.wait(max(deadline - time.monotonic(), 0))
+            except Exception:
+                try:
+                    proc.kill()
+                    proc.wait(grace_s)
+                except Exception:
+                    pass
+                killed += 1
+            self._reap(proc)
+        return killed
@@ -0,0 +1,66 @@
+"""Control the running screensaver daemon.
+
+    python saverctl.py status
+    python saverctl.py activate-now
+    python saverctl.py pause [DURATION]     e.g. 90, 30s, 15m, 2h; omit to pause until resume
+    python saverctl.py resume
+    python saverctl.py reload
+    python saverctl.py stats
+    python saverctl.py inhibit NAME [DURATION] [--reason TEXT]
+    python saverctl.py uninhibit TOKEN
+    python saverctl.py inhibitors
+"""
+import sys
+import json
+import argparse
+
+from daemon_control import ControlError, send_command
+
+
+UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(text):
+    """Seconds from ``90``, ``30s``, ``15m`` or ``2h``."""
+    unit = UNITS.get(text[-1:].lower())
+    try:
+        return float(text[:-1]) * unit if unit else float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("status", "activate-now", "resume", "reload", "stats", "inhibitors"):
+        commands.add_parser(name)
+    pause = commands.add_parser("pause")
+    pause.add_argument("duration", nargs="?", type=parse_duration)
+    # Not tied to this short-lived process, so give it a duration or uninhibit it.
+    inhibit = commands.add_parser("inhibit")
+    inhibit.add_argument("name")
+    inhibit.add_argument("duration", nargs="?", type=parse_duration)
+    inhibit.add_argument("--reason", default="")
+    uninhibit = commands.add_parser("uninhibit")
+    uninhibit.add_argument("token", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "pause":
+        call_args = [args.duration]
+    elif args.command == "inhibit":
+        call_args = [args.name, args.reason, args.duration]
+    elif args.command == "uninhibit":
+        call_args = [args.token]
+    else:
+        call_args = []
+    try:
+        result = send_command(args.command, *call_args)
+    except ControlError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
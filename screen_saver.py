@@ -1,94 +1,199 @@
-import tkinter as tk
-import json
 import os
-import time
-import pyautogui
-import threading
-from pynput import keyboard
 
-class Screensaver:
-    def __init__(self, config):
-        self.timeout = config.get("timeout", 60000)  # milliseconds
-        self.lock_on_activate = config.get("lock_on_activate", False)
-        self.last_activity_time = time.time()
+from activity import InputEventSource
+from daemon_config import CONFIG_FILE, ConfigWatcher, load_config
+from daemon_control import single_instance
 
-        self.root = tk.Tk()
+class Screensaver:
+    def __init__(self, config, root=None, input_source=None):
+        self.timeout = config.timeout_ms  # milliseconds
+        self.lock_on_activate = config.lock_on_activate
+        self.effect = config.effect
+        self.effect_fps = config.effect_fps
+        self.active_poll_ms = 250  # queue check while shown, only if hooks cannot wake Tk
+        self.max_check_ms = 60000  # picks up config edits while hidden
+
+        if root is None:
+            import tkinter as tk
+            root = tk.Tk()
+        self.root = root
         self.root.attributes("-fullscreen", True)
         self.root.configure(bg="black")
         self.root.withdraw()  # Start hidden
 
         self.screensaver_active = False
-
-        # Bind direct input events
-        self.root.bind_all("<Motion>", lambda e: self.reset_timer(event=e, source="Tkinter Mouse"))
-        self.root.bind_all("<Key>", lambda e: self.reset_timer(event=e, source="Tkinter Key"))
-
-        # Start tracking
-        threading.Thread(target=self.track_mouse_movement, daemon=True).start()
-        threading.Thread(target=self.track_keyboard_input, daemon=True).start()
+        self._check_id = None
+
+        # Built-in animation, drawn into one PhotoImage covering the window
+        self.canvas = None
+        self.photo = None
+        self.renderer = None
+        self._frame_id = None
+
+        # One input source: global hooks -> aggregator -> queue -> Tk loop
+        self.input = input_source or InputEventSource().start()
+
+        # Direct Tk events arrive on the Tk thread while the saver is shown
+        self.root.bind_all("<Motion>", lambda e: self.on_tk_input("Tkinter Mouse"))
+        self.root.bind_all("<Key>", lambda e: self.on_tk_input("Tkinter Key"))
+
+        # Input the window does not see (other monitors, lost focus) must wake
+        # the Tk loop too.  The hook thread may not touch Tk, so it only writes
+        # a byte to a socket whose other end Tk watches.  Where Tk cannot watch
+        # sockets (Windows), the queue is polled while the saver is shown.
+        self._wake_r = self._wake_w = None
+        self.hook_wakeup = self._watch_wakeups()
+        if self.hook_wakeup:
+            self.input.on_edge = self.on_input_edge
+
+        # Config edits arrive on the watcher thread and are applied on the Tk thread
+        self.pending_config = None
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, self.on_config_change).start()
 
         # Start screensaver timer
         self.check_inactivity()
 
+    def _watch_wakeups(self):
+        """Have Tk watch a socket the hook thread writes to; False where it cannot."""
+        try:
+            import socket
+            from tkinter import READABLE
+            createfilehandler = self.root.tk.createfilehandler
+        except (ImportError, AttributeError):
+            return False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        createfilehandler(self._wake_r, READABLE, self.on_wakeup)
+        return True
+
+    def on_input_edge(self, source):
+        """Hook thread: while shown, wake the Tk loop without touching Tk."""
+        if not self.screensaver_active:
+            return  # the deadline check picks the edge up
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # buffer full, so a wakeup is pending anyway
+
+    def on_wakeup(self, fileobj, mask):
+        """Tk thread: clear the wakeup bytes, then drain the input queue."""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass  # nothing left to read
+        self.check_inactivity()
+
+    def on_config_change(self, config):
+        self.pending_config = config
+
+    def schedule_check(self, delay_ms):
+        if self._check_id is not None:
+            self.root.after_cancel(self._check_id)
+        self._check_id = self.root.after(max(int(delay_ms), 1), self.check_inactivity)
+
+    def schedule_active_check(self):
+        if self.hook_wakeup:
+            # Input edges wake us; no timer while the saver is shown.
+            if self._check_id is not None:
+                self.root.after_cancel(self._check_id)
+                self._check_id = None
+        else:
+            self.schedule_check(self.active_poll_ms)
+
     def check_inactivity(self):
-        elapsed = time.time() - self.last_activity_time
-        if not self.screensaver_active and elapsed >= self.timeout / 1000:
+        """Runs on the Tk thread at the idle deadline, or on an input edge while shown."""
+        config, self.pending_config = self.pending_config, None
+        if config is not None:
+            self.timeout = config.timeout_ms
+            self.lock_on_activate = config.lock_on_activate
+            self.effect = config.effect
+            self.effect_fps = config.effect_fps
+
+        for source in self.input.drain():
+            self.reset_timer(source=source)
+
+        if self.screensaver_active:
+            self.schedule_active_check()
+            return
+
+        elapsed_ms = self.input.idle_s() * 1000
+        if elapsed_ms >= self.timeout:
             print("⏳ No activity detected. Activating screensaver...")
             self.activate_screensaver()
-        self.root.after(100, self.check_inactivity)  # Check every 100ms
+            self.schedule_active_check()
+        else:
+            self.schedule_check(min(self.timeout - elapsed_ms, self.max_check_ms))
+
+    def on_tk_input(self, source):
+        self.input.touch(source)
+        if self.screensaver_active:
+            self.reset_timer(source=source)
 
     def activate_screensaver(self):
         self.screensaver_active = True
         self.root.config(cursor="none")
         self.root.deiconify()
+        self.root.focus_force()
+        if self.effect != "blank":
+            self.start_effect()
+
+    def start_effect(self):
+        """Start the built-in renderer on a fresh black image the size of the screen."""
+        import tkinter as tk
+        from saver_renderer import TkPresenter, make_renderer
+
+        width, height = self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+        if self.canvas is None:
+            self.canvas = tk.Canvas(self.root, bg="black", highlightthickness=0)
+            self.canvas.pack(fill="both", expand=True)
+        self.photo = tk.PhotoImage(width=width, height=height)
+        self.canvas.delete("all")
+        self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
+        self.renderer = make_renderer(self.effect, width, height, TkPresenter(self.photo),
+                                      fps=self.effect_fps)
+        self.render_frame()
+
+    def render_frame(self):
+        """One frame on the Tk thread, then sleep until the next one is due."""
+        if not self.screensaver_active or self.renderer is None:
+            return
+        delay = self.renderer.frame()
+        self._frame_id = self.root.after(max(int(delay * 1000), 1), self.render_frame)
+
+    def stop_effect(self):
+        if self._frame_id is not None:
+            self.root.after_cancel(self._frame_id)
+            self._frame_id = None
+        if self.renderer is not None:
+            if self.renderer.downgrades:
+                print(f"🎞️ Effect quality lowered to {self.renderer.quality:g} to keep {self.effect_fps:g} fps")
+            self.renderer = None
 
     def reset_timer(self, event=None, source="Unknown"):
+        """Handle an activity edge; the input source already moved the idle clock."""
         print(f"🔄 Activity detected from {source}! Resetting timer...")
-        self.last_activity_time = time.time()
 
         if self.screensaver_active:
             print("❌ Hiding screensaver due to activity...")
+            self.stop_effect()
             self.root.withdraw()
             self.root.config(cursor="arrow")
             self.screensaver_active = False
             if self.lock_on_activate:
                 self.lock_screen()
+            self.schedule_check(self.timeout - self.input.idle_s() * 1000)
 
     def lock_screen(self):
         print("🔒 Locking screen due to activity...")
         os.system("rundll32.exe user32.dll, LockWorkStation")
 
-    def track_mouse_movement(self):
-        last_mouse_pos = pyautogui.position()
-        while True:
-            time.sleep(0.1)
-            current_mouse_pos = pyautogui.position()
-            if current_mouse_pos != last_mouse_pos:
-                self.reset_timer(source="Mouse")
-                last_mouse_pos = current_mouse_pos
-
-    def track_keyboard_input(self):
-        def on_press(key):
-            self.reset_timer(source="Keyboard")
-        listener = keyboard.Listener(on_press=on_press)
-        listener.start()
-
     def run(self):
         self.root.mainloop()
 
-def load_config(config_file='config.json'):
-    try:
-        with open(config_file, 'r') as f:
-            config = json.load(f)
-    except Exception:
-        config = {"timeout": 1, "lock_on_activate": False}
-
-    # Convert minutes to milliseconds
-    config["timeout"] = max(config.get("timeout", 1), 1) * 60 * 1000
-    config["lock_on_activate"] = config.get("lock_on_activate", False)  
-    return config
-
 if __name__ == "__main__":
+    instance = single_instance()
     config = load_config()
     screensaver = Screensaver(config)
     screensaver.run()
\ No newline at end of file
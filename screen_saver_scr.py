@@ -1,157 +1,136 @@
 import os
-import json
 import time
-import subprocess
-import ctypes
-from ctypes import wintypes
 
-from pycaw.pycaw import AudioUtilities, IAudioMeterInformation
-from comtypes import CLSCTX_ALL
-import threading
+from idle_engine import IdleEngine, SAVER_RUNNING
+from saver_supervisor import SaverSupervisor
+from metrics import Registry, JsonFlusher, serve_http
+from daemon_config import CONFIG_FILE, ConfigWatcher, load_config, parse_config, read_raw
+from daemon_control import ControlServer, single_instance
+from platform_backends import PlatformBackends
+from inhibitors import InhibitorRegistry
+from probe_scheduler import ProbeScheduler
+from saver_catalog import SaverCatalog
+from saver_standby import WarmStandby
+from activity_journal import ActivityJournal
+from session_events import LOCK, UNLOCK
+
+
+# Platform integrations are imported on first use (see platform_backends)
+backends = PlatformBackends()
 
 
 # ------------------------------------------------------------
-# WINDOWS REAL IDLE TIME
+# REAL IDLE TIME
 # ------------------------------------------------------------
 
-class LASTINPUTINFO(ctypes.Structure):
-    _fields_ = [
-        ('cbSize', ctypes.c_uint),
-        ('dwTime', ctypes.c_uint),
-    ]
-
 def get_system_idle_ms():
-    """Return system idle time in ms using GetLastInputInfo."""
-    info = LASTINPUTINFO()
-    info.cbSize = ctypes.sizeof(LASTINPUTINFO)
-    ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info))
-    return ctypes.windll.kernel32.GetTickCount() - info.dwTime
+    """Return system idle time in ms (GetLastInputInfo on Windows, evdev on Linux)."""
+    return backends.idle()
 
 # ------------------------------------------------------------
 # AUDIO DETECTION (PER-SESSION, WORKS FOR YOU)
 # ------------------------------------------------------------
 
-def is_audio_playing(threshold=0.01):
-    """Detect audio activity across all sessions (muted sessions ignored)."""
-    try:
-        sessions = AudioUtilities.GetAllSessions()
-        for session in sessions:
-            try:
-                if session.SimpleAudioVolume.GetMute():
-                    continue
+def get_audio_sampler():
+    """Shared background sampler, started on first use."""
+    return backends.audio
 
-                meter = session._ctl.QueryInterface(IAudioMeterInformation)
-                if meter.GetPeakValue() > threshold:
-                    return True
-            except:
-                continue
-    except:
-        return False
 
-    return False
+def is_audio_playing():
+    """Debounced audio verdict across all sessions (muted sessions ignored)."""
+    return backends.audio.active
 
 
 # ------------------------------------------------------------
 # MONITOR ENUMERATION
 # ------------------------------------------------------------
 
-def get_monitors():
-    monitors = []
-
-    class RECT(ctypes.Structure):
-        _fields_ = [
-            ("left", ctypes.c_long),
-            ("top", ctypes.c_long),
-            ("right", ctypes.c_long),
-            ("bottom", ctypes.c_long),
-        ]
-
-    def callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
-        r = lprcMonitor.contents
-        monitors.append((r.left, r.top, r.right, r.bottom))
-        return True
-
-    MONPROC = ctypes.WINFUNCTYPE(
-        ctypes.c_bool, ctypes.c_ulong, ctypes.c_ulong,
-        ctypes.POINTER(RECT), ctypes.c_double
-    )
+def get_monitor_cache():
+    """Shared topology cache, created (and its watcher started) on first use."""
+    return backends.monitors
 
-    ctypes.windll.user32.EnumDisplayMonitors(
-        0, 0, MONPROC(callback), 0
-    )
 
-    return monitors
+def get_monitors():
+    return backends.monitors.rects()
 
 
 # ------------------------------------------------------------
 # WINDOW ENUMERATION FOR SCREENSAVER
 # ------------------------------------------------------------
 
-def get_windows_for_pid(pid):
-    hwnds = []
+def get_window_map():
+    return backends.window_map
 
-    @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_int, ctypes.c_int)
-    def enum_windows(hwnd, lParam):
-        proc_id = ctypes.c_ulong()
-        ctypes.windll.user32.GetWindowThreadProcessId(
-            hwnd, ctypes.byref(proc_id)
-        )
-        if proc_id.value == pid and ctypes.windll.user32.IsWindowVisible(hwnd):
-            hwnds.append(hwnd)
-        return True
 
-    ctypes.windll.user32.EnumWindows(enum_windows, 0)
-    return hwnds
+def get_windows_for_pid(pid):
+    return backends.window_map.windows_by_pid([pid]).get(pid, [])
 
 
 def move_window_to_monitor(hwnd, rect):
-    left, top, right, bottom = rect
-    ctypes.windll.user32.SetWindowPos(
-        hwnd, None,
-        left, top,
-        right - left, bottom - top,
-        0x0040
-    )
+    backends.window_map.place(hwnd, rect)
 
 
 # ------------------------------------------------------------
 # RUN SCREENSAVER
 # ------------------------------------------------------------
 
-def run_screensaver_on_monitor(scr_path, rect):
-    proc = subprocess.Popen(f'"{scr_path}" /s', shell=True)
-    time.sleep(0.7)
+def get_saver_launcher():
+    return backends.launcher
+
 
-    for hwnd in get_windows_for_pid(proc.pid):
-        move_window_to_monitor(hwnd, rect)
+def run_screensaver_on_monitors(scr_path, rects):
+    """Launch one saver per monitor concurrently and place their windows."""
+    result = backends.launcher.launch_all(scr_path, rects)
+    print(f"Saver covered first monitor in {result.time_to_first_cover}s, "
+          f"all in {result.time_to_all_covered}s")
+    return result.processes
 
-    return proc
+
+def run_screensaver_on_monitor(scr_path, rect):
+    return run_screensaver_on_monitors(scr_path, [rect])[0]
 
 
 # ------------------------------------------------------------
 # FULLSCREEN DETECTION
 # ------------------------------------------------------------
 
-def is_fullscreen_active_any_monitor():
-    monitors = get_monitors()
+def get_fullscreen_detector():
+    return backends.fullscreen
 
-    @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_int, ctypes.c_int)
-    def enum_windows(hwnd, lParam):
-        if not ctypes.windll.user32.IsWindowVisible(hwnd):
-            return True
 
-        rect = wintypes.RECT()
-        ctypes.windll.user32.GetWindowRect(hwnd, ctypes.byref(rect))
+def get_fullscreen_monitors():
+    """Indices (into get_monitors()) of monitors covered by a fullscreen window."""
+    return backends.fullscreen.covered_monitors()
 
-        for ml, mt, mr, mb in monitors:
-            if (rect.left <= ml + 5 and rect.top <= mt + 5 and
-                rect.right >= mr - 5 and rect.bottom >= mb - 5):
-                return False
 
-        return True
+def is_fullscreen_active_any_monitor():
+    return bool(get_fullscreen_monitors())
+
+
+# ------------------------------------------------------------
+# BACKEND INJECTION (TESTS / BENCHMARKS)
+# ------------------------------------------------------------
 
-    return not ctypes.windll.user32.EnumWindows(enum_windows, 0)
-    
+def install_backends(idle=None, monitors=None, windows=None, window_map=None,
+                     audio=None, launcher=None, session=None):
+    """Replace the Win32 probe backends, e.g. with the Fake* ones.
+
+    ``monitors``, ``windows`` and ``launcher`` are raw backends (monitor
+    backend, window source, process launcher) and get wrapped in the usual
+    cache/detector/SaverLauncher.  ``audio`` is an AudioSampler, which is
+    not started here; callers drive it themselves.  ``session`` is a
+    session event source such as FakeSessionSource.
+    """
+    backends.install(idle=idle, audio=audio, window_map=window_map, session=session)
+    if monitors is not None:
+        from monitor_cache import MonitorTopologyCache
+        backends.install(monitors=MonitorTopologyCache(monitors))
+    if windows is not None:
+        from fullscreen_detector import FullscreenDetector
+        backends.install(fullscreen=FullscreenDetector(windows, get_monitors))
+    if launcher is not None:
+        from saver_launcher import SaverLauncher
+        backends.install(launcher=SaverLauncher(launcher, backends.window_map))
 
 
 # ------------------------------------------------------------
@@ -159,133 +138,405 @@ def is_fullscreen_active_any_monitor():
 # ------------------------------------------------------------
 
 class Screensaver:
-    def __init__(self, config):
-        t = config.get("timeout", 60000)
-        if t < 1000:
-            t *= 60000
-        self.timeout = t
-
-        self.lock_on_activate = config.get("lock_on_activate", False)
-        self.scr_file = os.path.join(
-            "C:\\Windows\\System32",
-            config.get("screensaver", "Mystify.scr")
-        )
+    def __init__(self, config, run=True, clock=time.monotonic):
+        self.config = config
+        self.timeout = config.timeout_ms
+        self.lock_on_activate = config.lock_on_activate
+        self.scr_file = config.scr_path
 
         self.screensaver_active = False
         self.screensaver_processes = []
+        self.preview_file = None
 
         print(f"Loaded config: timeout={self.timeout}, lock={self.lock_on_activate}")
 
-        # Virtual idle timer
-        self.last_activity = time.time()
-        threading.Thread(target=self.monitor_screensaver, daemon=True).start()
-
-        self.loop()
+        self.clock = clock
+        self.activated_at = clock()
+        self._terminating = False
+        self.setup_metrics(config)
 
-    # --------------------------------------------------------
+        # Audio needs history for its verdict, so sample from the start.
+        # With audio detection off pycaw/comtypes are never imported.
+        if config.detect_audio:
+            get_audio_sampler()
 
-    def register_activity(self, reason):
-        self.last_activity = time.time()
+        # Virtual idle timer
+        self.inhibitors = InhibitorRegistry(clock=clock, on_change=self.wake_engine)
+        self.engine = IdleEngine(
+            self.timeout, self.m_probe.time(get_system_idle_ms, "idle"),
+            self.activate_screensaver, clock=clock, media_probe=self.probes,
+            inhibitors=self.inhibitors
+        )
+        self.standby = None
+        self.configure_standby(config)
+        self.journal = self.open_journal(config)
+        self.telemetry = self.open_telemetry(config)
+        self.engine.add_listener(self.on_state_change)
+        self.m_state.set(1, self.engine.state)
+        self.supervisor = SaverSupervisor()
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, self.apply_config).start()
+
+        # Event-driven idle sources report input as it happens; used to drop
+        # a warm standby at once instead of at the deadline.
+        try:
+            watch = getattr(backends.idle, "watch", None)
+        except RuntimeError as e:
+            print(f"⚠️ No idle source: {e}")
+            watch = None
+        if watch is not None:
+            watch(self.on_input_edge)
+
+        # Lock/unlock arrive as events; no watcher process, no polling.
+        try:
+            backends.session.watch(self.on_session_event)
+        except (RuntimeError, OSError) as e:
+            print(f"⚠️ Session lock/unlock not tracked: {e}")
+
+        # Validate the configured saver long before the timeout can fire.
+        # The persisted index answers at once; the rescan runs in the background.
+        self.catalog = SaverCatalog(config.saver_dirs)
+        indexed = bool(self.catalog.savers())
+        if indexed:
+            self.check_saver()
+        self.catalog.refresh_async(lambda changed: (changed or not indexed) and self.check_saver())
+
+        # Only now can every metric be read.
+        self.serve_metrics(config)
+
+        if run:
+            self.loop()
 
     # --------------------------------------------------------
 
-    def loop(self):
-        last_bucket = -1
-
-        while True:
-            now = time.time()
-
-            audio = is_audio_playing()
-            fullscreen = is_fullscreen_active_any_monitor()
+    def setup_metrics(self, config):
+        """In-process metrics; ``serve_metrics`` exposes them once the daemon is built."""
+        m = self.metrics = Registry()
+        m.counter("screensaver_loop_wakeups_total", "Idle engine wakeups",
+                  fn=lambda: self.engine.wakeups)
+        self.m_probe = m.histogram("screensaver_probe_seconds", "Time spent per probe call", label="probe")
+        self.m_first_cover = m.histogram("screensaver_first_cover_seconds",
+                                         "Saver launch or show until the first monitor is covered",
+                                         label="mode")
+        self.m_activation = m.histogram("screensaver_activation_seconds",
+                                        "Saver launch or show until every monitor is covered",
+                                        label="mode")
+        self.m_dismissal = m.histogram("screensaver_dismissal_seconds",
+                                       "Last user input until the saver exit was observed")
+        self.m_launches = m.counter("screensaver_launches_total", "Saver activations")
+        self.m_spawn = m.histogram("screensaver_spawn_seconds", "Time to start one batch of saver processes")
+        m.counter("screensaver_leaked_children_total",
+                  "Processes a saver left running after it exited (killed by the supervisor)",
+                  fn=lambda: self.supervisor.leaked)
+        self.m_failures = m.counter("screensaver_launch_failures_total",
+                                    "Activations that failed or left a monitor uncovered")
+        self.m_state = m.gauge("screensaver_state", "1 for the current engine state", label="state")
+        m.counter("screensaver_journal_records_total", "Transitions written to the activity journal",
+                  fn=lambda: getattr(self.journal, "appended", 0) if getattr(self, "journal", None) else 0)
+        m.counter("screensaver_telemetry_events_total", "Telemetry events uploaded to the collector",
+                  fn=lambda: self.telemetry.sent_events if getattr(self, "telemetry", None) else 0)
+        m.counter("screensaver_telemetry_dropped_total", "Telemetry events lost to a full queue or spool",
+                  fn=lambda: self.telemetry.dropped if getattr(self, "telemetry", None) else 0)
+        m.gauge("screensaver_inhibitors", "Inhibitor locks currently held",
+                fn=lambda: len(self.inhibitors.active()))
+        self.m_saver_valid = m.gauge("screensaver_saver_installed",
+                                     "1 if the configured saver was found in the catalog")
+
+        # Cheapest first; heavy probes only once input idle reaches the timeout.
+        self.probes = ProbeScheduler(self.m_probe.time(get_system_idle_ms, "idle"), config.timeout_ms,
+                                     clock=self.clock)
+        self.probes.add("fullscreen", self.m_probe.time(is_fullscreen_active_any_monitor, "fullscreen"),
+                        cost_s=0.0005, min_interval_s=2.0, hit_interval_s=10.0)
+        self.probes.add("audio", self.m_probe.time(is_audio_playing, "audio"),
+                        cost_s=0.002, min_interval_s=1.0, hit_interval_s=10.0)
+        self.configure_probes(config)
+        m.counter("screensaver_probe_runs_total", "Media probe calls", label="probe",
+                  fn=self.probes.runs)
+        m.counter("screensaver_probe_skips_total", "Media probe calls avoided", label="probe",
+                  fn=self.probes.skips)
+
+    def serve_metrics(self, config):
+        """Serve the metrics as Prometheus text and/or flush them to JSON."""
+        m, port = self.metrics, config.metrics_port
+        if port:
+            try:
+                serve_http(m, port)
+            except OSError as e:
+                print(f"⚠️ Metrics endpoint unavailable on port {port}: {e}")
+        if config.metrics_file:
+            JsonFlusher(m, config.metrics_file, config.metrics_flush_s).start()
+
+    def apply_config(self, config):
+        """Apply an edited config.json to the running engine, keeping idle state."""
+        self.config = config
+        self.lock_on_activate = config.lock_on_activate
+        self.scr_file = config.scr_path
+        self.timeout = config.timeout_ms
+        if config.detect_audio:
+            get_audio_sampler()
+        self.configure_probes(config)
+        self.configure_standby(config)
+        self.engine.set_timeout(config.timeout_ms)
+        print(f"Config reloaded: timeout={self.timeout}, lock={self.lock_on_activate}, "
+              f"saver={config.screensaver}")
+        if [os.path.abspath(d) for d in config.saver_dirs] != self.catalog.dirs:
+            self.catalog = SaverCatalog(config.saver_dirs)
+            self.catalog.refresh_async(lambda changed: self.check_saver())
+        self.check_saver()
+
+    def configure_standby(self, config):
+        """Pre-launch hidden savers ``standby_lead_s`` before the deadline, if enabled."""
+        engine = self.engine
+        if self.standby is not None:
+            self.standby.teardown()
+            self.standby = None
+        if not config.warm_standby:
+            engine.prepare = engine.cancel_prepare = None
+            return
+        self.standby = WarmStandby(get_saver_launcher(), get_window_map(),
+                                   config.standby_policy, config.standby_keep_s)
+        engine.prepare_lead_s = config.standby_lead_s
+        engine.cancel_prepare = self.standby.cancel
+        engine.prepare = self.prepare_standby
+        engine.prepared = False
+
+    def prepare_standby(self):
+        self.standby.prepare(self.scr_file, get_monitors())
+
+    def check_saver(self):
+        """Resolve the configured saver through the catalog; warn if it is missing."""
+        config = self.config
+        saver = self.catalog.find(config.screensaver)
+        if saver is None:
+            self.m_saver_valid.set(0)
+            known = ", ".join(self.catalog.names()) or "none indexed yet"
+            print(f"⚠️ Screensaver {config.screensaver!r} not found (available: {known})")
+            return False
+        self.scr_file = saver.path
+        self.m_saver_valid.set(1)
+        return True
 
-            # Treat audio/fullscreen as activity
-            if audio or fullscreen:
-                self.register_activity("media")
+    # --------------------------------------------------------
+    # CONTROL CHANNEL COMMANDS
+    # --------------------------------------------------------
 
-            # Real input automatically updates GetLastInputInfo
-            real_idle = get_system_idle_ms()
-            if real_idle < 2000:
-                self.register_activity("real input")
+    def control_handlers(self):
+        """Commands served to saverctl / config_editor by ControlServer."""
+        return {
+            "status": self.status,
+            "activate-now": lambda: self.engine.activate_now("requested"),
+            "pause": self.pause,
+            "resume": self.engine.resume,
+            "reload": self.reload,
+            "stats": self.metrics.snapshot,
+            "preview": self.preview,
+            "inhibit": self.inhibitors.acquire,
+            "uninhibit": self.inhibitors.release,
+            "inhibitors": self.list_inhibitors,
+        }
 
-            virtual_idle = int((now - self.last_activity) * 1000)
+    def status(self):
+        engine = self.engine
+        paused = engine.paused_until
+        return {
+            "pid": os.getpid(),
+            "state": engine.state,
+            "idle_ms": engine.idle_ms(),
+            "timeout_ms": engine.timeout_ms,
+            "paused_for_s": None if paused is None else
+                            ("indefinitely" if paused == float("inf") else
+                             round(paused - engine.clock(), 1)),
+            "screensaver": self.scr_file,
+            "lock_on_activate": self.lock_on_activate,
+            "inhibitors": len(self.inhibitors.active()),
+        }
 
-            bucket = virtual_idle // 5000
-            if bucket != last_bucket:
-                last_bucket = bucket
-                print(f"Idle={virtual_idle}ms audio={audio} fullscreen={fullscreen}")
+    def list_inhibitors(self):
+        now = self.inhibitors.clock()
+        return [
+            {"token": lock.token, "name": lock.name, "reason": lock.reason, "pid": lock.pid,
+             "expires_in_s": None if lock.expires_at is None else round(lock.expires_at - now, 1)}
+            for lock in self.inhibitors.active()
+        ]
 
-            if virtual_idle >= self.timeout and not self.screensaver_active:
-                self.activate_screensaver()
+    def pause(self, duration_s=None):
+        self.engine.pause(duration_s)
+        return self.status()
+
+    def reload(self):
+        """Re-read config.json now instead of waiting for the watcher.
+
+        An invalid file raises (ConfigError, or the JSON/OS error), which
+        the control client reports; the running config is kept.  Whichever
+        of this and the watcher sees a change first applies it, once.
+        """
+        config = parse_config(read_raw(CONFIG_FILE))
+        if self.config_watcher.accept(config):
+            self.apply_config(config)
+        return self.status()
+
+    def preview(self, name=None):
+        """Show ``name`` (or the configured saver) now, without changing the config."""
+        if name:
+            saver = self.catalog.find(name)
+            if saver is None:
+                raise ValueError(f"screensaver {name!r} is not installed")
+            self.preview_file = saver.path
+        started = self.engine.activate_now("preview")
+        self.preview_file = None
+        return started
 
-            time.sleep(1)
+    # --------------------------------------------------------
 
-    def monitor_screensaver(self):
-        """Check every 2 seconds whether the screensaver processes have exited."""
-        while True:
-            if self.screensaver_active:
-                all_dead = True
-                for proc in self.screensaver_processes:
-                    try:
-                        if proc.poll() is None:  # still running
-                            all_dead = False
-                            break
-                    except:
-                        pass
+    def register_activity(self, reason):
+        self.engine.register_activity(reason)
+
+    def on_input_edge(self, source):
+        """Input after a quiet spell; only matters while savers are pre-launched."""
+        if self.engine.prepared:
+            self.engine.wake()
+
+    def wake_engine(self):
+        # Inhibitors can change before the engine exists.
+        engine = getattr(self, "engine", None)
+        if engine is not None:
+            engine.wake()
+
+    def configure_probes(self, config):
+        """Audio or a fullscreen window keeps the screensaver away, if enabled."""
+        self.probes.timeout_ms = config.timeout_ms
+        self.probes.enable("audio", config.detect_audio)
+        self.probes.enable("fullscreen", config.detect_fullscreen)
+
+    def open_journal(self, config):
+        """Binary transition journal for journal_query.py; None if disabled or unusable."""
+        if not config.journal_dir:
+            return None
+        try:
+            # 1 MiB segments, so the size cap is a segment count.
+            return ActivityJournal(config.journal_dir, max_segments=max(int(config.journal_max_mb), 1))
+        except OSError as e:
+            print(f"⚠️ Activity journal disabled: {e}")
+            return None
+
+    def open_telemetry(self, config):
+        """Batched uploads of transitions and metrics to ``telemetry_url``; None if unset."""
+        if not config.telemetry_url:
+            return None
+        from telemetry import TelemetryAgent
+
+        try:
+            return TelemetryAgent(config.telemetry_url, config.telemetry_spool_dir,
+                                  counters=self.metrics.snapshot,
+                                  flush_s=config.telemetry_flush_s).start()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Telemetry disabled: {e}")
+            return None
+
+    def on_state_change(self, old, new, reason):
+        self.m_state.set(0, old)
+        self.m_state.set(1, new)
+        idle_ms = self.engine.idle_ms()
+        print(f"State {old} -> {new} ({reason}) idle={idle_ms}ms")
+        if reason == "media":
+            reason = self.probes.last_hit or reason
+        if self.journal is not None:
+            self.journal.append(new, reason, idle_ms)
+        if self.telemetry is not None:
+            self.telemetry.record("state", old=old, new=new, reason=reason, idle_ms=idle_ms)
 
-                if all_dead:
-                    # Screensaver has fully exited
-                    self.screensaver_active = False
-                    self.screensaver_processes = []
-                    print("Screensaver exited — flag reset")
+    # --------------------------------------------------------
 
-            time.sleep(2)  # check every 2 seconds            
+    def loop(self):
+        """Sleep until the next idle deadline instead of ticking every second."""
+        self.engine.run()
+
+    def on_saver_exited(self):
+        """Called by the supervisor the moment the last saver child exits."""
+        # The input that dismissed the saver is the last input the OS saw.
+        # Exits we forced (lock, terminate_all) and savers that ended with
+        # no input since they started (crashes) are not dismissals.
+        idle_s = get_system_idle_ms() / 1000
+        if (not self._terminating and self.engine.state == SAVER_RUNNING
+                and idle_s < self.clock() - self.activated_at):
+            self.m_dismissal.observe(idle_s)
+        self.screensaver_active = False
+        self.screensaver_processes = []
+        print("Screensaver exited — flag reset")
+        self.engine.notify_saver_exited()
+
+    def on_session_event(self, event):
+        """Session locked: stop any saver and park the engine; unlocked: start over."""
+        if event == LOCK:
+            self.engine.set_session_locked(True)
+            if self.standby is not None:
+                self.standby.teardown()
+            killed = self.terminate_savers()
+            if killed:
+                print(f"⚠️ Had to kill {killed} screensaver process(es)")
+        elif event == UNLOCK:
+            self.engine.set_session_locked(False)
 
     # --------------------------------------------------------
 
     def activate_screensaver(self):
-        self.screensaver_active = True
         self.screensaver_processes = []
-
-        for rect in get_monitors():
-            proc = run_screensaver_on_monitor(self.scr_file, rect)
-            self.screensaver_processes.append(proc)
+        self.activated_at = self.clock()
+
+        self.m_launches.inc()
+        scr_file, rects = self.preview_file or self.scr_file, get_monitors()
+        standby = self.standby
+        result = standby.take(scr_file, rects) if standby is not None else None
+        mode = "warm"
+        if result is None:
+            mode = "cold"
+            try:
+                run_screensaver_on_monitors(scr_file, rects)
+            except Exception:
+                self.m_failures.inc()
+                raise
+            result = get_saver_launcher().last_result
+        self.screensaver_processes = result.processes
+        self.m_spawn.observe(result.spawn_s)
+        # Both modes time from the start of take() / launch_all().
+        if result.time_to_first_cover is not None:
+            self.m_first_cover.observe(result.time_to_first_cover, mode)
+        if result.time_to_all_covered is None:
+            self.m_failures.inc()
+        else:
+            self.m_activation.observe(result.time_to_all_covered, mode)
+        # Only once savers run, and before a quick exit can be reported.
+        self.screensaver_active = True
+        self.supervisor.watch(self.screensaver_processes, self.on_saver_exited)
 
     # --------------------------------------------------------
 
+    def terminate_savers(self):
+        """terminate_all, with the resulting exits flagged as ours."""
+        self._terminating = True
+        try:
+            return self.supervisor.terminate_all()
+        finally:
+            self._terminating = False
+
     def exit_screensaver(self):
-        for proc in self.screensaver_processes:
-            try:
-                if proc.poll() is None:
-                    proc.terminate()
-            except:
-                pass
+        killed = self.terminate_savers()
+        if killed:
+            print(f"⚠️ Had to kill {killed} screensaver process(es)")
 
         self.screensaver_processes = []
         self.screensaver_active = False
+        self.engine.notify_saver_exited()
 
         if self.lock_on_activate:
             os.system("rundll32.exe user32.dll, LockWorkStation")
 
 
-# ------------------------------------------------------------
-# CONFIG LOADING
-# ------------------------------------------------------------
-
-def load_config():
-    try:
-        with open("config.json", "r") as f:
-            return json.load(f)
-    except:
-        return {
-            "timeout": 60000,
-            "lock_on_activate": False,
-            "screensaver": "Mystify.scr"
-        }
-
-
 # ------------------------------------------------------------
 # ENTRY POINT
 # ------------------------------------------------------------
 
 if __name__ == "__main__":
-    Screensaver(load_config())
\ No newline at end of file
+    instance = single_instance()
+    screensaver = Screensaver(load_config(), run=False)
+    ControlServer(screensaver.control_handlers()).start()
+    screensaver.loop()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import threading
+
+
+# ------------------------------------------------------------
+# EVENTS
+# ------------------------------------------------------------
+
+LOCK = "lock"
+UNLOCK = "unlock"
+
+
+# ------------------------------------------------------------
+# WIN32 SOURCE
+# ------------------------------------------------------------
+
+class Win32SessionSource:
+    """Session lock/unlock notifications from WTSRegisterSessionNotification.
+
+    A hidden window on a background thread receives WM_WTSSESSION_CHANGE,
+    so the daemon learns about lock and unlock as they happen instead of
+    polling the foreground window.  Console connect/disconnect are ignored:
+    they come with no matching unlock/lock, and Windows locks a session
+    it switches away from (WTS_SESSION_LOCK) whenever that matters.
+    """
+
+    WM_WTSSESSION_CHANGE = 0x02B1
+    NOTIFY_FOR_THIS_SESSION = 0
+    EVENTS = {
+        0x7: LOCK,    # WTS_SESSION_LOCK
+        0x8: UNLOCK,  # WTS_SESSION_UNLOCK
+    }
+
+    def watch(self, callback):
+        """Call ``callback(event)`` from a background thread on LOCK / UNLOCK."""
+        threading.Thread(target=self._message_loop, args=(callback,), daemon=True).start()
+
+    def _message_loop(self, callback):
+        from win32_api import MessageWindow, wtsapi32
+
+        if wtsapi32 is None:
+            print("⚠️ wtsapi32 unavailable; lock/unlock will not be tracked")
+            return
+
+        def on_message(msg, wparam, lparam):
+            if msg == self.WM_WTSSESSION_CHANGE and wparam in self.EVENTS:
+                try:
+                    callback(self.EVENTS[wparam])
+                except Exception as e:
+                    print(f"⚠️ Session event handler failed: {e}")
+
+        self._window = MessageWindow("ScreensaverSessionWatcher", on_message)
+        try:
+            hwnd = self._window.create()
+        except OSError as e:
+            print(f"⚠️ Session window unavailable ({e}); lock/unlock will not be tracked")
+            return
+        if not wtsapi32.WTSRegisterSessionNotification(hwnd, self.NOTIFY_FOR_THIS_SESSION):
+            print("⚠️ WTSRegisterSessionNotification failed; lock/unlock will not be tracked")
+            return
+
+        try:
+            self._window.pump()
+        finally:
+            wtsapi32.WTSUnRegisterSessionNotification(hwnd)
+
+
+# ------------------------------------------------------------
+# FAKE SOURCE (TESTS / BENCHMARKS)
+# ------------------------------------------------------------
+
+class FakeSessionSource:
+    """In-memory session; ``lock()`` / ``unlock()`` deliver events synchronously."""
+
+    def __init__(self):
+        self.locked = False
+        self._callbacks = []
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+
+    def _emit(self, event):
+        for callback in self._callbacks:
+            callback(event)
+
+    def lock(self):
+        self.locked = True
+        self._emit(LOCK)
+
+    def unlock(self):
+        self.locked = False
+        self._emit(UNLOCK)
@@ -0,0 +1,753 @@
+"""Replay scripted days through the three Screensaver engines on a virtual clock.
+
+    python simulator.py [--engine scr|activate|tk|all] [--days N] [--seed S]
+                        [--timeout-min M] [--trace FILE] [--check] [--json]
+
+Each engine is built with fake platform backends (idle source, monitors,
+windows, audio, session, saver processes) and driven by a Trace: timed
+input, audio, fullscreen, monitor, lock/unlock and saver-exit events.
+Time only moves between scheduled events, so a 24 h day replays in well
+under a second and every run is deterministic, on any OS.
+
+* ``scr``       screen_saver_scr.Screensaver (IdleEngine, probes, supervisor)
+* ``activate``  activate_screensaver.Screensaver (one-second loop, no probes)
+* ``tk``        screen_saver.Screensaver (Tk window, ``after`` scheduling)
+
+Activations are scored against the ideal: the saver starts ``timeout``
+after the last input, the end of audio or a fullscreen window, or an
+unlock, and never while media plays or the session is locked.  The
+report gives missed and unwanted activations, how late the matched ones
+were, how long dismissals took, monitors left uncovered, engine wakeups
+and probe calls.
+
+Each engine is held to what it is built to do: activate and tk only
+react to input and cover the primary monitor, so they are scored
+against the ideal for input alone (their shortfall against the full
+ideal is shown alongside).  ``--check`` exits non-zero if any engine
+run misses, adds or delays an activation beyond the limits, or exceeds
+its wakeup or probe-call budget per day (``--max-wakeups`` and
+``--max-probe-calls`` override those), for use in CI.
+
+``--trace`` reads a JSON list of ``[seconds, kind, value]`` events (kinds
+as in KINDS) instead of the synthetic office days.
+"""
+import io
+import sys
+import json
+import time
+import heapq
+import select
+import random
+import argparse
+import contextlib
+
+from daemon_config import Config
+
+
+INPUT, AUDIO, FULLSCREEN, MONITORS, LOCK, UNLOCK, SAVER_EXIT = (
+    "input", "audio", "fullscreen", "monitors", "lock", "unlock", "saver_exit")
+KINDS = (INPUT, AUDIO, FULLSCREEN, MONITORS, LOCK, UNLOCK, SAVER_EXIT)
+
+DAY_S = 24 * 3600
+ONE = [(0, 0, 1920, 1080)]
+TWO = [(0, 0, 1920, 1080), (1920, 0, 3840, 1080)]
+
+
+# ------------------------------------------------------------
+# VIRTUAL CLOCK
+# ------------------------------------------------------------
+
+class VirtualClock:
+    """Seconds that only advance when the next scheduled call runs.
+
+    ``sleep`` moves time forward without running anything (what a poll
+    loop inside a call, e.g. SaverLauncher's, sees).
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self._heap = []
+        self._seq = 0
+        self._cancelled = set()
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+    def call_at(self, t, fn, priority=1):
+        """Run ``fn()`` at ``t``; at equal times lower ``priority`` first."""
+        self._seq += 1
+        heapq.heappush(self._heap, (max(t, self.now), priority, self._seq, fn))
+        return self._seq
+
+    def call_later(self, delay, fn):
+        return self.call_at(self.now + delay, fn)
+
+    def cancel(self, handle):
+        if handle is not None:
+            self._cancelled.add(handle)
+
+    def run_until(self, end, after_each=None):
+        while self._heap and self._heap[0][0] <= end:
+            t, _, seq, fn = heapq.heappop(self._heap)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            self.now = t
+            fn()
+            if after_each is not None:
+                after_each()
+        self.now = max(self.now, end)
+
+
+# ------------------------------------------------------------
+# TRACES
+# ------------------------------------------------------------
+
+class Trace:
+    """Time-ordered ``(seconds, kind, value)`` events plus the run length."""
+
+    def __init__(self, events, duration_s=None, monitors=ONE):
+        self.events = sorted(events, key=lambda e: e[0])
+        for _, kind, _ in self.events:
+            if kind not in KINDS:
+                raise ValueError(f"unknown trace event {kind!r}")
+        self.duration_s = duration_s if duration_s is not None else (
+            self.events[-1][0] + 1 if self.events else 0.0)
+        self.monitors = monitors
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            raw = json.load(f)
+        if isinstance(raw, dict):
+            return cls([tuple(e) for e in raw["events"]], raw.get("duration_s"),
+                       raw.get("monitors", ONE))
+        return cls([tuple(e) for e in raw])
+
+    def count(self, kind):
+        return sum(1 for _, k, _ in self.events if k == kind)
+
+
+def office_day(seed, start=0.0):
+    """One synthetic day of events, ``start`` seconds in.
+
+    Typing and mousing 08-12 and 13-18 with short pauses and the odd long
+    one; music with nobody there over lunch; a locked 20-minute meeting at
+    15:00; a second monitor plugged in at 16:00; a two-hour fullscreen
+    video from 19:00; an hour of evening work; and the saver crashing by
+    itself at 03:00.
+    """
+    rng = random.Random(seed)
+    events = []
+    for start_h, end_h in ((8, 12), (13, 15), (15 + 1 / 3, 18), (18.9, 19.0), (21.5, 22.5)):
+        t = start_h * 3600
+        while t < end_h * 3600:
+            events.append((t, INPUT, "keyboard" if rng.random() < 0.6 else "mouse"))
+            roll = rng.random()
+            if roll < 0.02:
+                t += rng.uniform(300, 1500)
+            elif roll < 0.10:
+                t += rng.uniform(20, 120)
+            else:
+                t += rng.expovariate(1 / 3.0)
+    events += [
+        (12 * 3600, AUDIO, True), (12 * 3600 + 40 * 60, AUDIO, False),
+        (15 * 3600 + 5, LOCK, None), (15 * 3600 + 20 * 60, UNLOCK, None),
+        (16 * 3600, MONITORS, TWO),
+        (19 * 3600, AUDIO, True), (19 * 3600, FULLSCREEN, True),
+        (21 * 3600, AUDIO, False), (21 * 3600, FULLSCREEN, False),
+        (3 * 3600, SAVER_EXIT, None),
+    ]
+    return [(start + t, kind, value) for t, kind, value in events if t < DAY_S]
+
+
+def office_days(days, seed=1):
+    events = []
+    for day in range(days):
+        events += office_day(seed * 1000 + day, day * DAY_S)
+        # Each morning starts on one monitor again.
+        events.append((day * DAY_S + 7 * 3600, MONITORS, ONE))
+    return Trace(events, days * DAY_S)
+
+
+# ------------------------------------------------------------
+# IDEAL ACTIVATIONS
+# ------------------------------------------------------------
+
+def expected_activations(trace, timeout_s, kinds=KINDS):
+    """When a perfect engine would start the saver for ``trace``.
+
+    Only events of ``kinds`` are taken into account, giving the ideal for
+    an engine that by design reacts to nothing else.
+    """
+    expected = []
+    quiet_since, locked, saver = 0.0, False, False
+    media = {AUDIO: False, FULLSCREEN: False}
+
+    def due(t):
+        nonlocal saver
+        if not saver and not locked and not any(media.values()) and quiet_since + timeout_s <= t:
+            expected.append(quiet_since + timeout_s)
+            saver = True
+
+    for t, kind, value in trace.events:
+        if kind not in kinds:
+            continue
+        due(t)
+        if kind == INPUT:
+            saver, quiet_since = False, t
+        elif kind in media:
+            was = any(media.values())
+            media[kind] = bool(value)
+            if was and not any(media.values()):
+                quiet_since = max(quiet_since, t)
+        elif kind == LOCK:
+            locked, saver = True, False
+        elif kind == UNLOCK:
+            locked, quiet_since = False, t
+        elif kind == SAVER_EXIT and saver:
+            saver, quiet_since = False, t
+    due(trace.duration_s)
+    return expected
+
+
+# ------------------------------------------------------------
+# ENGINE DRIVERS
+# ------------------------------------------------------------
+
+class ProbeCost:
+    """Modelled probe CPU, so ProbeScheduler orders probes the same on every run."""
+
+    # Seconds per call, as in bench_schedule.
+    AUDIO_S = 0.002
+    FULLSCREEN_S = 0.0005
+
+    def __init__(self):
+        self.spent_s = 0.0
+
+    def __call__(self):
+        return self.spent_s
+
+
+class SimAudio:
+    """Stands in for the AudioSampler: ``active`` is set by the trace."""
+
+    def __init__(self, cost):
+        self.cost = cost
+        self.playing = False
+
+    @property
+    def active(self):
+        self.cost.spent_s += ProbeCost.AUDIO_S
+        return self.playing
+
+
+class SimFullscreen:
+    """A FullscreenDetector whose calls are charged to the cost model."""
+
+    def __init__(self, detector, cost):
+        self.detector = detector
+        self.cost = cost
+
+    def covered_monitors(self):
+        self.cost.spent_s += ProbeCost.FULLSCREEN_S
+        return self.detector.covered_monitors()
+
+
+class CountingIdle:
+    """FakeIdleSource on the virtual clock that counts its reads."""
+
+    def __init__(self, clock):
+        from idle_engine import FakeIdleSource
+
+        self.source = FakeIdleSource(clock)
+        self.calls = 0
+
+    def input(self):
+        self.source.input()
+
+    def __call__(self):
+        self.calls += 1
+        return self.source()
+
+
+class ScrDriver:
+    """screen_saver_scr.Screensaver on fake backends."""
+
+    name = "scr"
+    # Trace kinds the engine is meant to react to, and its --check budgets
+    # (per simulated day).
+    models = KINDS
+    max_wakeups = 2000
+    max_probe_calls = {"idle": 5000, "fullscreen": 2000, "audio": 1000}
+
+    def __init__(self, vc, config, monitors):
+        import screen_saver_scr as scr
+        from monitor_cache import FakeMonitorBackend, MonitorTopologyCache
+        from fullscreen_detector import FakeWindowSource, FullscreenDetector
+        from saver_launcher import FakeLauncher, FakeWindowMap, SaverLauncher
+        from session_events import FakeSessionSource
+
+        self.vc = vc
+        self.idle = CountingIdle(vc.clock)
+        self.cost = ProbeCost()
+        self.audio = SimAudio(self.cost)
+        self.monitors = FakeMonitorBackend(monitors)
+        self.windows = FakeWindowSource([])
+        self.window_map = FakeWindowMap(vc.clock)
+        self.session = FakeSessionSource()
+        scr.backends.install(
+            idle=self.idle, audio=self.audio, window_map=self.window_map, session=self.session,
+            monitors=MonitorTopologyCache(self.monitors),
+            launcher=SaverLauncher(FakeLauncher(self.window_map), self.window_map,
+                                   clock=vc.clock, sleep=vc.sleep),
+        )
+        scr.backends.install(fullscreen=SimFullscreen(FullscreenDetector(self.windows, scr.get_monitors),
+                                                      self.cost))
+        self.saver = scr.Screensaver(config, run=False, clock=vc.clock)
+        self.saver.probes.timer = self.cost
+        self.engine = self.saver.engine
+        self._next = None
+        self.step()
+
+    def step(self):
+        # What IdleEngine.run does at each deadline or wake().
+        self.engine._wake.clear()
+        delay = self.engine.step()
+        self.vc.cancel(self._next)
+        self._next = None if delay is None else self.vc.call_later(max(delay, 0.001), self.step)
+
+    def after_event(self):
+        if self.engine._wake.is_set():
+            self.step()
+
+    def _exit_savers(self):
+        """End the saver processes and wait for the supervisor to report it."""
+        processes = list(self.saver.screensaver_processes)
+        if not processes:
+            return
+        for proc in processes:
+            proc.exit()
+        deadline = time.monotonic() + 5.0
+        while self.saver.screensaver_active and time.monotonic() < deadline:
+            time.sleep(0.0002)
+
+    # Trace events ---------------------------------------------
+
+    def input(self, source):
+        self.idle.input()
+        # A real .scr quits on the first mouse move or key.
+        self._exit_savers()
+
+    def media(self, kind, on):
+        if kind == AUDIO:
+            self.audio.playing = on
+        else:
+            rect = self.monitors.monitors[0].rect
+            self.windows.set_windows([(4242, rect)] if on else [])
+
+    def set_monitors(self, rects):
+        self.monitors.set_monitors(rects)
+
+    def lock(self, locked):
+        if locked:
+            self.session.lock()
+        else:
+            self.session.unlock()
+
+    def saver_exit(self):
+        self._exit_savers()
+
+    # Observations ---------------------------------------------
+
+    def active(self):
+        from idle_engine import SAVER_RUNNING
+        return self.engine.state == SAVER_RUNNING
+
+    def covered(self):
+        return len(self.saver.screensaver_processes)
+
+    def stats(self):
+        return {"wakeups": self.engine.wakeups,
+                "probe_calls": {"idle": self.idle.calls, **self.saver.probes.runs()}}
+
+
+class ActivateDriver:
+    """activate_screensaver.Screensaver: its one-second loop on the virtual clock."""
+
+    name = "activate"
+    # Input only: no media or lock awareness, one saver on the primary
+    # monitor, and a saver that exits by itself goes unnoticed.
+    models = (INPUT,)
+    max_wakeups = 90000  # its one-second loop
+    max_probe_calls = {"idle": 90000}
+
+    def __init__(self, vc, config, monitors):
+        import activate_screensaver
+        from saver_launcher import FakeLauncher
+
+        self.vc = vc
+        self.launcher = FakeLauncher()
+        self.saver = activate_screensaver.Screensaver(config, clock=vc.clock, launcher=self.launcher,
+                                                     start=False)
+        self.wakeups = 0
+        self.tick()
+
+    def tick(self):
+        self.wakeups += 1
+        self.saver.check_once()
+        self.vc.call_later(1.0, self.tick)
+
+    def after_event(self):
+        pass
+
+    def input(self, source):
+        self.saver.activity.touch("Mouse movement" if source == "mouse" else "Key press")
+        proc = self.saver.screensaver_process
+        if proc is not None:
+            proc.exit()
+
+    def media(self, kind, on):
+        pass
+
+    def set_monitors(self, rects):
+        pass
+
+    def lock(self, locked):
+        pass
+
+    def saver_exit(self):
+        if self.saver.screensaver_process is not None:
+            self.saver.screensaver_process.exit()
+
+    def active(self):
+        return self.saver.screensaver_active
+
+    def covered(self):
+        # One saver process, which covers the primary monitor.
+        return 1 if self.saver.screensaver_active else 0
+
+    def stats(self):
+        return {"wakeups": self.wakeups, "probe_calls": {"idle": self.wakeups}}
+
+
+class SimTcl:
+    """The Tcl interpreter of SimTkRoot: only its file handlers."""
+
+    def __init__(self):
+        self.file_handlers = {}
+
+    def createfilehandler(self, fileobj, mask, handler):
+        self.file_handlers[fileobj] = (mask, handler)
+
+    def deletefilehandler(self, fileobj):
+        self.file_handlers.pop(fileobj, None)
+
+
+class SimTkRoot:
+    """The parts of tk.Tk screen_saver.Screensaver uses, on the virtual clock."""
+
+    def __init__(self, vc, monitors):
+        self.tk = SimTcl()
+        self.vc = vc
+        self.monitors = monitors
+        self.visible = False
+        self.handlers = {}
+        self.callbacks = 0
+
+    def after(self, ms, fn):
+        def fire():
+            self.callbacks += 1
+            fn()
+        return self.vc.call_later(ms / 1000, fire)
+
+    def after_cancel(self, handle):
+        self.vc.cancel(handle)
+
+    def withdraw(self):
+        self.visible = False
+
+    def deiconify(self):
+        self.visible = True
+
+    def bind_all(self, sequence, handler):
+        self.handlers[sequence] = handler
+
+    def poll_files(self):
+        """Run the handlers of readable watched sockets, as a turn of Tk's loop would."""
+        handlers = self.tk.file_handlers
+        if not handlers:
+            return
+        ready, _, _ = select.select(list(handlers), [], [], 0)
+        for fileobj in ready:
+            mask, handler = handlers[fileobj]
+            self.callbacks += 1
+            handler(fileobj, mask)
+
+    def fire(self, sequence):
+        if self.visible and sequence in self.handlers:
+            self.handlers[sequence](None)
+
+    def winfo_screenwidth(self):
+        left, _, right, _ = self.monitors[0]
+        return right - left
+
+    def winfo_screenheight(self):
+        _, top, _, bottom = self.monitors[0]
+        return bottom - top
+
+    def attributes(self, *args):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+    config = configure
+
+    def focus_force(self):
+        pass
+
+
+class TkDriver:
+    """screen_saver.Screensaver with a simulated Tk root and unhooked input source."""
+
+    name = "tk"
+    # Input only, like activate; its window cannot exit by itself.
+    models = (INPUT,)
+    max_wakeups = 2000
+    max_probe_calls = {"idle": 2000}
+
+    def __init__(self, vc, config, monitors):
+        import screen_saver
+        from activity import InputEventSource
+
+        self.vc = vc
+        self.root = SimTkRoot(vc, monitors)
+        self.input_source = InputEventSource(clock=vc.clock)
+        self.saver = screen_saver.Screensaver(config, root=self.root, input_source=self.input_source)
+
+    def after_event(self):
+        self.root.poll_files()
+
+    def input(self, source):
+        self.input_source.touch("Mouse" if source == "mouse" else "Keyboard")
+        # The visible fullscreen window gets the event directly too.
+        self.root.fire("<Motion>" if source == "mouse" else "<Key>")
+
+    def media(self, kind, on):
+        pass
+
+    def set_monitors(self, rects):
+        self.root.monitors = rects
+
+    def lock(self, locked):
+        pass
+
+    def saver_exit(self):
+        pass
+
+    def active(self):
+        return self.saver.screensaver_active
+
+    def covered(self):
+        # One fullscreen Tk window, on the primary monitor.
+        return 1 if self.saver.screensaver_active else 0
+
+    def stats(self):
+        return {"wakeups": self.root.callbacks, "probe_calls": {"idle": self.root.callbacks}}
+
+
+DRIVERS = {"scr": ScrDriver, "activate": ActivateDriver, "tk": TkDriver}
+
+
+# ------------------------------------------------------------
+# SIMULATION
+# ------------------------------------------------------------
+
+def simulate(engine, trace, timeout_s=300.0, verbose=False):
+    """Run ``trace`` through one engine; return its SimResult dict."""
+    vc = VirtualClock()
+    config = Config(timeout_ms=int(timeout_s * 1000), metrics_port=0, journal_dir=None,
+                    effect="blank", lock_on_activate=False)
+    activations, dismissals = [], []
+    monitors = [list(trace.monitors)]
+    out = io.StringIO()
+
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(out))
+        started = time.perf_counter()
+        driver = DRIVERS[engine](vc, config, trace.monitors)
+        multi_monitor = MONITORS in driver.models
+        was_active = [False]
+
+        def observe():
+            active = driver.active()
+            if active and not was_active[0]:
+                wanted = len(monitors[0]) if multi_monitor else 1
+                activations.append((vc.now, driver.covered(), wanted))
+            elif was_active[0] and not active:
+                dismissals.append(vc.now)
+            was_active[0] = active
+
+        def deliver(kind, value):
+            def run():
+                if kind == INPUT:
+                    driver.input(value)
+                elif kind in (AUDIO, FULLSCREEN):
+                    driver.media(kind, bool(value))
+                elif kind == MONITORS:
+                    monitors[0] = value
+                    driver.set_monitors(value)
+                elif kind in (LOCK, UNLOCK):
+                    driver.lock(kind == LOCK)
+                elif kind == SAVER_EXIT:
+                    driver.saver_exit()
+                driver.after_event()
+            return run
+
+        for t, kind, value in trace.events:
+            vc.call_at(t, deliver(kind, value), priority=0)
+        observe()
+        vc.run_until(trace.duration_s, observe)
+        wall_s = time.perf_counter() - started
+
+    return score(engine, trace, timeout_s, activations, dismissals, driver.stats(), wall_s,
+                 driver.models)
+
+
+def match(expected, activations, match_s=60.0):
+    """(delays of matched activations, unwanted count)."""
+    late, unwanted, remaining = [], 0, list(expected)
+    for t, _, _ in activations:
+        # Match against the earliest ideal activation not yet taken.
+        while remaining and remaining[0] < t - match_s:
+            remaining.pop(0)
+        if remaining and remaining[0] - 1.0 <= t <= remaining[0] + match_s:
+            late.append(t - remaining.pop(0))
+        else:
+            unwanted += 1
+    return late, unwanted
+
+
+def score(engine, trace, timeout_s, activations, dismissals, stats, wall_s, models=KINDS):
+    """Scored against the ideal for what the engine models; ``ideal_*`` against the full ideal."""
+    expected = expected_activations(trace, timeout_s, models)
+    late, unwanted = match(expected, activations)
+    ideal = expected_activations(trace, timeout_s)
+    ideal_late, ideal_unwanted = match(ideal, activations)
+    causes = [t for t, kind, _ in trace.events if kind in (INPUT, LOCK, SAVER_EXIT)]
+    dismiss = []
+    for t in dismissals:
+        before = [c for c in causes if c <= t]
+        if before:
+            dismiss.append(t - before[-1])
+    days = trace.duration_s / DAY_S
+    return {
+        "engine": engine,
+        "expected": len(expected),
+        "activations": len(activations),
+        "missed": len(expected) - len(late),
+        "unwanted": unwanted,
+        "ideal_expected": len(ideal),
+        "ideal_missed": len(ideal) - len(ideal_late),
+        "ideal_unwanted": ideal_unwanted,
+        "late_mean_s": sum(late) / len(late) if late else 0.0,
+        "late_max_s": max(late) if late else 0.0,
+        "dismiss_max_s": max(dismiss) if dismiss else 0.0,
+        "uncovered": sum(1 for _, covered, wanted in activations if covered < wanted),
+        "wakeups_per_day": stats["wakeups"] / days if days else stats["wakeups"],
+        "probe_calls": stats["probe_calls"],
+        "probe_calls_per_day": {name: n / days if days else n for name, n in stats["probe_calls"].items()},
+        "activation_times": [t for t, _, _ in activations],
+        "dismissal_times": dismissals,
+        "wall_s": wall_s,
+    }
+
+
+def check(result, max_late_s, max_dismiss_s, max_wakeups=None, max_probe_calls=None):
+    """Problems with ``result`` (empty if it meets the limits).
+
+    ``max_wakeups`` and ``max_probe_calls`` (probe -> calls) are per day.
+    """
+    problems = []
+    if result["missed"]:
+        problems.append(f"{result['missed']} missed activation(s)")
+    if result["unwanted"]:
+        problems.append(f"{result['unwanted']} unwanted activation(s)")
+    if result["late_max_s"] > max_late_s:
+        problems.append(f"activation up to {result['late_max_s']:.1f}s late (limit {max_late_s:g}s)")
+    if result["dismiss_max_s"] > max_dismiss_s:
+        problems.append(f"dismissal took {result['dismiss_max_s']:.1f}s (limit {max_dismiss_s:g}s)")
+    if result["uncovered"]:
+        problems.append(f"{result['uncovered']} activation(s) left a monitor uncovered")
+    if max_wakeups is not None and result["wakeups_per_day"] > max_wakeups:
+        problems.append(f"{result['wakeups_per_day']:.0f} wakeups/day (limit {max_wakeups:g})")
+    for name, limit in sorted((max_probe_calls or {}).items()):
+        calls = result["probe_calls_per_day"].get(name, 0)
+        if calls > limit:
+            problems.append(f"{calls:.0f} {name} probe calls/day (limit {limit:g})")
+    return problems
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", default="all", choices=sorted(DRIVERS) + ["all"])
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout-min", type=float, default=5)
+    parser.add_argument("--trace", help="JSON trace to replay instead of the office days")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if an engine misses, adds or delays activations")
+    parser.add_argument("--max-late", type=float, default=15.0, help="seconds, for --check")
+    parser.add_argument("--max-dismiss", type=float, default=1.0, help="seconds, for --check")
+    parser.add_argument("--max-wakeups", type=float,
+                        help="wakeups per day, for --check (default: each engine's own budget)")
+    parser.add_argument("--max-probe-calls", type=float,
+                        help="calls per day of any one probe, for --check (default: each engine's own budgets)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the engines' own output")
+    args = parser.parse_args(argv)
+
+    trace = Trace.load(args.trace) if args.trace else office_days(args.days, args.seed)
+    engines = list(DRIVERS) if args.engine == "all" else [args.engine]
+    results = [simulate(name, trace, args.timeout_min * 60, args.verbose) for name in engines]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{trace.count(INPUT)} inputs over {trace.duration_s / 3600:.1f}h, "
+              f"timeout {args.timeout_min:g} min, {results[0]['ideal_expected']} ideal activation(s)")
+        for r in results:
+            calls = ", ".join(f"{name}={n}" for name, n in sorted(r["probe_calls"].items()))
+            ideal = "" if DRIVERS[r["engine"]].models == KINDS else (
+                f"  [vs ideal: missed={r['ideal_missed']} unwanted={r['ideal_unwanted']}]")
+            print(f"{r['engine']:9s} activations={r['activations']:3d} missed={r['missed']} "
+                  f"unwanted={r['unwanted']} late mean/max={r['late_mean_s']:5.1f}/{r['late_max_s']:5.1f}s "
+                  f"dismiss max={r['dismiss_max_s']:.2f}s uncovered={r['uncovered']} "
+                  f"wakeups/day={r['wakeups_per_day']:7.0f} probes: {calls}  ({r['wall_s']:.2f}s)" + ideal)
+
+    if not args.check:
+        return 0
+    failed = False
+    for r in results:
+        driver = DRIVERS[r["engine"]]
+        max_wakeups = driver.max_wakeups if args.max_wakeups is None else args.max_wakeups
+        max_calls = driver.max_probe_calls if args.max_probe_calls is None else {
+            name: args.max_probe_calls for name in r["probe_calls"]}
+        for problem in check(r, args.max_late, args.max_dismiss, max_wakeups, max_calls):
+            print(f"❌ {r['engine']}: {problem}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import os
+import re
+import gzip
+import json
+import time
+import uuid
+import random
+import socket
+import threading
+import http.client
+from collections import deque
+from urllib.parse import urlsplit
+
+
+SPOOL_RE = re.compile(r"^batch-(\d{12})-(\d+)\.json\.gz$")
+
+
+class TelemetryRejected(RuntimeError):
+    """The collector refused a batch for good (4xx); retrying would not help."""
+
+
+# ------------------------------------------------------------
+# HTTP SENDER
+# ------------------------------------------------------------
+
+class HttpSender:
+    """POSTs compressed batches over one kept-alive HTTP(S) connection.
+
+    The connection is opened on first use and reused for every batch; it
+    is dropped and reopened only after an error.  ``send`` returns on a
+    2xx answer, raises TelemetryRejected for a permanent refusal and
+    OSError / HTTPException for anything worth retrying.
+    """
+
+    def __init__(self, url, timeout_s=10.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"telemetry URL must be http(s), got {url!r}")
+        self.url = url
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.timeout_s = timeout_s
+        self.connects = 0
+        self._conn = None
+
+    def send(self, body):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self._conn = cls(self.host, self.port, timeout=self.timeout_s)
+            self.connects += 1
+        try:
+            self._conn.request("POST", self.path, body, {
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            })
+            response = self._conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        if 200 <= response.status < 300:
+            return
+        # Overload and timeouts are worth another try, the rest is not.
+        if 400 <= response.status < 500 and response.status not in (408, 429):
+            raise TelemetryRejected(f"collector answered {response.status} {response.reason}")
+        raise http.client.HTTPException(f"collector answered {response.status} {response.reason}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ------------------------------------------------------------
+# AGENT
+# ------------------------------------------------------------
+
+class TelemetryAgent:
+    """Buffers daemon events locally and ships them in compressed batches.
+
+    ``record()`` is all the daemon's threads ever call: it appends a tuple
+    to an in-memory queue and, once ``batch_size`` events are waiting,
+    wakes the sender thread.  The sender otherwise sleeps ``flush_s``
+    between uploads.  Each batch carries the events, a snapshot of
+    ``counters()`` (e.g. ``Registry.snapshot``) and a (session, seq) pair
+    the collector dedupes retries on; it is gzipped JSON POSTed through
+    one HttpSender.
+
+    When an upload fails the sender backs off exponentially (with
+    jitter, up to ``backoff_max_s``) and writes pending batches to
+    ``spool_dir`` instead, so being offline loses nothing.  Spooled
+    batches, including those left by an earlier run, go out oldest first
+    once the collector answers again.  Two bounds keep a long outage from
+    growing without limit: ``queue_max`` events in memory (beyond that
+    ``record`` drops and counts) and ``spool_max_mb`` on disk (the oldest
+    batches are deleted).
+    """
+
+    def __init__(self, url, spool_dir="telemetry-spool", machine=None, counters=None,
+                 batch_size=500, flush_s=30.0, queue_max=50000, spool_max_mb=16.0,
+                 backoff_s=1.0, backoff_max_s=300.0, sender=None, clock=time.time):
+        self.sender = sender or HttpSender(url)
+        self.spool_dir = spool_dir
+        self.machine = machine or socket.gethostname()
+        self.session = uuid.uuid4().hex
+        self.counters = counters
+        self.batch_size = batch_size
+        self.flush_s = flush_s
+        self.queue_max = queue_max
+        self.spool_max_bytes = int(spool_max_mb * 2**20)
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.clock = clock
+
+        self.recorded = 0
+        self.dropped = 0
+        self.sent_events = 0
+        self.sent_batches = 0
+        self.sent_bytes = 0
+        self.failures = 0
+
+        self._queue = deque()
+        self._seq = 0
+        self._failed = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        os.makedirs(spool_dir, exist_ok=True)
+        spooled = self._spooled()
+        if spooled:
+            self._seq = int(SPOOL_RE.match(spooled[-1]).group(1))
+
+    # --------------------------------------------------------
+
+    def record(self, kind, **fields):
+        """Queue one event; never blocks and never does I/O."""
+        queue = self._queue
+        if len(queue) >= self.queue_max:
+            self.dropped += 1
+            return
+        queue.append((self.clock(), kind, fields))
+        self.recorded += 1
+        if len(queue) >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout_s=5.0):
+        """Upload what is queued (or spool it) and stop the sender."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+        self.sender.close()
+
+    def pending(self):
+        """(events queued in memory, batches spooled on disk)."""
+        return len(self._queue), len(self._spooled())
+
+    def flush(self):
+        """Upload now, from the calling thread; True if nothing is left pending."""
+        self._pump(force=True)
+        return not self._queue and not self._spooled()
+
+    # --------------------------------------------------------
+
+    def _run(self):
+        while not self._stopping:
+            # Backing off: look again at the retry time, not a flush later.
+            retry_in = self._retry_at - self.clock()
+            self._wake.wait(retry_in if self._failed and retry_in > 0 else self.flush_s)
+            self._wake.clear()
+            try:
+                self._pump()
+            except Exception as e:
+                print(f"⚠️ Telemetry upload failed: {e}")
+        self._pump(force=True)
+
+    def _pump(self, force=False):
+        with self._lock:
+            online = force or not self._failed or self.clock() >= self._retry_at
+            if online:
+                online = self._drain_spool()
+            while self._queue:
+                body, count = self._batch()
+                if online and self._post(body, count):
+                    continue
+                online = False
+                self._spool(body, count)
+
+    def _batch(self):
+        queue, events = self._queue, []
+        for _ in range(min(len(queue), self.batch_size)):
+            events.append(queue.popleft())
+        self._seq += 1
+        batch = {
+            "machine": self.machine,
+            "session": self.session,
+            "seq": self._seq,
+            "sent_at": self.clock(),
+            "counters": self.counters() if self.counters is not None else None,
+            "events": events,
+        }
+        body = json.dumps(batch, separators=(",", ":")).encode("utf-8")
+        return gzip.compress(body, compresslevel=6, mtime=0), len(events)
+
+    def _post(self, body, count):
+        """Upload one batch; False (and back off) if it has to wait."""
+        try:
+            self.sender.send(body)
+        except TelemetryRejected as e:
+            print(f"⚠️ Telemetry batch of {count} event(s) discarded: {e}")
+            return True
+        except (OSError, http.client.HTTPException) as e:
+            self.failures += 1
+            self._failed += 1
+            delay = min(self.backoff_max_s, self.backoff_s * 2 ** (self._failed - 1))
+            self._retry_at = self.clock() + delay * random.uniform(0.5, 1.0)
+            if self._failed == 1:
+                print(f"⚠️ Telemetry collector unreachable ({e}); spooling to {self.spool_dir}")
+            return False
+        self._failed = 0
+        self.sent_events += count
+        self.sent_batches += 1
+        self.sent_bytes += len(body)
+        return True
+
+    # --------------------------------------------------------
+    # DISK SPOOL
+    # --------------------------------------------------------
+
+    def _spooled(self):
+        try:
+            return sorted(name for name in os.listdir(self.spool_dir) if SPOOL_RE.match(name))
+        except FileNotFoundError:
+            return []
+
+    def _spool(self, body, count):
+        path = os.path.join(self.spool_dir, f"batch-{self._seq:012d}-{count}.json.gz")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        self._trim_spool()
+
+    def _trim_spool(self):
+        names = self._spooled()
+        sizes = [os.path.getsize(os.path.join(self.spool_dir, name)) for name in names]
+        total = sum(sizes)
+        for name, size in zip(names, sizes):
+            if total <= self.spool_max_bytes:
+                break
+            os.remove(os.path.join(self.spool_dir, name))
+            total -= size
+            self.dropped += int(SPOOL_RE.match(name).group(2))
+            print(f"⚠️ Telemetry spool over {self.spool_max_bytes // 2**20} MiB; dropped {name}")
+
+    def _drain_spool(self):
+        """Upload spooled batches oldest first; False if the collector is still away."""
+        for name in self._spooled():
+            path = os.path.join(self.spool_dir, name)
+            try:
+                with open(path, "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                continue
+            if not self._post(body, int(SPOOL_RE.match(name).group(2))):
+                return False
+            os.remove(path)
+        return True
@@ -0,0 +1,169 @@
+"""Local stand-in for the fleet telemetry backend.
+
+    python telemetry_collector.py [--port 9465] [--host 127.0.0.1] [--out events.jsonl]
+
+Accepts the gzipped JSON batches TelemetryAgent POSTs, drops retried
+duplicates (same session and seq) and appends every event, tagged with
+its machine, to ``--out`` as JSON lines.  ``GET /stats`` answers with
+the running totals.  Good enough to point a few daemons at while
+testing; in memory it keeps only totals, the batch ids it has seen and
+the latest counters from each machine.
+"""
+import sys
+import gzip
+import json
+import socket
+import argparse
+import threading
+
+
+class TelemetryCollector:
+    """HTTP server for agent batches, run from a daemon thread.
+
+    ``fail_rate`` answers that fraction of uploads with 503, and
+    ``available = False`` all of them, to exercise the agent's backoff
+    and spool without taking the server down.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, out=None, fail_rate=0.0):
+        self.host = host
+        self.port = port
+        self.out = out
+        self.fail_rate = fail_rate
+        self.available = True
+        self.batches = 0
+        self.events = 0
+        self.duplicates = 0
+        self.bytes = 0
+        self.machines = {}
+        self.counters = {}
+
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._server = None
+        self._connections = set()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/ingest"
+
+    def stats(self):
+        return {"batches": self.batches, "events": self.events, "duplicates": self.duplicates,
+                "bytes": self.bytes, "machines": dict(self.machines)}
+
+    def start(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import random
+
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so an agent's batches share one connection; headers
+            # and body go out in two writes, which Nagle would hold back.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                collector._connections.add(self.connection)
+
+            def finish(self):
+                collector._connections.discard(self.connection)
+                super().finish()
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.rstrip("/") != "/ingest":
+                    return self.answer(404, {"error": "not found"})
+                if not collector.available or random.random() < collector.fail_rate:
+                    return self.answer(503, {"error": "unavailable"})
+                size = len(body)
+                try:
+                    if self.headers.get("Content-Encoding") == "gzip":
+                        body = gzip.decompress(body)
+                    batch = json.loads(body)
+                    collector.ingest(batch, size)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    return self.answer(400, {"error": str(e)})
+                self.answer(200, {"ok": True})
+
+            def do_GET(self):
+                if self.path.rstrip("/") != "/stats":
+                    return self.answer(404, {"error": "not found"})
+                self.answer(200, collector.stats())
+
+            def answer(self, status, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        if self.out:
+            self._file = open(self.out, "a", encoding="utf-8")
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        # Kept-alive connections would otherwise go on being served.
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def ingest(self, batch, size):
+        machine, events = batch["machine"], batch["events"]
+        key = (batch["session"], batch["seq"])
+        with self._lock:
+            if key in self._seen:
+                self.duplicates += 1
+                return
+            self._seen.add(key)
+            self.batches += 1
+            self.events += len(events)
+            self.bytes += size
+            self.machines[machine] = self.machines.get(machine, 0) + len(events)
+            if batch.get("counters") is not None:
+                self.counters[machine] = batch["counters"]
+            if self._file is not None:
+                for t, kind, fields in events:
+                    self._file.write(json.dumps({"machine": machine, "t": t, "kind": kind, **fields}) + "\n")
+                self._file.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9465)
+    parser.add_argument("--out", help="append received events here as JSON lines")
+    args = parser.parse_args(argv)
+
+    collector = TelemetryCollector(args.host, args.port, args.out).start()
+    print(f"Collecting on {collector.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    collector.stop()
+    print(json.dumps(collector.stats()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
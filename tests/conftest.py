@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+import pytest
+
+# The modules live flat in the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class VirtualTime:
+    """A clock that only moves when told to."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return VirtualTime()
+
+
+def wait_until(condition, timeout_s=5.0):
+    """Poll ``condition`` until it holds; for results produced on other threads."""
+    deadline = time.monotonic() + timeout_s
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
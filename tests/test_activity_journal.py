@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+import journal_query
+from activity_journal import ActivityJournal, iter_records, segments
+
+# (seconds since the previous record, state entered, reason, engine idle ms)
+DAY = [
+    (0, "ACTIVE", "input", 0),
+    (10, "IDLE_PENDING", "idle", 10000),
+    (290, "SAVER_RUNNING", "timeout", 300000),
+    (20, "DISMISSED", "saver exit", 0),         # idle period of 320 s
+    (0, "ACTIVE", "dismissed", 0),
+    (80, "IDLE_PENDING", "idle", 5000),
+    (50, "ACTIVE", "input", 0),                  # idle period of 55 s
+    (50, "IDLE_PENDING", "idle", 2000),
+    (100, "LOCKED", "session locked", 100000),   # not counted
+    (60, "ACTIVE", "session unlocked", 0),
+    (10, "ACTIVE", "audio", 0),                  # audio held the saver off for 40 s
+    (40, "IDLE_PENDING", "idle", 2000),
+]
+
+
+def write_day(journal, clock):
+    for delay, event, reason, idle_ms in DAY:
+        clock.advance(delay)
+        journal.append(event, reason, idle_ms)
+
+
+def test_records_read_back_in_order(tmp_path, clock):
+    journal = ActivityJournal(str(tmp_path), clock=clock)
+    journal.append("IDLE_PENDING", "idle", 2500)
+    clock.advance(1.5)
+    journal.append("SAVER_RUNNING", "a custom reason", 60000)
+    journal.close()
+    assert list(iter_records(segments(str(tmp_path)))) == [
+        (0.0, 2500, "IDLE_PENDING", "idle"),
+        (1.5, 60000, "SAVER_RUNNING", "other"),
+    ]
+
+
+def test_a_reopened_journal_appends_to_the_latest_segment(tmp_path, clock):
+    ActivityJournal(str(tmp_path), clock=clock).append("ACTIVE", "input")
+    journal = ActivityJournal(str(tmp_path), clock=clock)
+    journal.append("IDLE_PENDING", "idle")
+    journal.close()
+    assert len(segments(str(tmp_path))) == 1
+    assert [r[2] for r in iter_records(segments(str(tmp_path)))] == ["ACTIVE", "IDLE_PENDING"]
+
+
+def test_segments_rotate_and_the_oldest_are_dropped(tmp_path, clock):
+    journal = ActivityJournal(str(tmp_path), segment_records=4, max_segments=2, clock=clock)
+    for i in range(10):
+        journal.append("ACTIVE", "input", i)
+    journal.close()
+    assert len(segments(str(tmp_path))) == 2
+    assert [r[1] for r in iter_records(segments(str(tmp_path)))] == [4, 5, 6, 7, 8, 9]
+
+
+def test_a_corrupt_segment_is_left_behind(tmp_path, clock):
+    (tmp_path / "activity-00000001.ssj").write_bytes(b"garbage")
+    journal = ActivityJournal(str(tmp_path), clock=clock)
+    journal.append("ACTIVE", "input")
+    journal.close()
+    assert [os.path.basename(p) for p in segments(str(tmp_path))] == [
+        "activity-00000001.ssj", "activity-00000002.ssj"]
+
+
+@pytest.mark.parametrize("segment_records", [65536, 3])
+def test_summary_finds_idle_periods_and_suppressions(tmp_path, clock, segment_records):
+    journal = ActivityJournal(str(tmp_path), segment_records=segment_records, clock=clock)
+    write_day(journal, clock)
+    journal.close()
+
+    summary = journal_query.summarize(str(tmp_path))
+    assert summary.records == len(DAY)
+    assert summary.idle.nonzero()[0].tolist() == [55, 320]
+    assert summary.activations() == {"timeout": 1}
+    assert summary.suppressed == {"audio": 1}
+    assert summary.suppressed_s == {"audio": 40.0}
+    assert summary.what_if(30) == (2, 0)
+    assert summary.what_if(315) == (1, 1)
+    assert summary.what_if(600) == (0, 0)
+
+
+def test_summaries_from_several_machines_merge(tmp_path, clock, capsys):
+    journal = ActivityJournal(str(tmp_path), clock=clock)
+    write_day(journal, clock)
+    journal.close()
+    assert journal_query.main([str(tmp_path), "--json"]) == 0
+    summary_file = tmp_path / "summary.json"
+    summary_file.write_text(capsys.readouterr().out)
+
+    assert journal_query.main(["--merge", str(summary_file), str(summary_file), "--json"]) == 0
+    merged = json.loads(capsys.readouterr().out)
+    assert merged["records"] == 2 * len(DAY)
+    assert merged["idle_seconds"] == {"55": 2, "320": 2}
+    assert merged["span_s"] == 2 * sum(delay for delay, *_ in DAY)
@@ -0,0 +1,9 @@
+import bench_alloc
+
+
+def test_probe_ticks_do_not_grow_memory():
+    for name, fn in bench_alloc.cases():
+        if not bench_alloc.gated(name):
+            continue
+        grown, _, _ = bench_alloc.measure(fn, bench_alloc.ITERATIONS)
+        assert grown <= bench_alloc.MAX_GROWTH, f"{name} grew {grown:.3f} bytes per iteration"
@@ -0,0 +1,62 @@
+import time
+
+from audio_sampler import AudioSampler, RecordedAudioBackend
+from conftest import wait_until
+
+
+class FlakyBackend(RecordedAudioBackend):
+    """Recorded audio whose peak meter can be broken on demand."""
+
+    broken = False
+
+    def peak(self, handle):
+        if self.broken:
+            raise OSError("audio endpoint went away")
+        return super().peak(handle)
+
+
+def test_backend_error_turns_the_verdict_off_and_sampling_recovers(clock):
+    backend = FlakyBackend({"player": [0.5] * 10})
+    sampler = AudioSampler(backend, clock=clock)
+    for _ in range(2):
+        clock.advance(0.25)
+        sampler.sample_once()
+    assert sampler.active
+
+    backend.broken = True
+    clock.advance(0.25)
+    assert sampler.sample_once() is False
+    assert not sampler.active
+    assert sampler.errors == 1
+
+    backend.broken = False
+    for _ in range(2):
+        clock.advance(0.25)
+        sampler.sample_once()
+    assert sampler.active
+
+
+def test_sampler_thread_survives_backend_errors():
+    backend = FlakyBackend({"player": [0.5] * 1000})
+    backend.broken = True
+    sampler = AudioSampler(backend, interval_s=0.01, idle_interval_s=0.01).start()
+    try:
+        assert wait_until(lambda: sampler.errors >= 3)
+        assert not sampler.active
+        backend.broken = False
+        assert wait_until(lambda: sampler.active)
+    finally:
+        sampler.stop()
+
+
+def test_blocks_on_notifications_while_nothing_plays():
+    backend = RecordedAudioBackend({})
+    sampler = AudioSampler(backend, interval_s=0.01, idle_interval_s=0.01).start()
+    try:
+        assert wait_until(lambda: sampler.samples == 1)
+        time.sleep(0.1)
+        assert sampler.samples == 1
+        backend.add_session("player", [0.5] * 1000)
+        assert wait_until(lambda: sampler.active)
+    finally:
+        sampler.stop()
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from daemon_config import Config, ConfigError, ConfigWatcher, load_config, parse_config
+
+
+def test_timeout_is_read_in_minutes():
+    assert parse_config({"timeout": 5}).timeout_ms == 300000
+
+
+def test_legacy_millisecond_timeout_is_understood():
+    assert parse_config({"timeout": 90000}).timeout_ms == 90000
+
+
+def test_timeout_ms_takes_precedence_over_timeout():
+    # Why config_editor drops timeout_ms when it saves a new timeout.
+    assert parse_config({"timeout": 5, "timeout_ms": 1000}).timeout_ms == 1000
+
+
+@pytest.mark.parametrize("raw", [
+    {"metrics_port": "9464"},
+    {"metrics_port": 70000},
+    {"metrics_port": -1},
+    {"metrics_port": True},
+    {"metrics_file": 3},
+    {"metrics_file": ""},
+    {"metrics_flush_s": 0},
+    {"metrics_flush_s": "60"},
+    {"timeout": "5"},
+    {"effect": "fireworks"},
+])
+def test_invalid_values_raise_config_error(raw):
+    with pytest.raises(ConfigError):
+        parse_config(raw)
+
+
+def test_null_metrics_port_disables_metrics():
+    assert parse_config({"metrics_port": None}).metrics_port == 0
+
+
+def test_metrics_settings_are_applied():
+    config = parse_config({"metrics_port": 8000, "metrics_file": "m.prom", "metrics_flush_s": 5})
+    assert (config.metrics_port, config.metrics_file, config.metrics_flush_s) == (8000, "m.prom", 5.0)
+
+
+def test_unusable_file_falls_back_to_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{not json")
+    assert load_config(str(path)) == Config()
+
+
+def test_watcher_keeps_the_previous_config_on_an_invalid_edit(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"timeout": 2}))
+    seen = []
+    watcher = ConfigWatcher(str(path), seen.append)
+
+    path.write_text(json.dumps({"timeout": 3, "metrics_port": "nope"}))
+    assert watcher.check() is False
+    assert watcher.current.timeout_ms == 120000
+
+    path.write_text(json.dumps({"timeout": 3}))
+    assert watcher.check() is True
+    assert [c.timeout_ms for c in seen] == [180000]
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+import daemon_control
+from daemon_control import AlreadyRunning, InstanceLock, single_instance
+
+
+def test_lock_file_is_per_user():
+    user = os.environ.get("USERNAME", "user") if os.name == "nt" else str(os.getuid())
+    assert os.path.basename(daemon_control.LOCK_FILE) == f"screensaver-daemon-{user}.lock"
+
+
+def test_second_instance_is_refused_with_the_owner_pid(tmp_path):
+    path = str(tmp_path / "daemon.lock")
+    lock = InstanceLock(path).acquire()
+    try:
+        with pytest.raises(AlreadyRunning) as info:
+            InstanceLock(path).acquire()
+        assert info.value.pid == os.getpid()
+    finally:
+        lock.release()
+    InstanceLock(path).acquire().release()
+
+
+def test_single_instance_exits_when_the_lock_cannot_be_opened(tmp_path, capsys):
+    with pytest.raises(SystemExit) as info:
+        single_instance(str(tmp_path / "missing" / "daemon.lock"))
+    assert info.value.code == 1
+    assert "Cannot open the daemon lock" in capsys.readouterr().out
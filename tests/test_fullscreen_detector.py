@@ -0,0 +1,62 @@
+from fullscreen_detector import FakeWindowSource, FullscreenDetector, coverage_matrix
+
+LEFT = (0, 0, 1920, 1080)
+RIGHT = (1920, 0, 3840, 1080)
+MONITORS = [LEFT, RIGHT]
+
+
+def detector_for(windows, **kwargs):
+    source = FakeWindowSource(windows, **kwargs)
+    return source, FullscreenDetector(source, lambda: MONITORS)
+
+
+def test_coverage_matrix_allows_a_few_pixels_of_slack():
+    covers = coverage_matrix([(2, -3, 1918, 1080), (0, 0, 800, 600)], MONITORS)
+    assert covers.tolist() == [[True, False], [False, False]]
+    assert coverage_matrix([(0, 0, 1910, 1080)], [LEFT], tolerance=5).tolist() == [[False]]
+
+
+def test_no_fullscreen_window():
+    _, detector = detector_for([(1, (0, 0, 800, 600))])
+    assert detector.covered_monitors() == ()
+    assert not detector.is_fullscreen()
+
+
+def test_foreground_fullscreen_window_takes_the_fast_path():
+    source, detector = detector_for([(1, (0, 0, 800, 600)), (2, RIGHT)], foreground=2)
+    assert detector.covered_monitors() == (1,)
+    assert (detector.fast_hits, detector.sweeps) == (1, 0)
+
+
+def test_fullscreen_window_below_the_top_is_found_by_a_sweep():
+    windows = [(hwnd, (0, 0, 10, 10)) for hwnd in range(1, 10)] + [(99, LEFT)]
+    _, detector = detector_for(windows)
+    assert detector.covered_monitors() == (0,)
+    assert detector.sweeps == 1
+
+
+def test_sweeps_only_retest_windows_that_moved():
+    windows = [(hwnd, (0, 0, 10, 10)) for hwnd in range(1, 21)]
+    source, detector = detector_for(windows)
+    detector.covered_monitors()
+    retested = detector.retested
+
+    windows[15] = (16, RIGHT)
+    source.set_windows(windows)
+    assert detector.covered_monitors() == (1,)
+    assert detector.sweeps == 2
+    assert detector.retested - retested == 1
+
+
+def test_desktop_windows_are_not_fullscreen_apps():
+    _, detector = detector_for([(7, (0, 0, 3840, 1080))], foreground=7, desktop=[7])
+    assert detector.covered_monitors() == ()
+
+
+def test_monitor_change_resets_the_caches():
+    monitors = [LEFT]
+    source = FakeWindowSource([(1, RIGHT)], foreground=1)
+    detector = FullscreenDetector(source, lambda: monitors)
+    assert detector.covered_monitors() == ()
+    monitors = [LEFT, RIGHT]
+    assert detector.covered_monitors() == (1,)
@@ -0,0 +1,153 @@
+import pytest
+
+from idle_engine import (ACTIVE, DISMISSED, IDLE_PENDING, LOCKED, SAVER_RUNNING,
+                         FakeIdleSource, IdleEngine)
+
+
+@pytest.fixture
+def idle(clock):
+    return FakeIdleSource(clock)
+
+
+@pytest.fixture
+def activations():
+    return []
+
+
+@pytest.fixture
+def engine(clock, idle, activations):
+    return IdleEngine(60000, idle, lambda: activations.append(clock()), clock=clock)
+
+
+def test_sleeps_until_the_deadline(clock, engine):
+    assert engine.step() == 60.0
+    assert engine.state == ACTIVE
+    clock.advance(30)
+    assert engine.step() == 30.0
+    assert engine.state == IDLE_PENDING
+
+
+def test_activates_once_at_the_deadline(clock, engine, activations):
+    clock.advance(60)
+    assert engine.step() is None
+    assert engine.state == SAVER_RUNNING
+    assert activations == [60]
+    clock.advance(600)
+    assert engine.step() is None
+    assert activations == [60]
+
+
+def test_input_pushes_the_deadline_back(clock, idle, engine, activations):
+    clock.advance(50)
+    idle.input()
+    clock.advance(10)
+    assert engine.step() == 50.0
+    assert activations == []
+
+
+def test_saver_exit_dismisses_and_starts_a_fresh_idle_period(clock, engine):
+    clock.advance(60)
+    engine.step()
+    clock.advance(5)
+    engine.notify_saver_exited()
+    assert engine.state == DISMISSED
+    # Idle time counts from the dismissal, not from the last real input.
+    assert engine.step() == 60.0
+    assert engine.state == ACTIVE
+
+
+def test_register_activity_leaves_idle_pending(clock, engine):
+    clock.advance(30)
+    engine.step()
+    engine.register_activity("inhibitor")
+    assert engine.state == ACTIVE
+    assert engine.step() == 60.0
+
+
+def test_locked_session_parks_the_engine(clock, engine, activations):
+    engine.set_session_locked(True)
+    clock.advance(600)
+    assert engine.step() is None
+    assert engine.state == LOCKED
+    engine.set_session_locked(False)
+    assert engine.state == ACTIVE
+    assert engine.step() == 60.0
+    assert activations == []
+
+
+def test_media_holds_off_activation_until_it_stops(clock, idle, activations):
+    playing = [True]
+    engine = IdleEngine(60000, idle, lambda: activations.append(clock()), clock=clock,
+                        media_probe=lambda: playing[0], media_poll_s=10.0)
+    clock.advance(60)
+    assert engine.step() == 10.0
+    assert engine.state == ACTIVE
+    clock.advance(10)
+    playing[0] = False
+    # The timeout starts from the first probe that saw media stopped.
+    assert engine.step() == 60.0
+    clock.advance(60)
+    engine.step()
+    assert activations == [130]
+
+
+def test_failed_activation_retries_after_a_full_timeout(clock, idle):
+    def activate():
+        raise OSError("no saver")
+
+    engine = IdleEngine(60000, idle, activate, clock=clock)
+    clock.advance(60)
+    assert engine.step() == 60.0
+    assert engine.state == ACTIVE
+
+
+def test_pause_and_resume(clock, engine, activations):
+    engine.pause(120)
+    clock.advance(90)
+    assert engine.step() == 30.0
+    engine.resume()
+    assert engine.step() == 60.0
+    assert activations == []
+
+
+def test_listeners_see_every_transition(clock, engine):
+    seen = []
+    engine.add_listener(lambda old, new, reason: seen.append((old, new, reason)))
+    clock.advance(30)
+    engine.step()
+    clock.advance(30)
+    engine.step()
+    engine.notify_saver_exited()
+    engine.step()
+    assert seen == [
+        (ACTIVE, IDLE_PENDING, "idle"),
+        (IDLE_PENDING, SAVER_RUNNING, "timeout"),
+        (SAVER_RUNNING, DISMISSED, "saver exit"),
+        (DISMISSED, ACTIVE, "dismissed"),
+    ]
+
+
+def test_warm_standby_prepares_before_the_deadline_and_cancels_on_input(clock, idle):
+    calls = []
+    engine = IdleEngine(60000, idle, lambda: calls.append("activate"), clock=clock,
+                        prepare=lambda: calls.append("prepare"),
+                        cancel_prepare=lambda: calls.append("cancel"), prepare_lead_s=5.0)
+    assert engine.step() == 55.0
+    clock.advance(55)
+    assert engine.step() == 5.0
+    idle.input()
+    engine.step()
+    assert calls == ["prepare", "cancel"]
+
+
+def test_failing_media_probe_counts_as_no_media(clock, idle, activations):
+    def probe():
+        raise OSError("probe backend gone")
+
+    engine = IdleEngine(60000, idle, lambda: activations.append(clock()), clock=clock,
+                        media_probe=probe)
+    clock.advance(30)
+    assert engine.step() == 30.0
+    clock.advance(30)
+    assert engine.step() is None
+    assert activations == [60]
@@ -0,0 +1,58 @@
+import os
+
+from idle_engine import FakeIdleSource, IdleEngine
+from inhibitors import InhibitorRegistry, pid_alive
+
+
+def test_lock_is_held_until_released(clock):
+    changes = []
+    registry = InhibitorRegistry(clock=clock, on_change=lambda: changes.append(1))
+    token = registry.acquire("presentation", "slides")
+    assert registry.held()
+    assert registry.release(token) is True
+    assert registry.release(token) is False
+    assert not registry.held()
+    assert len(changes) == 2
+
+
+def test_locks_expire(clock):
+    registry = InhibitorRegistry(clock=clock)
+    registry.acquire("video", duration_s=30)
+    registry.acquire("call", duration_s=90)
+    clock.advance(20)
+    assert registry.next_expiry() == 10
+    clock.advance(10)
+    assert [lock.name for lock in registry.active()] == ["call"]
+    clock.advance(60)
+    assert not registry.held()
+    assert registry.next_expiry() is None
+
+
+def test_locks_of_dead_processes_are_dropped(clock):
+    alive = {100: True, 200: True}
+    registry = InhibitorRegistry(clock=clock, pid_alive=lambda pid: alive[pid])
+    registry.acquire("player", pid=100)
+    registry.acquire("browser", pid=200)
+    alive[100] = False
+    assert registry.cleanup() == 1
+    assert [lock.name for lock in registry.active()] == ["browser"]
+
+
+def test_pid_alive_on_this_platform():
+    assert pid_alive(os.getpid())
+
+
+def test_engine_holds_off_until_the_lock_expires(clock):
+    activations = []
+    registry = InhibitorRegistry(clock=clock)
+    engine = IdleEngine(60000, FakeIdleSource(clock), lambda: activations.append(clock()),
+                        clock=clock, inhibitors=registry)
+    registry.acquire("video", duration_s=100)
+    clock.advance(60)
+    assert engine.step() == 30.0
+    clock.advance(40)
+    # Idle time counts from the moment the lock went away.
+    assert engine.step() == 60.0
+    clock.advance(60)
+    engine.step()
+    assert activations == [160]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+from conftest import wait_until
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="evdev is Linux-only")
+
+from linux_input import EV_KEY, EV_SYN, EvdevIdleSource, has_activity, pack_event, replay  # noqa: E402
+
+EV_LED = 0x11
+
+
+def keypress(t):
+    return pack_event(EV_KEY, 30, 1, t) + pack_event(EV_SYN, 0, 0, t)
+
+
+def test_only_user_input_counts_as_activity():
+    assert has_activity(keypress(0.0))
+    assert not has_activity(pack_event(EV_LED, 0, 1) + pack_event(EV_SYN, 0, 0))
+
+
+@pytest.fixture
+def fifo_source(tmp_path, clock):
+    path = str(tmp_path / "event0")
+    os.mkfifo(path)
+    source = EvdevIdleSource([path], coalesce_s=0, clock=clock).start()
+    writer = os.open(path, os.O_WRONLY)
+    yield source, writer
+    os.close(writer)
+    source.stop()
+
+
+def test_replayed_input_resets_idle_and_reports_one_edge(fifo_source, clock):
+    source, writer = fifo_source
+    edges = []
+    source.watch(edges.append)
+    clock.advance(10)
+    assert source() == 10000
+
+    os.write(writer, pack_event(EV_LED, 0, 1) + pack_event(EV_SYN, 0, 0))
+    assert wait_until(lambda: source.wakeups >= 1)
+    assert source() == 10000
+
+    replay(keypress(0.0) + keypress(0.1), writer, speed=0)
+    assert wait_until(lambda: edges)
+    assert source() == 0
+    assert edges == ["event0"]
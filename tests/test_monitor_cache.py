@@ -0,0 +1,42 @@
+from monitor_cache import FakeMonitorBackend, Monitor, MonitorTopologyCache
+
+LEFT = (0, 0, 1920, 1080)
+RIGHT = (1920, 0, 3840, 1080)
+
+
+def test_topology_is_enumerated_once_until_it_changes():
+    backend = FakeMonitorBackend([LEFT])
+    cache = MonitorTopologyCache(backend)
+    assert cache.rects() == [LEFT]
+    assert cache.rects() == [LEFT]
+    assert backend.enumerate_calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_display_change_invalidates_the_snapshot():
+    backend = FakeMonitorBackend([LEFT])
+    cache = MonitorTopologyCache(backend)
+    cache.get()
+    backend.set_monitors([LEFT, RIGHT])
+    assert cache.rects() == [LEFT, RIGHT]
+    assert backend.enumerate_calls == 2
+
+
+def test_a_change_during_enumeration_is_not_cached():
+    class RacingBackend(FakeMonitorBackend):
+        def enumerate(self):
+            monitors = super().enumerate()
+            if self.enumerate_calls == 1:
+                self.set_monitors([LEFT, RIGHT])
+            return monitors
+
+    backend = RacingBackend([LEFT])
+    cache = MonitorTopologyCache(backend)
+    assert cache.rects() == [LEFT]
+    assert cache.rects() == [LEFT, RIGHT]
+
+
+def test_snapshot_is_immutable_monitor_tuples():
+    snapshot = MonitorTopologyCache(FakeMonitorBackend([LEFT])).get()
+    assert isinstance(snapshot, tuple)
+    assert snapshot == (Monitor(LEFT, LEFT, 96, False),)
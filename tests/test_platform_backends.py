@@ -0,0 +1,41 @@
+import sys
+
+import pytest
+
+from daemon_config import Config
+from idle_engine import FakeIdleSource
+from platform_backends import PlatformBackends
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux backends")
+
+
+def test_unknown_backends_are_rejected():
+    with pytest.raises(TypeError):
+        PlatformBackends(printer=object())
+
+
+def test_backends_are_built_on_first_use():
+    backends = PlatformBackends()
+    assert backends.loaded() == []
+    backends.monitors
+    assert backends.loaded() == ["monitors"]
+
+
+@linux_only
+@pytest.mark.parametrize("detect_audio", [True, False])
+def test_daemon_starts_with_the_default_backends(tmp_path, monkeypatch, detect_audio):
+    monkeypatch.chdir(tmp_path)
+    import screen_saver_scr as scr
+
+    # Input devices depend on the machine (a CI container has none); every
+    # other backend is the platform default.
+    monkeypatch.setattr(scr, "backends", PlatformBackends(idle=FakeIdleSource()))
+    config = Config(metrics_port=0, journal_dir=None, detect_audio=detect_audio)
+    saver = scr.Screensaver(config, run=False)
+    try:
+        assert saver.engine.step() > 0
+        assert scr.get_monitors() == []
+        assert not scr.is_fullscreen_active_any_monitor()
+        assert not scr.is_audio_playing()
+    finally:
+        saver.config_watcher.stop()
@@ -0,0 +1,83 @@
+import pytest
+
+from idle_engine import FakeIdleSource
+from probe_scheduler import ProbeScheduler
+
+
+class Counter:
+    def __init__(self, result=False):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def idle(clock):
+    return FakeIdleSource(clock)
+
+
+@pytest.fixture
+def scheduler(clock, idle):
+    # A timer that never moves keeps the declared costs in charge of the order.
+    return ProbeScheduler(idle, 60000, clock=clock, timer=lambda: 0.0)
+
+
+def test_nothing_runs_while_input_is_recent(clock, scheduler):
+    probe = Counter(True)
+    scheduler.add("audio", probe, cost_s=0.001, lead_s=5.0)
+    clock.advance(30)
+    assert scheduler.check() is False
+    assert probe.calls == 0
+    assert scheduler.stats()["audio"]["skips"]["not_idle"] == 1
+
+
+def test_cheapest_hit_short_circuits_the_rest(clock, scheduler):
+    expensive, cheap = Counter(True), Counter(True)
+    scheduler.add("audio", expensive, cost_s=0.01)
+    scheduler.add("fullscreen", cheap, cost_s=0.001)
+    clock.advance(60)
+    assert scheduler.check() is True
+    assert scheduler.last_hit == "fullscreen"
+    assert scheduler.runs() == {"audio": 0, "fullscreen": 1}
+    assert scheduler.stats()["audio"]["skips"]["short_circuit"] == 1
+
+
+def test_answers_are_cached_for_their_interval(clock, scheduler):
+    probe = Counter(False)
+    scheduler.add("audio", probe, cost_s=0.001, min_interval_s=10.0)
+    clock.advance(60)
+    scheduler.check()
+    clock.advance(5)
+    scheduler.check()
+    assert probe.calls == 1
+    clock.advance(5)
+    scheduler.check()
+    assert probe.calls == 2
+
+
+def test_measured_cost_reorders_probes(clock, idle):
+    now = [0.0]
+
+    def slow():
+        now[0] += 1.0
+        return False
+
+    fast = Counter(False)
+    scheduler = ProbeScheduler(idle, 60000, clock=clock, timer=lambda: now[0])
+    scheduler.add("slow", slow, cost_s=0.0)
+    scheduler.add("fast", fast, cost_s=0.01)
+    clock.advance(60)
+    scheduler.check()
+    assert [p.name for p in sorted(scheduler.probes, key=lambda p: p.cost_s)] == ["fast", "slow"]
+
+
+def test_disabled_probes_are_not_asked(clock, scheduler):
+    probe = Counter(True)
+    scheduler.add("audio", probe, cost_s=0.001)
+    scheduler.enable("audio", False)
+    clock.advance(60)
+    assert scheduler.check() is False
+    assert probe.calls == 0
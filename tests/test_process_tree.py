@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from conftest import wait_until
+from process_tree import group_members, spawn_tree
+from saver_supervisor import SaverSupervisor
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_grandchildren_left_behind_are_killed():
+    supervisor = SaverSupervisor()
+    done = threading.Event()
+    saver = spawn_tree(python(
+        "import subprocess, sys\n"
+        "grandchild = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(grandchild.pid, flush=True)\n"
+    ), stdout=subprocess.PIPE)
+    grandchild = int(saver.popen.stdout.readline())
+    saver.popen.stdout.close()
+    supervisor.watch([saver], done.set)
+
+    assert done.wait(10)
+    assert supervisor.leaked == 1
+    assert wait_until(lambda: grandchild not in group_members(saver.pgid))
+
+
+def test_terminate_all_reaches_the_whole_tree():
+    supervisor = SaverSupervisor()
+    saver = spawn_tree(python(
+        "import subprocess, sys, time\n"
+        "grandchild = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(grandchild.pid, flush=True)\n"
+        "time.sleep(60)\n"
+    ), stdout=subprocess.PIPE)
+    grandchild = int(saver.popen.stdout.readline())
+    saver.popen.stdout.close()
+    supervisor.watch([saver], lambda: None)
+
+    assert supervisor.terminate_all(grace_s=2.0) == 0
+    assert wait_until(lambda: grandchild not in group_members(saver.pgid))
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from saver_catalog import SaverCatalog, read_metadata
+
+
+def version_entry(key, value):
+    """One StringFileInfo String entry: header, key, padding to 32 bits, value."""
+    data = b"\0" * 6 + (key + "\0").encode("utf-16-le")
+    data += b"\0" * ((4 - len(data) % 4) % 4)
+    return data + (value + "\0").encode("utf-16-le")
+
+
+def fake_scr(path, description=None, version=None):
+    data = b"MZ" + b"\0" * 62
+    if description:
+        data += "VS_VERSION_INFO".encode("utf-16-le") + b"\0\0"
+        data += version_entry("FileDescription", description)
+        if version:
+            data += version_entry("FileVersion", version)
+    path.write_bytes(data)
+    return path
+
+
+def touch_dir(directory, step=[0]):
+    # Directory mtime drives rescans; make sure it moves on coarse filesystems.
+    step[0] += 1
+    st = os.stat(directory)
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + step[0] * 1_000_000_000))
+
+
+@pytest.fixture
+def savers(tmp_path):
+    directory = tmp_path / "System32"
+    directory.mkdir()
+    fake_scr(directory / "Mystify.scr", "Mystify Your Mind", "10.0.1")
+    fake_scr(directory / "Bubbles.scr")
+    (directory / "notes.txt").write_text("not a saver")
+    return directory
+
+
+def catalog_for(tmp_path, savers):
+    return SaverCatalog([str(savers)], index_path=str(tmp_path / "index.json"))
+
+
+def test_metadata_comes_from_the_version_resource(savers):
+    assert read_metadata(str(savers / "Mystify.scr")) == ("Mystify Your Mind", "10.0.1")
+    assert read_metadata(str(savers / "Bubbles.scr")) == (None, None)
+
+
+def test_refresh_indexes_only_scr_files(tmp_path, savers):
+    catalog = catalog_for(tmp_path, savers)
+    assert catalog.savers() == []
+    assert catalog.refresh() is True
+    assert catalog.names() == ["Bubbles.scr", "Mystify.scr"]
+    assert [s.display_name for s in catalog.savers()] == ["Bubbles", "Mystify Your Mind"]
+
+
+def test_index_is_answered_from_disk_by_the_next_run(tmp_path, savers):
+    catalog_for(tmp_path, savers).refresh()
+    catalog = catalog_for(tmp_path, savers)
+    assert catalog.names() == ["Bubbles.scr", "Mystify.scr"]
+    assert catalog.refresh() is False
+    assert catalog.files_scanned == 0
+
+
+def test_only_new_or_changed_files_are_rescanned(tmp_path, savers):
+    catalog = catalog_for(tmp_path, savers)
+    catalog.refresh()
+    fake_scr(savers / "Ribbons.scr")
+    touch_dir(savers)
+    assert catalog.refresh() is True
+    assert catalog.files_scanned == 3
+    assert "Ribbons.scr" in catalog.names()
+
+
+def test_find_is_case_insensitive_and_accepts_paths_outside_the_index(tmp_path, savers):
+    catalog = catalog_for(tmp_path, savers)
+    catalog.refresh()
+    assert catalog.find("mystify.SCR").display_name == "Mystify Your Mind"
+    assert catalog.find("Missing.scr") is None
+    elsewhere = fake_scr(tmp_path / "Custom.scr")
+    assert catalog.find(str(elsewhere)).name == "Custom.scr"
+
+
+def test_a_vanished_directory_drops_out_of_the_index(tmp_path, savers):
+    catalog = catalog_for(tmp_path, savers)
+    catalog.refresh()
+    for path in savers.iterdir():
+        path.unlink()
+    savers.rmdir()
+    assert catalog.refresh() is True
+    assert catalog.savers() == []
@@ -0,0 +1,44 @@
+from saver_launcher import FakeLauncher, FakeWindowMap, SaverLauncher
+
+RECTS = [(0, 0, 1920, 1080), (1920, 0, 3840, 1080)]
+
+
+def make_launcher(clock, delay_s=0.1):
+    window_map = FakeWindowMap(clock, delay_s=delay_s)
+    launcher = SaverLauncher(FakeLauncher(window_map), window_map,
+                             clock=clock, sleep=clock.advance)
+    return launcher, window_map
+
+
+def test_every_saver_is_placed_on_its_monitor(clock):
+    launcher, window_map = make_launcher(clock)
+    result = launcher.launch_all("Mystify.scr", RECTS)
+    assert not result.uncovered
+    assert sorted(window_map.placed.values()) == sorted(RECTS)
+    assert all(window_map.shown.values())
+
+
+def test_hidden_savers_are_found_and_stay_hidden(clock):
+    launcher, window_map = make_launcher(clock)
+    result = launcher.launch_all("Mystify.scr", RECTS, show=False)
+    assert not result.uncovered
+    assert not any(window_map.visible[hwnd] for hwnd in window_map.placed)
+
+    hwnd = next(iter(window_map.placed))
+    window_map.show(hwnd)
+    assert window_map.visible[hwnd]
+
+
+def test_hidden_windows_are_not_enumerated_by_default(clock):
+    window_map = FakeWindowMap(clock)
+    window_map.expect(7, hidden=True)
+    assert window_map.windows_by_pid([7]) == {}
+    assert window_map.windows_by_pid([7], hidden=True) == {7: [70]}
+
+
+def test_a_saver_without_a_window_is_reported_uncovered(clock):
+    window_map = FakeWindowMap(clock, delay_s=60.0)
+    launcher = SaverLauncher(FakeLauncher(window_map), window_map,
+                             clock=clock, sleep=clock.advance, timeout_s=1.0)
+    result = launcher.launch_all("Mystify.scr", RECTS[:1])
+    assert result.uncovered == RECTS[:1]
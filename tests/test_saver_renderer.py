@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pytest
+
+from saver_renderer import (TILE, ClockEffect, Effect, HeadlessPresenter, SaverRenderer,
+                            dirty_rects, line_pixels, make_renderer)
+
+W, H = 320, 200
+
+
+def test_no_touched_pixels_no_rects():
+    assert dirty_rects(np.array([], np.int64), np.array([], np.int64), W, H) == []
+
+
+def test_touched_pixels_become_merged_tile_runs():
+    ys, xs = np.array([5, 5, 40]), np.array([3, 40, 319])
+    assert dirty_rects(ys, xs, W, H) == [(0, 0, 2 * TILE, TILE), (288, TILE, W, 2 * TILE)]
+
+
+def test_mostly_dirty_screen_is_one_rect():
+    ys, xs = np.nonzero(np.ones((H, W), dtype=bool))
+    assert dirty_rects(ys, xs, W, H) == [(0, 0, W, H)]
+
+
+def test_too_many_runs_collapse_to_one_span_per_row():
+    xs = np.arange(0, W, 2 * TILE)
+    ys = np.zeros_like(xs)
+    rects = dirty_rects(ys, xs, W, H, max_rects=2)
+    assert rects == [(0, 0, xs[-1] + TILE, TILE)]
+
+
+def test_line_pixels_hits_both_endpoints():
+    ys, xs, seg = line_pixels(np.array([0.0, 10.0]), np.array([0.0, 0.0]),
+                              np.array([5.0, 10.0]), np.array([0.0, 3.0]))
+    assert list(zip(ys[seg == 0].tolist(), xs[seg == 0].tolist())) == [(0, x) for x in range(6)]
+    assert (ys[seg == 1].tolist(), xs[seg == 1].tolist()) == ([0, 1, 2, 3], [10] * 4)
+
+
+@pytest.mark.parametrize("effect", ["mystify", "starfield", "clock"])
+def test_dirty_rects_cover_every_changed_pixel(effect):
+    presenter = HeadlessPresenter(W, H)
+    renderer = make_renderer(effect, W, H, presenter, seed=1)
+    if effect == "clock":
+        renderer.effect.move_s = 0.05
+    for _ in range(20):
+        renderer.frame()
+        assert np.array_equal(presenter.screen, renderer.frame_buffer)
+
+
+def test_sparse_effects_push_a_fraction_of_the_screen():
+    presenter = HeadlessPresenter(1920, 1080)
+    renderer = make_renderer("mystify", 1920, 1080, presenter, seed=1)
+    renderer.run(frames=10)
+    assert presenter.pixels < 10 * 1920 * 1080 / 2
+
+
+def test_unchanged_clock_draws_nothing():
+    effect = ClockEffect(W, H, now=lambda: time.struct_time((2026, 1, 1, 12, 0, 0, 3, 1, 0)))
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    assert effect.draw(frame, 0.1)
+    assert effect.draw(frame, 0.1) == []
+
+
+class CostlyEffect(Effect):
+    """Takes ``cost_s * quality`` of virtual time per frame."""
+
+    def __init__(self, clock, cost_s):
+        super().__init__(W, H)
+        self.clock = clock
+        self.cost_s = cost_s
+
+    def draw(self, frame, dt):
+        self.clock.advance(self.cost_s * self.quality)
+        return []
+
+
+def test_quality_drops_while_frames_run_long_and_recovers(clock):
+    effect = CostlyEffect(clock, cost_s=0.05)
+    renderer = SaverRenderer(effect, HeadlessPresenter(W, H), fps=30, clock=clock, sleep=clock.advance)
+    renderer.run(frames=30)
+    assert renderer.downgrades >= 1
+    assert effect.quality < 1.0
+
+    effect.cost_s = 0.001
+    renderer.run(frames=30 + 5 * 60)
+    assert renderer.quality == 1.0
+
+
+def test_frames_are_paced_to_the_target_rate(clock):
+    renderer = SaverRenderer(CostlyEffect(clock, 0.0), HeadlessPresenter(W, H), fps=20,
+                             clock=clock, sleep=clock.advance)
+    renderer.run(frames=40)
+    assert clock() == pytest.approx(40 / 20)
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+import threading
+
+from conftest import wait_until
+from process_tree import spawn_tree
+from saver_supervisor import SaverSupervisor
+
+IGNORE_SIGTERM = (
+    "import signal, time\n"
+    "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+    "print('ready', flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_on_all_exited_fires_once_every_child_is_gone():
+    supervisor = SaverSupervisor()
+    done = threading.Event()
+    exited = []
+    children = [spawn_tree(python("import time; time.sleep(0.1)")) for _ in range(2)]
+    supervisor.watch(children, done.set, on_exit=exited.append)
+    assert done.wait(10)
+    assert sorted(p.pid for p in exited) == sorted(p.pid for p in children)
+    assert not supervisor.running
+
+
+def test_empty_batch_reports_exit_immediately():
+    done = threading.Event()
+    SaverSupervisor().watch([], done.set)
+    assert done.is_set()
+
+
+def test_terminate_all_kills_a_child_that_ignores_sigterm():
+    supervisor = SaverSupervisor()
+    child = spawn_tree(python(IGNORE_SIGTERM), stdout=subprocess.PIPE)
+    polite = spawn_tree(python("import time; time.sleep(60)"))
+    assert child.popen.stdout.readline().strip() == b"ready"
+    supervisor.watch([child, polite], lambda: None)
+
+    assert supervisor.terminate_all(grace_s=0.5) == 1
+    assert child.poll() is not None
+    assert polite.poll() is not None
+    child.popen.stdout.close()
+
+
+def test_a_new_batch_retires_the_old_one():
+    supervisor = SaverSupervisor()
+    fired = []
+    old = spawn_tree(python("import time; time.sleep(0.2)"))
+    supervisor.watch([old], lambda: fired.append("old"))
+    new = spawn_tree(python("import time; time.sleep(60)"))
+    supervisor.watch([new], lambda: fired.append("new"))
+
+    old.wait(10)
+    assert supervisor.running
+    assert fired == []
+    supervisor.terminate_all(grace_s=1.0)
+    assert wait_until(lambda: fired == ["new"])
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from activity import InputEventSource
+from daemon_config import Config
+from simulator import SimTkRoot, VirtualClock
+
+
+class ThreadCheckedRoot(SimTkRoot):
+    """A SimTkRoot that fails any call made off the thread that built it."""
+
+    def __init__(self, vc, monitors):
+        self.owner = threading.get_ident()
+        self.foreign_calls = []
+        super().__init__(vc, monitors)
+
+    def __getattribute__(self, name):
+        if not name.startswith("_") and name not in ("owner", "foreign_calls"):
+            if threading.get_ident() != object.__getattribute__(self, "owner"):
+                object.__getattribute__(self, "foreign_calls").append(name)
+        return object.__getattribute__(self, name)
+
+
+class NoFileHandlers:
+    """Tcl as on Windows: no createfilehandler."""
+
+
+@pytest.fixture
+def make_saver(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import screen_saver
+
+    def make(root_cls=SimTkRoot, file_handlers=True):
+        vc = VirtualClock()
+        root = root_cls(vc, [(0, 0, 1920, 1080)])
+        if not file_handlers:
+            root.tk = NoFileHandlers()
+        source = InputEventSource(clock=vc.clock)
+        config = Config(timeout_ms=60000, effect="blank", lock_on_activate=False)
+        saver = screen_saver.Screensaver(config, root=root, input_source=source)
+        return vc, root, source, saver
+
+    return make
+
+
+def test_hook_input_while_shown_wakes_tk_through_the_socket(make_saver):
+    vc, root, source, saver = make_saver(ThreadCheckedRoot)
+    vc.run_until(61)
+    assert saver.screensaver_active
+    assert saver._check_id is None  # nothing polls while shown
+
+    hook = threading.Thread(target=source.touch, args=("Mouse",))
+    hook.start()
+    hook.join()
+    assert root.foreign_calls == []
+    assert saver.screensaver_active
+
+    root.poll_files()
+    assert not saver.screensaver_active
+
+
+def test_without_file_handlers_the_queue_is_polled_while_shown(make_saver):
+    vc, root, source, saver = make_saver(file_handlers=False)
+    assert not saver.hook_wakeup
+    vc.run_until(61)
+    assert saver.screensaver_active
+
+    source.touch("Mouse")
+    vc.run_until(61 + saver.active_poll_ms / 1000)
+    assert not saver.screensaver_active
@@ -0,0 +1,132 @@
+import json
+import time
+
+import pytest
+
+import daemon_config
+from conftest import wait_until
+from daemon_config import Config, ConfigError
+
+
+@pytest.fixture
+def driver(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from simulator import ONE, ScrDriver, VirtualClock
+
+    config = Config(timeout_ms=60000, metrics_port=0, journal_dir=None,
+                    effect="blank", lock_on_activate=False)
+    vc = VirtualClock()
+    driver = ScrDriver(vc, config, ONE)
+    yield driver
+    driver.saver.config_watcher.stop()
+
+
+def dismissals(driver):
+    return driver.saver.m_dismissal.labels(None).count
+
+
+def run_for(driver, seconds):
+    driver.vc.run_until(driver.vc.now + seconds)
+
+
+def settle(driver):
+    # Supervisor callbacks run on real waiter threads.
+    assert wait_until(lambda: not driver.saver.screensaver_active)
+    time.sleep(0.05)
+    driver.after_event()
+
+
+def test_reload_applies_a_valid_config(driver):
+    with open(daemon_config.CONFIG_FILE, "w") as f:
+        json.dump({"timeout": 2}, f)
+    driver.saver.reload()
+    assert driver.engine.timeout_ms == 120000
+
+
+def test_reload_keeps_the_running_config_when_the_file_is_invalid(driver):
+    with open(daemon_config.CONFIG_FILE, "w") as f:
+        json.dump({"timeout": 2, "metrics_port": "nope"}, f)
+    with pytest.raises(ConfigError):
+        driver.saver.reload()
+    assert driver.engine.timeout_ms == 60000
+
+
+def test_only_exits_after_input_are_dismissals(driver):
+    run_for(driver, 61)
+    assert driver.active()
+    run_for(driver, 10)
+    driver.input("mouse")
+    settle(driver)
+    assert dismissals(driver) == 1
+
+    # The saver crashing with no input since it started is not a dismissal.
+    run_for(driver, 61)
+    assert driver.active()
+    driver.saver_exit()
+    settle(driver)
+
+    # Nor is the saver we stop because the session locked.
+    run_for(driver, 61)
+    assert driver.active()
+    driver.lock(True)
+    settle(driver)
+    assert dismissals(driver) == 1
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_activation_records_first_and_full_cover_for_its_mode(tmp_path, monkeypatch, warm):
+    monkeypatch.chdir(tmp_path)
+    from simulator import ONE, ScrDriver, VirtualClock
+
+    config = Config(timeout_ms=60000, metrics_port=0, journal_dir=None, effect="blank",
+                    lock_on_activate=False, warm_standby=warm, standby_lead_s=5.0)
+    driver = ScrDriver(VirtualClock(), config, ONE)
+    try:
+        run_for(driver, 61)
+        assert driver.active()
+        mode, other = ("warm", "cold") if warm else ("cold", "warm")
+        for histogram in (driver.saver.m_first_cover, driver.saver.m_activation):
+            assert histogram.labels(mode).count == 1
+            assert histogram.labels(other).count == 0
+    finally:
+        driver.saver.config_watcher.stop()
+
+
+def test_failed_launch_leaves_the_saver_inactive(driver, monkeypatch):
+    import screen_saver_scr as scr
+
+    def launch(scr_path, rects):
+        raise OSError("saver missing")
+
+    monkeypatch.setattr(scr, "run_screensaver_on_monitors", launch)
+    run_for(driver, 61)
+    assert not driver.saver.screensaver_active
+    assert driver.saver.m_failures.labels(None).value == 1
+
+
+def test_metrics_are_served_only_once_every_metric_can_be_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import screen_saver_scr as scr
+    from simulator import ONE, ScrDriver, VirtualClock
+
+    # A scrape the moment the endpoint is up must find the daemon built.
+    scrapes = []
+    monkeypatch.setattr(scr, "serve_http", lambda registry, port: scrapes.append(registry.prometheus()))
+    config = Config(timeout_ms=60000, metrics_port=9999, journal_dir=None,
+                    effect="blank", lock_on_activate=False)
+    driver = ScrDriver(VirtualClock(), config, ONE)
+    try:
+        assert len(scrapes) == 1
+        assert "screensaver_leaked_children_total 0" in scrapes[0]
+    finally:
+        driver.saver.config_watcher.stop()
+
+
+def test_a_saved_config_is_applied_once(driver, capsys):
+    # What the config editor does: write the file, then ask for a reload.
+    daemon_config.write_raw({"timeout": 2}, daemon_config.CONFIG_FILE)
+    driver.saver.reload()
+    driver.saver.config_watcher.check()
+    time.sleep(0.2)  # let the watcher thread see the write too
+    assert capsys.readouterr().out.count("Config reloaded") == 1
+    assert driver.engine.timeout_ms == 120000
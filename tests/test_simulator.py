@@ -0,0 +1,10 @@
+import simulator
+
+
+def test_every_engine_meets_its_budgets_over_a_day(capsys):
+    assert simulator.main(["--check"]) == 0
+
+
+def test_check_fails_an_engine_over_its_wakeup_budget(capsys):
+    assert simulator.main(["--check", "--engine", "scr", "--max-wakeups", "1"]) == 1
+    assert "wakeups" in capsys.readouterr().out
@@ -0,0 +1,10 @@
+import bench_startup
+
+
+def test_import_stays_within_budget():
+    import_ms, slowest = bench_startup.import_times(runs=3)
+    assert import_ms <= bench_startup.IMPORT_BUDGET_MS, f"slowest imports: {slowest}"
+
+
+def test_first_loop_iteration_stays_within_budget():
+    assert bench_startup.first_tick_times(runs=3) <= bench_startup.FIRST_TICK_BUDGET_MS
@@ -0,0 +1,154 @@
+import gzip
+import json
+
+import pytest
+
+from telemetry import TelemetryAgent, TelemetryRejected
+from telemetry_collector import TelemetryCollector
+
+
+class FakeSender:
+    """Records uploaded batches; ``error`` is raised instead while set."""
+
+    def __init__(self):
+        self.batches = []
+        self.error = None
+
+    def send(self, body):
+        if self.error is not None:
+            raise self.error
+        self.batches.append(json.loads(gzip.decompress(body)))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sender():
+    return FakeSender()
+
+
+def make_agent(tmp_path, sender, clock, **kwargs):
+    return TelemetryAgent("http://collector.invalid/ingest", spool_dir=str(tmp_path / "spool"),
+                          machine="pc-1", sender=sender, clock=clock, **kwargs)
+
+
+def kinds(batches):
+    return [event[1] for batch in batches for event in batch["events"]]
+
+
+def test_events_go_out_in_batches(tmp_path, sender, clock):
+    agent = make_agent(tmp_path, sender, clock, batch_size=2, counters=lambda: {"wakeups": 3})
+    for kind in "abc":
+        agent.record(kind, n=1)
+    assert agent.flush()
+    assert [len(b["events"]) for b in sender.batches] == [2, 1]
+    assert [b["seq"] for b in sender.batches] == [1, 2]
+    assert sender.batches[0]["counters"] == {"wakeups": 3}
+    assert kinds(sender.batches) == ["a", "b", "c"]
+    assert agent.sent_events == 3
+
+
+def test_offline_batches_are_spooled_and_sent_oldest_first(tmp_path, sender, clock):
+    agent = make_agent(tmp_path, sender, clock)
+    sender.error = OSError("connection refused")
+    agent.record("a")
+    agent._pump()
+    agent.record("b")
+    agent._pump()
+    assert agent.pending() == (0, 2)
+    assert agent.failures == 1  # backing off: the second batch went straight to disk
+
+    sender.error = None
+    agent.record("c")
+    assert agent.flush()
+    assert kinds(sender.batches) == ["a", "b", "c"]
+    assert agent.pending() == (0, 0)
+
+
+def test_retries_back_off_exponentially(tmp_path, sender, clock, monkeypatch):
+    monkeypatch.setattr("telemetry.random.uniform", lambda low, high: high)
+    agent = make_agent(tmp_path, sender, clock, backoff_s=1.0, backoff_max_s=4.0)
+    sender.error = OSError("timed out")
+    retries = []
+    for _ in range(4):
+        agent.record("x")
+        clock.advance(agent._retry_at - clock())
+        agent._pump()
+        retries.append(agent._retry_at - clock())
+    assert retries == [1.0, 2.0, 4.0, 4.0]
+
+
+def test_nothing_is_sent_before_the_retry_time(tmp_path, sender, clock):
+    agent = make_agent(tmp_path, sender, clock, backoff_s=10.0)
+    sender.error = OSError("down")
+    agent.record("a")
+    agent._pump()
+    sender.error = None
+    agent._pump()
+    assert sender.batches == []
+    clock.advance(10)
+    agent._pump()
+    assert kinds(sender.batches) == ["a"]
+
+
+def test_spool_left_by_an_earlier_run_is_sent(tmp_path, sender, clock):
+    sender.error = OSError("down")
+    old = make_agent(tmp_path, sender, clock)
+    old.record("before restart")
+    old.flush()
+
+    sender.error = None
+    agent = make_agent(tmp_path, sender, clock)
+    agent.record("after restart")
+    assert agent.flush()
+    assert kinds(sender.batches) == ["before restart", "after restart"]
+    assert [b["seq"] for b in sender.batches] == [1, 2]
+
+
+def test_rejected_batches_are_dropped_not_retried(tmp_path, sender, clock):
+    agent = make_agent(tmp_path, sender, clock)
+    sender.error = TelemetryRejected("collector answered 400 Bad Request")
+    agent.record("a")
+    assert agent.flush()
+    assert agent.pending() == (0, 0)
+
+
+def test_memory_and_disk_are_bounded(tmp_path, sender, clock):
+    agent = make_agent(tmp_path, sender, clock, queue_max=3, spool_max_mb=300 / 2**20)
+    for _ in range(5):
+        agent.record("x", payload="y" * 200)
+    assert (agent.recorded, agent.dropped) == (3, 2)
+
+    sender.error = OSError("down")
+    agent.batch_size = 1
+    agent.flush()
+    spool = tmp_path / "spool"
+    spooled = agent.pending()[1]
+    assert 0 < spooled < 3
+    assert sum(path.stat().st_size for path in spool.iterdir()) <= agent.spool_max_bytes
+    assert agent.dropped == 2 + (3 - spooled)
+
+
+def test_agent_and_collector_over_http(tmp_path):
+    collector = TelemetryCollector().start()
+    try:
+        agent = TelemetryAgent(collector.url, spool_dir=str(tmp_path / "spool"), machine="pc-1")
+        for i in range(3):
+            agent.record("state", i=i)
+        assert agent.flush()
+        agent.record("state", i=3)
+        assert agent.flush()
+        assert collector.stats()["machines"] == {"pc-1": 4}
+        assert agent.sender.connects == 1
+
+        collector.available = False
+        agent.record("state", i=4)
+        assert not agent.flush()
+        collector.available = True
+        agent._retry_at = 0
+        assert agent.flush()
+        assert collector.events == 5
+        agent.stop()
+    finally:
+        collector.stop()
@@ -0,0 +1,301 @@
+"""Win32 functions on the probe hot path, declared once.
+
+Every function used by the idle, monitor and window probes, by the
+hidden message windows the display and session watchers run, and by the
+job objects that hold saver process trees, gets its
+``argtypes``/``restype`` here, when this module is first imported (by the
+Win32 backends, so never on other platforms).  Calls then convert
+arguments by a fixed prototype instead of guessing per call, handles come
+back pointer-sized instead of truncated to a C int, and DWORD results are
+unsigned.  Structures and callback types are defined once too; backends
+keep one instance of each, plus a prebuilt ``byref`` to it, and reuse
+them on every tick.
+
+The DLLs are private WinDLL instances, so these prototypes do not change
+``ctypes.windll`` for code elsewhere that calls the same functions its
+own way.  kernel32 is loaded with ``use_last_error``, so
+``ctypes.get_last_error()`` reports the error of its last failed call.
+"""
+import ctypes
+from ctypes import wintypes
+
+
+# ------------------------------------------------------------
+# STRUCTURES / CALLBACK TYPES
+# ------------------------------------------------------------
+
+RECT = wintypes.RECT
+
+
+class LASTINPUTINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.UINT),
+        ("dwTime", wintypes.DWORD),
+    ]
+
+
+class MONITORINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("rcMonitor", RECT),
+        ("rcWork", RECT),
+        ("dwFlags", wintypes.DWORD),
+    ]
+
+
+class WNDCLASSW(ctypes.Structure):
+    pass
+
+
+WNDPROC = ctypes.WINFUNCTYPE(ctypes.c_ssize_t, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+WNDCLASSW._fields_ = [
+    ("style", wintypes.UINT),
+    ("lpfnWndProc", WNDPROC),
+    ("cbClsExtra", ctypes.c_int),
+    ("cbWndExtra", ctypes.c_int),
+    ("hInstance", wintypes.HINSTANCE),
+    ("hIcon", wintypes.HICON),
+    ("hCursor", wintypes.HANDLE),
+    ("hbrBackground", wintypes.HBRUSH),
+    ("lpszMenuName", wintypes.LPCWSTR),
+    ("lpszClassName", wintypes.LPCWSTR),
+]
+
+class IO_COUNTERS(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_ulonglong) for name in (
+        "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+        "ReadTransferCount", "WriteTransferCount", "OtherTransferCount")]
+
+
+class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("PerProcessUserTimeLimit", ctypes.c_longlong),
+        ("PerJobUserTimeLimit", ctypes.c_longlong),
+        ("LimitFlags", wintypes.DWORD),
+        ("MinimumWorkingSetSize", ctypes.c_size_t),
+        ("MaximumWorkingSetSize", ctypes.c_size_t),
+        ("ActiveProcessLimit", wintypes.DWORD),
+        ("Affinity", ctypes.c_size_t),
+        ("PriorityClass", wintypes.DWORD),
+        ("SchedulingClass", wintypes.DWORD),
+    ]
+
+
+class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+        ("IoInfo", IO_COUNTERS),
+        ("ProcessMemoryLimit", ctypes.c_size_t),
+        ("JobMemoryLimit", ctypes.c_size_t),
+        ("PeakProcessMemoryUsed", ctypes.c_size_t),
+        ("PeakJobMemoryUsed", ctypes.c_size_t),
+    ]
+
+
+class JOBOBJECT_BASIC_PROCESS_ID_LIST(ctypes.Structure):
+    _fields_ = [
+        ("NumberOfAssignedProcesses", wintypes.DWORD),
+        ("NumberOfProcessIdsInList", wintypes.DWORD),
+        ("ProcessIdList", ctypes.c_size_t * 64),
+    ]
+
+
+class THREADENTRY32(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ThreadID", wintypes.DWORD),
+        ("th32OwnerProcessID", wintypes.DWORD),
+        ("tpBasePri", wintypes.LONG),
+        ("tpDeltaPri", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+    ]
+
+
+WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+MONITORENUMPROC = ctypes.WINFUNCTYPE(
+    wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(RECT), wintypes.LPARAM
+)
+
+
+# ------------------------------------------------------------
+# PROTOTYPES
+# ------------------------------------------------------------
+
+def _declare(dll, name, restype, *argtypes):
+    fn = getattr(dll, name)
+    fn.restype = restype
+    fn.argtypes = argtypes
+    return fn
+
+
+class _User32:
+    def __init__(self):
+        dll = ctypes.WinDLL("user32")
+        HWND, BOOL, INT, UINT = wintypes.HWND, wintypes.BOOL, ctypes.c_int, wintypes.UINT
+        self.GetLastInputInfo = _declare(dll, "GetLastInputInfo", BOOL, ctypes.POINTER(LASTINPUTINFO))
+        self.GetForegroundWindow = _declare(dll, "GetForegroundWindow", HWND)
+        self.GetShellWindow = _declare(dll, "GetShellWindow", HWND)
+        self.EnumWindows = _declare(dll, "EnumWindows", BOOL, WNDENUMPROC, wintypes.LPARAM)
+        self.IsWindowVisible = _declare(dll, "IsWindowVisible", BOOL, HWND)
+        self.GetWindowRect = _declare(dll, "GetWindowRect", BOOL, HWND, ctypes.POINTER(RECT))
+        self.GetClassNameW = _declare(dll, "GetClassNameW", INT, HWND, wintypes.LPWSTR, INT)
+        self.GetWindowThreadProcessId = _declare(dll, "GetWindowThreadProcessId", wintypes.DWORD,
+                                                 HWND, ctypes.POINTER(wintypes.DWORD))
+        self.SetWindowPos = _declare(dll, "SetWindowPos", BOOL, HWND, HWND, INT, INT, INT, INT, UINT)
+        self.SetForegroundWindow = _declare(dll, "SetForegroundWindow", BOOL, HWND)
+        self.EnumDisplayMonitors = _declare(dll, "EnumDisplayMonitors", BOOL, wintypes.HDC,
+                                            ctypes.POINTER(RECT), MONITORENUMPROC, wintypes.LPARAM)
+        self.GetMonitorInfoW = _declare(dll, "GetMonitorInfoW", BOOL, wintypes.HMONITOR,
+                                        ctypes.POINTER(MONITORINFO))
+        LPMSG = ctypes.POINTER(wintypes.MSG)
+        self.DefWindowProcW = _declare(dll, "DefWindowProcW", ctypes.c_ssize_t, HWND, UINT,
+                                       wintypes.WPARAM, wintypes.LPARAM)
+        self.RegisterClassW = _declare(dll, "RegisterClassW", wintypes.ATOM, ctypes.POINTER(WNDCLASSW))
+        self.CreateWindowExW = _declare(dll, "CreateWindowExW", HWND, wintypes.DWORD, wintypes.LPCWSTR,
+                                        wintypes.LPCWSTR, wintypes.DWORD, INT, INT, INT, INT, HWND,
+                                        wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID)
+        self.GetMessageW = _declare(dll, "GetMessageW", BOOL, LPMSG, HWND, UINT, UINT)
+        self.TranslateMessage = _declare(dll, "TranslateMessage", BOOL, LPMSG)
+        self.DispatchMessageW = _declare(dll, "DispatchMessageW", ctypes.c_ssize_t, LPMSG)
+
+
+class _Kernel32:
+    def __init__(self):
+        dll = ctypes.WinDLL("kernel32", use_last_error=True)
+        HANDLE, BOOL, DWORD = wintypes.HANDLE, wintypes.BOOL, wintypes.DWORD
+        self.GetTickCount = _declare(dll, "GetTickCount", DWORD)
+        self.GetModuleHandleW = _declare(dll, "GetModuleHandleW", wintypes.HMODULE, wintypes.LPCWSTR)
+        self.CloseHandle = _declare(dll, "CloseHandle", BOOL, HANDLE)
+        self.CreateJobObjectW = _declare(dll, "CreateJobObjectW", HANDLE, wintypes.LPVOID, wintypes.LPCWSTR)
+        self.SetInformationJobObject = _declare(dll, "SetInformationJobObject", BOOL, HANDLE,
+                                                ctypes.c_int, wintypes.LPVOID, DWORD)
+        self.QueryInformationJobObject = _declare(dll, "QueryInformationJobObject", BOOL, HANDLE,
+                                                  ctypes.c_int, wintypes.LPVOID, DWORD,
+                                                  ctypes.POINTER(DWORD))
+        self.AssignProcessToJobObject = _declare(dll, "AssignProcessToJobObject", BOOL, HANDLE, HANDLE)
+        self.TerminateJobObject = _declare(dll, "TerminateJobObject", BOOL, HANDLE, wintypes.UINT)
+        self.CreateToolhelp32Snapshot = _declare(dll, "CreateToolhelp32Snapshot", HANDLE, DWORD, DWORD)
+        self.Thread32First = _declare(dll, "Thread32First", BOOL, HANDLE, ctypes.POINTER(THREADENTRY32))
+        self.Thread32Next = _declare(dll, "Thread32Next", BOOL, HANDLE, ctypes.POINTER(THREADENTRY32))
+        self.OpenThread = _declare(dll, "OpenThread", HANDLE, DWORD, BOOL, DWORD)
+        self.ResumeThread = _declare(dll, "ResumeThread", DWORD, HANDLE)
+
+
+class _Shcore:
+    def __init__(self):
+        dll = ctypes.WinDLL("shcore")
+        # MDT_EFFECTIVE_DPI = 0; returns an HRESULT.
+        self.GetDpiForMonitor = _declare(dll, "GetDpiForMonitor", ctypes.c_long, wintypes.HMONITOR,
+                                         ctypes.c_int, ctypes.POINTER(wintypes.UINT),
+                                         ctypes.POINTER(wintypes.UINT))
+
+
+class _Wtsapi32:
+    def __init__(self):
+        dll = ctypes.WinDLL("wtsapi32")
+        self.WTSRegisterSessionNotification = _declare(dll, "WTSRegisterSessionNotification",
+                                                       wintypes.BOOL, wintypes.HWND, wintypes.DWORD)
+        self.WTSUnRegisterSessionNotification = _declare(dll, "WTSUnRegisterSessionNotification",
+                                                         wintypes.BOOL, wintypes.HWND)
+
+
+user32 = _User32()
+kernel32 = _Kernel32()
+try:
+    shcore = _Shcore()
+except OSError:
+    # Before Windows 8.1 there is no per-monitor DPI.
+    shcore = None
+try:
+    wtsapi32 = _Wtsapi32()
+except OSError:
+    # Stripped-down installs without Terminal Services.
+    wtsapi32 = None
+
+
+# ------------------------------------------------------------
+# HIDDEN MESSAGE WINDOW
+# ------------------------------------------------------------
+
+class MessageWindow:
+    """A hidden top-level window for broadcasts such as WM_DISPLAYCHANGE.
+
+    ``on_message(msg, wparam, lparam)`` sees every message before
+    DefWindowProcW does.  ``create()`` and ``pump()`` must run on the same
+    thread, which then belongs to the window until ``pump()`` returns.
+    """
+
+    def __init__(self, class_name, on_message):
+        self.class_name = class_name
+        self.on_message = on_message
+        self.hwnd = None
+        # Kept referenced: Windows calls it for as long as the class exists.
+        self._wndproc = WNDPROC(self._dispatch)
+
+    def _dispatch(self, hwnd, msg, wparam, lparam):
+        self.on_message(msg, wparam, lparam)
+        return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+    def create(self):
+        wc = WNDCLASSW()
+        wc.lpfnWndProc = self._wndproc
+        wc.hInstance = kernel32.GetModuleHandleW(None)
+        wc.lpszClassName = self.class_name
+        user32.RegisterClassW(ctypes.byref(wc))
+        self.hwnd = user32.CreateWindowExW(0, self.class_name, self.class_name, 0,
+                                           0, 0, 0, 0, None, None, wc.hInstance, None)
+        if not self.hwnd:
+            raise ctypes.WinError()
+        return self.hwnd
+
+    def pump(self):
+        """Dispatch messages until WM_QUIT or an error."""
+        msg = wintypes.MSG()
+        ref = ctypes.byref(msg)
+        while user32.GetMessageW(ref, None, 0, 0) > 0:
+            user32.TranslateMessage(ref)
+            user32.DispatchMessageW(ref)
+
+
+# ------------------------------------------------------------
+# SUSPENDED PROCESSES
+# ------------------------------------------------------------
+
+TH32CS_SNAPTHREAD = 0x4
+THREAD_SUSPEND_RESUME = 0x2
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+def resume_process(pid):
+    """Resume the threads of a process started with CREATE_SUSPENDED; return how many.
+
+    Popen closes the primary thread handle, so the threads are found
+    through a Toolhelp snapshot.  Raises OSError if none could be resumed.
+    """
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPTHREAD, 0)
+    if snapshot in (None, INVALID_HANDLE_VALUE):
+        raise ctypes.WinError(ctypes.get_last_error())
+    entry = THREADENTRY32()
+    entry.dwSize = ctypes.sizeof(THREADENTRY32)
+    ref = ctypes.byref(entry)
+    resumed = 0
+    try:
+        found = kernel32.Thread32First(snapshot, ref)
+        while found:
+            if entry.th32OwnerProcessID == pid:
+                thread = kernel32.OpenThread(THREAD_SUSPEND_RESUME, False, entry.th32ThreadID)
+                if not thread:
+                    raise ctypes.WinError(ctypes.get_last_error())
+                try:
+                    if kernel32.ResumeThread(thread) == 0xFFFFFFFF:
+                        raise ctypes.WinError(ctypes.get_last_error())
+                finally:
+                    kernel32.CloseHandle(thread)
+                resumed += 1
+            found = kernel32.Thread32Next(snapshot, ref)
+    finally:
+        kernel32.CloseHandle(snapshot)
+    if not resumed:
+        raise OSError(f"no threads to resume in process {pid}")
+    return resumed